@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Helpers shared by the benchmarks of the pattern examples.
+
+Details about timing small bits of code:
+https://docs.python.org/3/library/time.html#time.perf_counter
+https://docs.python.org/3/library/tracemalloc.html
+"""
+import time
+import tracemalloc
+
+
+def timed(func):
+    """
+    Run a function once and time it.
+    :param func: Callable  Takes no arguments
+    :return: Tuple(result, seconds)
+    """
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def peak_memory(func):
+    """
+    Run a function once while tracing memory. Tracing slows the code down a lot,
+    so do not time the same run.
+    :param func: Callable  Takes no arguments
+    :return: Tuple(result, peak bytes allocated)
+    """
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def print_results(name, results):
+    print(name)
+    for key, value in results.items():
+        if isinstance(value, float):
+            print("\t{0}: {1:.2f}".format(key, value))
+        else:
+            print("\t{0}: {1}".format(key, value))
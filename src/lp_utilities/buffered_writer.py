@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+A writer that collects text and hands it to a file like object in large chunks.
+
+Writing many small strings to a file, or to sys.stdout, is mostly spent in the
+I/O calls. The BufferedWriter keeps the strings in a list and joins them into
+one write once roughly chunk_size characters have piled up. Only one chunk is
+held at a time, so memory stays flat however much text goes through it.
+
+Details about file objects:
+https://docs.python.org/3/glossary.html#term-file-object
+"""
+
+
+class BufferedWriter(object):
+    """
+    Base class for the renderers and report writers that write in large chunks.
+    Use it as a context manager, or call flush() when done, so the last chunk is written.
+    """
+
+    def __init__(self, stream, chunk_size=1 << 16):
+        """
+        :param stream: File like object with a write method
+        :param chunk_size: Int  Rough number of characters per write
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.__buffer = []
+        self.__buffered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+
+    def write(self, text):
+        """
+        Add text to the buffer, writing the buffer out once it is big enough.
+        :param text: Str
+        :return: None
+        """
+        self.__buffer.append(text)
+        self.__buffered += len(text)
+        if self.__buffered >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.__buffer:
+            self.stream.write(''.join(self.__buffer))
+            self.__buffer = []
+            self.__buffered = 0
@@ -6,12 +6,70 @@ This file is an example of how a person could implement a basic
 abstract factory pattern.  This is very similar to the factory pattern
 but is abstracted one more layer.
 """
+import threading
+import weakref
+
+
+def watch(vehicle, watcher):
+    """
+    Hear about set_model and accelerate on a vehicle. Anything that keeps data about
+    vehicles, like a FleetIndex, uses this to stay up to date. The watcher is called as
+    watcher(vehicle, name, old value) after the change. Vehicles nobody watches use the
+    empty watchers tuple of their class, so they pay for one truth test per change.
+    A bound method is held through a weakref.WeakMethod, so watching a vehicle does not
+    keep the watcher's object alive. Once that object is collected the watcher is dropped.
+    Other callables are held as they are.
+    :param vehicle: A vehicle
+    :param watcher: Callable(vehicle, name, old value)
+    :return: None
+    """
+    try:
+        ref = weakref.WeakMethod(watcher)
+    except TypeError:  # not a bound method of a Python class
+        def ref():
+            return watcher
+    vehicle.watchers = getattr(vehicle, 'watchers', ()) + (ref,)
+
+
+def unwatch(vehicle, watcher):
+    """
+    Stop calling a watcher. Watchers whose object has been collected are dropped too,
+    so unwatch(vehicle, None) only tidies up.
+    :param vehicle: A vehicle
+    :param watcher: Callable  A watcher given to watch()
+    :return: None
+    """
+    watchers = tuple(ref for ref in getattr(vehicle, 'watchers', ()) if ref() not in (None, watcher))
+    if watchers:
+        vehicle.watchers = watchers
+    else:
+        vars(vehicle).pop('watchers', None)
+
+
+def changed(vehicle, name, old):
+    """
+    Tell the watchers of a vehicle that an attribute changed.
+    :param vehicle: A vehicle
+    :param name: STR  'model' or 'speed'
+    :param old: The value before the change
+    :return: None
+    """
+    collected = False
+    for ref in vehicle.watchers:
+        watcher = ref()
+        if watcher is None:
+            collected = True
+        else:
+            watcher(vehicle, name, old)
+    if collected:
+        unwatch(vehicle, None)
 
 
 class MotorCycleInterface(object):
     """
     Abstract Motorcycle Class
     """
+    watchers = ()
 
     def __init__(self):
         self.wheels = 2
@@ -26,6 +84,7 @@ class CarInterface(object):
     """
     Abstract Car Class
     """
+    watchers = ()
 
     def __init__(self):
         self.wheels = 4
@@ -48,10 +107,16 @@ class HarleyDavidson(MotorCycleInterface):
         self.speed = 0
 
     def set_model(self, model):
+        old = self.model
         self.model = model
+        if self.watchers:
+            changed(self, 'model', old)
 
     def accelerate(self, speed):
+        old = self.speed
         self.speed += speed
+        if self.watchers:
+            changed(self, 'speed', old)
 
 
 class Honda(MotorCycleInterface):
@@ -66,10 +131,16 @@ class Honda(MotorCycleInterface):
         self.speed = 0
 
     def set_model(self, model):
+        old = self.model
         self.model = model
+        if self.watchers:
+            changed(self, 'model', old)
 
     def accelerate(self, speed):
+        old = self.speed
         self.speed += speed
+        if self.watchers:
+            changed(self, 'speed', old)
 
 
 class MercedezBenz(CarInterface):
@@ -84,10 +155,16 @@ class MercedezBenz(CarInterface):
         self.speed = 0
 
     def set_model(self, model):
+        old = self.model
         self.model = model
+        if self.watchers:
+            changed(self, 'model', old)
 
     def accelerate(self, speed):
+        old = self.speed
         self.speed += speed
+        if self.watchers:
+            changed(self, 'speed', old)
 
 
 class Lexus(CarInterface):
@@ -102,44 +179,187 @@ class Lexus(CarInterface):
         self.speed = 0
 
     def set_model(self, model):
+        old = self.model
         self.model = model
+        if self.watchers:
+            changed(self, 'model', old)
 
     def accelerate(self, speed):
+        old = self.speed
         self.speed += speed
+        if self.watchers:
+            changed(self, 'speed', old)
 
 
 class VehicleFactoryInterface(object):
     """
     Abstract Factory Interface
+    Every concrete factory keeps its own brands dict, brand name -> vehicle class.
+    Brands are added with register(), so finding a brand is one dict lookup no
+    matter how many brands there are.
     """
+    brands = {}
+
+    @classmethod
+    def register(cls, brand, vehicle_class=None):
+        """
+        Add a brand to this factory. Can also be used as a class decorator:
+            @CarFactory.register("Lexus")
+            class Lexus(CarInterface): ...
+        :param brand: STR  Manufacturer Name
+        :param vehicle_class: Class  The vehicle to make for that brand
+        :return: The vehicle class, or a decorator when vehicle_class is left out
+        """
+        if vehicle_class is None:
+            return lambda decorated: cls.register(brand, decorated)
+        if 'brands' not in vars(cls):
+            cls.brands = {}
+        cls.brands[brand] = vehicle_class
+        return vehicle_class
 
     def get_vehicle(self, brand): pass
 
 
+class FactoryProvider(object):
+    """
+    Hands out one shared instance of every factory.
+    The factories hold no state, so there is no need to make a new one for every
+    vehicle. Instances are made the first time a type is asked for, and dropped
+    again when register_factory() changes the registry. Safe to use from more
+    than one thread. Tests can swap a factory in with override().
+    """
+
+    def __init__(self):
+        self.__factories = {}
+        self.__lock = threading.Lock()
+
+    def get(self, type_):
+        """
+        The shared factory for a type of vehicle.
+        :param type_:  STR  Type of vehicle
+        :return: VehicleFactoryInterface
+        """
+        factory = self.__factories.get(type_)
+        if factory is None:
+            factory_class = get_factory_class(type_)
+            with self.__lock:
+                factory = self.__factories.get(type_)
+                if factory is None:
+                    factory = self.__factories[type_] = factory_class()
+        return factory
+
+    def override(self, type_, factory):
+        """
+        Use the given factory for a type of vehicle, until reset() is called.
+        :param type_:  STR  Type of vehicle
+        :param factory: VehicleFactoryInterface
+        :return: None
+        """
+        with self.__lock:
+            self.__factories[type_] = factory
+
+    def reset(self):
+        """
+        Drop every shared factory, new ones are made on the next get().
+        :return: None
+        """
+        with self.__lock:
+            self.__factories.clear()
+
+
+factory_provider = FactoryProvider()
+
+
+# Vehicle type -> concrete factory class, filled with register_factory()
+VEHICLE_FACTORIES = {}
+
+
+def register_factory(type_, factory_class=None):
+    """
+    Add the factory for a type of vehicle. Can also be used as a class decorator.
+    :param type_:  STR  Type of vehicle
+    :param factory_class: Class  A VehicleFactoryInterface
+    :return: The factory class, or a decorator when factory_class is left out
+    """
+    if factory_class is None:
+        return lambda decorated: register_factory(type_, decorated)
+    VEHICLE_FACTORIES[type_] = factory_class
+    factory_provider.reset()
+    return factory_class
+
+
+def get_factory_class(type_):
+    """
+    The factory class for a type of vehicle.
+    :param type_:  STR  Type of vehicle
+    :return: Class  A VehicleFactoryInterface
+    """
+    try:
+        return VEHICLE_FACTORIES[type_]
+    except KeyError:
+        raise TypeError('You must specify a Motorcycle or an Automobile for type.')
+
+
+def get_vehicle_class(type_, brand):
+    """
+    The class of vehicle the factory for a type makes for a brand, without making one.
+    :param type_:  STR  Type of vehicle
+    :param brand:  STR  Manufacturer Name
+    :return: Class
+    """
+    try:
+        return get_factory_class(type_).brands[brand]
+    except KeyError:
+        raise TypeError('Unknown brand specified.')
+
+
+def register(type_, brand, vehicle_class=None):
+    """
+    Add a brand to the factory of a type of vehicle. Can also be used as a class decorator:
+        @register("Motorcycle", "Ducati")
+        class Ducati(MotorCycleInterface): ...
+    :param type_:  STR  Type of vehicle
+    :param brand:  STR  Manufacturer Name
+    :param vehicle_class: Class  The vehicle to make for that brand
+    :return: The vehicle class, or a decorator when vehicle_class is left out
+    """
+    return get_factory_class(type_).register(brand, vehicle_class)
+
+
+@register_factory("Motorcycle")
 class MotorCycleFactory(VehicleFactoryInterface):
     """
     Concrete Vehicle Factory
     """
+    brands = {}
 
     def get_vehicle(self, brand):
-        if brand == "Harley Davidson":
-            return HarleyDavidson()
-        if brand == "Honda":
-            return Honda()
-        raise TypeError('Unknown brand specified.')
+        try:
+            vehicle_class = self.brands[brand]
+        except KeyError:
+            raise TypeError('Unknown brand specified.')
+        return vehicle_class()
 
 
+@register_factory("Automobile")
 class CarFactory(VehicleFactoryInterface):
     """
     Concrete Vehicle Factory
     """
+    brands = {}
 
     def get_vehicle(self, brand):
-        if brand == "Mercedez-Benz":
-            return MercedezBenz()
-        if brand == "Lexus":
-            return Lexus()
-        raise TypeError('Unknown brand specified.')
+        try:
+            vehicle_class = self.brands[brand]
+        except KeyError:
+            raise TypeError('Unknown brand specified.')
+        return vehicle_class()
+
+
+MotorCycleFactory.register("Harley Davidson", HarleyDavidson)
+MotorCycleFactory.register("Honda", Honda)
+CarFactory.register("Mercedez-Benz", MercedezBenz)
+CarFactory.register("Lexus", Lexus)
 
 
 def print_vehicle_specs(vehicle):
@@ -167,12 +387,7 @@ def set_vehicle_properties(type_, make, model, speed):
     :param speed:  INT  An integer indicating relative speed
     :return:  vehicle_class
     """
-    if type_ == "Motorcycle":
-        vehicle_factory = MotorCycleFactory()
-    elif type_ == "Automobile":
-        vehicle_factory = CarFactory()
-    else:
-        raise TypeError('You must specify a Motorcycle or an Automobile for type.')
+    vehicle_factory = factory_provider.get(type_)
 
     # we can do this because all of the factories implement
     # the abstract class VehicleInterface So we know that they will have the required
@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Small benchmarks for the abstract factory example.
+Each benchmark returns a dict of numbers so it can be checked or printed,
+run this file as a script to print all of them.
+"""
+import contextlib
+import csv
+import io
+import os
+import pickle
+import shutil
+import tempfile
+
+from src.lp_utilities.benchmarking import peak_memory, print_results, timed
+from src.theory.patterns.abstract_factory.abstract_factory import get_factory_class, set_vehicle_properties
+from src.theory.patterns.abstract_factory.abstract_factory import print_vehicle_specs
+from src.theory.patterns.abstract_factory.fleet import VehicleFleet
+from src.theory.patterns.abstract_factory.fleet_file import FleetFile, save_fleet
+from src.theory.patterns.abstract_factory.index import FleetIndex
+from src.theory.patterns.abstract_factory.ingest import VehicleIngest
+from src.theory.patterns.abstract_factory.pool import VehiclePool
+from src.theory.patterns.abstract_factory.report import write_specs
+
+RECORDS = [("Motorcycle", "Harley Davidson", "Touring", 100),
+           ("Motorcycle", "Honda", "CBR125R", 125),
+           ("Automobile", "Mercedez-Benz", "Mercedes-AMG C 63 Sedan", 95),
+           ("Automobile", "Lexus", "RX 350", 85)]
+
+
+def new_factory_set_vehicle_properties(type_, make, model, speed):
+    """
+    set_vehicle_properties the way it was before the FactoryProvider,
+    with a new factory for every vehicle. Kept to compare against.
+    """
+    v = get_factory_class(type_)().get_vehicle(make)
+    v.set_model(model)
+    v.accelerate(speed)
+    return v
+
+
+def bench_set_vehicle_properties(count=200000):
+    """
+    Per record cost of set_vehicle_properties with a new factory per record
+    against the shared factories of the FactoryProvider.
+    :param count: Int  Number of records
+    :return: Dict
+    """
+    records = [RECORDS[index % len(RECORDS)] for index in range(count)]
+
+    def new_factories():
+        for record in records:
+            new_factory_set_vehicle_properties(*record)
+
+    def shared_factories():
+        for record in records:
+            set_vehicle_properties(*record)
+
+    _, new_seconds = timed(new_factories)
+    _, shared_seconds = timed(shared_factories)
+    return {
+        'count': count,
+        'new_factory_ns_per_record': new_seconds / count * 1e9,
+        'shared_factory_ns_per_record': shared_seconds / count * 1e9,
+    }
+
+
+def bench_fleet(count=200000, ticks=10):
+    """
+    Memory and accelerate cost of vehicle objects against a VehicleFleet.
+    :param count: Int  Number of vehicles
+    :param ticks: Int  How many times every vehicle is sped up
+    :return: Dict
+    """
+    records = [RECORDS[index % len(RECORDS)] for index in range(count)]
+    vehicles, objects_bytes = peak_memory(lambda: [set_vehicle_properties(*record) for record in records])
+
+    def fill_fleet():
+        fleet = VehicleFleet()
+        for record in records:
+            fleet.add(*record)
+        return fleet
+
+    fleet, fleet_bytes = peak_memory(fill_fleet)
+
+    def accelerate_objects():
+        for _ in range(ticks):
+            for vehicle in vehicles:
+                vehicle.accelerate(1)
+
+    _, objects_seconds = timed(accelerate_objects)
+    _, fleet_seconds = timed(lambda: [fleet.accelerate(1) for _ in range(ticks)])
+    return {
+        'count': count,
+        'objects_bytes_per_vehicle': objects_bytes / count,
+        'fleet_bytes_per_vehicle': fleet_bytes / count,
+        'objects_ns_per_accelerate': objects_seconds / (count * ticks) * 1e9,
+        'fleet_ns_per_accelerate': fleet_seconds / (count * ticks) * 1e9,
+        'same_speeds': [vehicle.speed for vehicle in vehicles] == list(fleet.speeds()),
+    }
+
+
+def bench_pool(count=200000):
+    """
+    Per request cost of making a vehicle with set_vehicle_properties and dropping it,
+    against acquiring one from a VehiclePool and releasing it.
+    :param count: Int  Number of requests
+    :return: Dict
+    """
+    records = [RECORDS[index % len(RECORDS)] for index in range(count)]
+    pool = VehiclePool()
+
+    def new_vehicles():
+        for record in records:
+            set_vehicle_properties(*record)
+
+    def pooled_vehicles():
+        for record in records:
+            pool.release(pool.acquire(*record))
+
+    _, new_seconds = timed(new_vehicles)
+    _, pooled_seconds = timed(pooled_vehicles)
+    results = {
+        'count': count,
+        'new_vehicle_ns_per_request': new_seconds / count * 1e9,
+        'pooled_ns_per_request': pooled_seconds / count * 1e9,
+    }
+    results.update(pool.stats())
+    return results
+
+
+def bench_ingest(count=200000):
+    """
+    Rows per second reading a CSV file with a csv.reader and set_vehicle_properties loop,
+    against VehicleIngest.vehicles and VehicleIngest.fill_fleet. The loop stops at the
+    first bad row, the ingest keeps going, so expect the loop to stay ahead.
+    :param count: Int  Number of rows
+    :return: Dict
+    """
+    text = "".join("{0},{1},{2},{3}\n".format(*RECORDS[index % len(RECORDS)]) for index in range(count))
+
+    def loop():
+        return [set_vehicle_properties(type_, make, model, int(speed))
+                for type_, make, model, speed in csv.reader(io.StringIO(text))]
+
+    _, loop_seconds = timed(loop)
+    ingest = VehicleIngest()
+    _, vehicles_seconds = timed(lambda: list(ingest.vehicles(io.StringIO(text))))
+    fleet_ingest = VehicleIngest()
+    fleet_ingest.fill_fleet(io.StringIO(text))
+    return {
+        'count': count,
+        'loop_rows_per_second': count / loop_seconds,
+        'vehicles_rows_per_second': count / vehicles_seconds,
+        'fill_fleet_rows_per_second': fleet_ingest.rows_per_second,
+    }
+
+
+def bench_report(count=200000):
+    """
+    Time to dump the specs of many vehicles with print_vehicle_specs, against the
+    VehicleReportWriter on vehicle objects and on a VehicleFleet. All three write to memory.
+    :param count: Int  Number of vehicles
+    :return: Dict
+    """
+    vehicles = [set_vehicle_properties(*RECORDS[index % len(RECORDS)]) for index in range(count)]
+    fleet = VehicleFleet.from_vehicles(vehicles)
+
+    def printed():
+        stream = io.StringIO()
+        with contextlib.redirect_stdout(stream):
+            for vehicle in vehicles:
+                print_vehicle_specs(vehicle)
+        return stream.getvalue()
+
+    def written(source):
+        stream = io.StringIO()
+        write_specs(source, stream)
+        return stream.getvalue()
+
+    printed_text, print_seconds = timed(printed)
+    vehicles_text, vehicles_seconds = timed(lambda: written(vehicles))
+    fleet_text, fleet_seconds = timed(lambda: written(fleet))
+    return {
+        'count': count,
+        'print_ns_per_vehicle': print_seconds / count * 1e9,
+        'writer_ns_per_vehicle': vehicles_seconds / count * 1e9,
+        'fleet_writer_ns_per_vehicle': fleet_seconds / count * 1e9,
+        'same_text': printed_text == vehicles_text == fleet_text,
+    }
+
+
+def bench_index(count=200000, queries=100):
+    """
+    Time per query for "Honda motorcycles faster than 170" and "mean speed per mfg",
+    scanning a list of vehicles against asking a FleetIndex. Also the extra cost
+    accelerate pays while the vehicles are watched by the index.
+    :param count: Int  Number of vehicles
+    :param queries: Int  Number of times each query is run
+    :return: Dict
+    """
+    vehicles = [set_vehicle_properties(*RECORDS[index % len(RECORDS)]) for index in range(count)]
+    for index, vehicle in enumerate(vehicles):
+        vehicle.accelerate(index % 50)
+
+    def scan():
+        for _ in range(queries):
+            fast = [v for v in vehicles if v.mfg == "Honda" and v.vehicle_type == "Motor Cycle" and v.speed > 170]
+            totals = {}
+            for v in vehicles:
+                total = totals.setdefault(v.mfg, [0, 0])
+                total[0] += v.speed
+                total[1] += 1
+            means = {mfg: speed / number for mfg, (speed, number) in totals.items()}
+        return len(fast), means
+
+    def indexed():
+        for _ in range(queries):
+            fast = index.find(mfg="Honda", vehicle_type="Motor Cycle", min_speed=171)
+            means = {mfg: stats['mean'] for mfg, stats in index.stats_by('mfg').items()}
+        return len(fast), means
+
+    def accelerate_all():
+        for vehicle in vehicles:
+            vehicle.accelerate(1)
+
+    _, plain_accelerate_seconds = timed(accelerate_all)
+    scanned, scan_seconds = timed(scan)
+    index, build_seconds = timed(lambda: FleetIndex(vehicles))
+    found, index_seconds = timed(indexed)
+    _, watched_accelerate_seconds = timed(accelerate_all)
+    return {
+        'count': count,
+        'scan_us_per_query': scan_seconds / queries * 1e6,
+        'index_us_per_query': index_seconds / queries * 1e6,
+        'build_seconds': build_seconds,
+        'plain_ns_per_accelerate': plain_accelerate_seconds / count * 1e9,
+        'watched_ns_per_accelerate': watched_accelerate_seconds / count * 1e9,
+        'same_results': scanned == found,
+    }
+
+
+def bench_fleet_file(count=200000):
+    """
+    Saving and loading vehicles with pickle, against a fleet file: the time to write,
+    the time until the first vehicle can be read, the time to read everything back
+    and the size on disk.
+    :param count: Int  Number of vehicles
+    :return: Dict
+    """
+    vehicles = [set_vehicle_properties(*RECORDS[index % len(RECORDS)]) for index in range(count)]
+    fleet = VehicleFleet.from_vehicles(vehicles)
+    folder = tempfile.mkdtemp()
+    pickle_path = os.path.join(folder, 'vehicles.pickle')
+    fleet_path = os.path.join(folder, 'vehicles.vfleet')
+
+    def pickle_dump():
+        with open(pickle_path, 'wb') as stream:
+            pickle.dump(vehicles, stream, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def pickle_load():
+        with open(pickle_path, 'rb') as stream:
+            return pickle.load(stream)
+
+    def first_vehicle():
+        with FleetFile(fleet_path) as loaded:
+            return loaded[0]
+
+    def load_fleet():
+        with FleetFile(fleet_path) as loaded:
+            return loaded.to_fleet()
+
+    try:
+        _, pickle_dump_seconds = timed(pickle_dump)
+        _, save_seconds = timed(lambda: save_fleet(fleet, fleet_path))
+        unpickled, pickle_load_seconds = timed(pickle_load)
+        _, first_seconds = timed(first_vehicle)
+        loaded, load_seconds = timed(load_fleet)
+        results = {
+            'count': count,
+            'pickle_dump_seconds': pickle_dump_seconds,
+            'fleet_file_save_seconds': save_seconds,
+            'pickle_load_seconds': pickle_load_seconds,
+            'fleet_file_first_vehicle_seconds': first_seconds,
+            'fleet_file_load_seconds': load_seconds,
+            'pickle_bytes': os.path.getsize(pickle_path),
+            'fleet_file_bytes': os.path.getsize(fleet_path),
+            'same_speeds': [v.speed for v in unpickled] == list(loaded.speeds()),
+        }
+    finally:
+        shutil.rmtree(folder)
+    return results
+
+
+def main():  # pragma: no cover
+    print_results("New vs shared factories in set_vehicle_properties", bench_set_vehicle_properties())
+    print_results("Vehicle objects vs VehicleFleet", bench_fleet())
+    print_results("New vehicles vs VehiclePool", bench_pool())
+    print_results("CSV ingestion", bench_ingest())
+    print_results("print_vehicle_specs vs VehicleReportWriter", bench_report())
+    print_results("Scanning vehicles vs FleetIndex", bench_index())
+    print_results("pickle vs fleet file", bench_fleet_file())
+
+
+if __name__ == "__main__":  # pragma: no cover
+    # execute only if run as a script
+    main()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+A columnar fleet of vehicles.
+
+Every HarleyDavidson, Honda, MercedezBenz and Lexus is a full Python object
+with a __dict__ holding its wheels, vehicle_type, mfg, model and speed. With
+millions of them, speeding all of them up is millions of method calls.
+
+The VehicleFleet keeps the same data as a "structure of arrays". The class,
+vehicle_type, mfg and model of every vehicle are stored as small integer codes
+into a Categories table (each distinct string is kept once), and the speeds
+are one contiguous array of doubles, next to one flag per row telling whether
+the speed is still a whole number (an int on the vehicle object). Speeding up the whole fleet, or the
+vehicles picked by a mask or a list of row numbers, is one pass over that
+array, vectorized with NumPy when it is installed.
+
+Vehicles go in and come out as the normal vehicle classes at the edges, with
+add_vehicle() / from_vehicles() and vehicle() / to_vehicles().
+"""
+import numbers
+from array import array
+
+from src.theory.patterns.abstract_factory.abstract_factory import get_vehicle_class
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class Categories(object):
+    """
+    A categorical column: every distinct value is stored once and given an integer code.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.__codes = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, code):
+        return self.values[code]
+
+    def code(self, value):
+        """
+        The code of a value, adding the value the first time it is seen.
+        :param value: Hashable
+        :return: Int
+        """
+        try:
+            return self.__codes[value]
+        except KeyError:
+            code = self.__codes[value] = len(self.values)
+            self.values.append(value)
+            return code
+
+    def find(self, value):
+        """
+        The code of a value without adding it.
+        :param value: Hashable
+        :return: Int or None when the value has never been seen
+        """
+        return self.__codes.get(value)
+
+
+class VehicleFleet(object):
+    """
+    Structure of arrays holding many vehicles.
+    """
+
+    def __init__(self):
+        self.classes = Categories()
+        self.vehicle_types = Categories()
+        self.mfgs = Categories()
+        self.models = Categories()
+        self.__class_codes = array('i')
+        self.__type_codes = array('i')
+        self.__mfg_codes = array('i')
+        self.__model_codes = array('i')
+        self.__speed = array('d')
+        self.__whole = array('b')
+        self.__prototypes = {}
+
+    @classmethod
+    def from_vehicles(cls, vehicles):
+        """
+        Build a fleet out of vehicle objects.
+        :param vehicles: Iterable of vehicles
+        :return: VehicleFleet
+        """
+        fleet = cls()
+        for vehicle in vehicles:
+            fleet.add_vehicle(vehicle)
+        return fleet
+
+    @classmethod
+    def from_columns(cls, tables, codes, speeds, integral=True):
+        """
+        Build a fleet straight out of its columns, e.g. read back from a fleet file.
+        :param tables: Tuple of 4 Lists  The distinct classes, vehicle_types, mfgs and models, in code order
+        :param codes: Tuple of 4 array('i')  The class, vehicle_type, mfg and model code of every row
+        :param speeds: array('d')  The speed of every row
+        :param integral: Bool  Every speed is a whole number, or none is,
+                         or array('b')  One flag per row, see whole_speeds()
+        :return: VehicleFleet
+        """
+        fleet = cls()
+        for categories, values in zip((fleet.classes, fleet.vehicle_types, fleet.mfgs, fleet.models), tables):
+            for value in values:
+                categories.code(value)
+        columns = (fleet.__class_codes, fleet.__type_codes, fleet.__mfg_codes, fleet.__model_codes)
+        for column, column_codes in zip(columns, codes):
+            if len(column_codes) != len(speeds):
+                raise ValueError('Every column must have one entry per vehicle.')
+            column.extend(column_codes)
+        whole = array('b', [integral]) * len(speeds) if isinstance(integral, bool) else array('b', integral)
+        if len(whole) != len(speeds):
+            raise ValueError('Every column must have one entry per vehicle.')
+        fleet.__speed.extend(speeds)
+        fleet.__whole = whole
+        return fleet
+
+    def __len__(self):
+        return len(self.__speed)
+
+    def __append(self, vehicle_class, vehicle_type, mfg, model, speed):
+        self.__class_codes.append(self.classes.code(vehicle_class))
+        self.__type_codes.append(self.vehicle_types.code(vehicle_type))
+        self.__mfg_codes.append(self.mfgs.code(mfg))
+        self.__model_codes.append(self.models.code(model))
+        self.__speed.append(speed)
+        self.__whole.append(isinstance(speed, numbers.Integral))
+        return len(self) - 1
+
+    def add(self, type_, make, model="", speed=0):
+        """
+        Add a vehicle the way set_vehicle_properties makes one, without creating it.
+        Raises the same TypeErrors for unknown types and brands.
+        :param type_:  STR  Type of vehicle
+        :param make:   STR  Manufacturer Name
+        :param model:  STR  Vehicle model Name
+        :param speed:  INT  An integer indicating relative speed
+        :return: Int  The row number of the vehicle in the fleet
+        """
+        return self.append(get_vehicle_class(type_, make), model, speed)
+
+    def append(self, vehicle_class, model="", speed=0):
+        """
+        Add a vehicle of a known class, without creating it.
+        :param vehicle_class: Class  e.g. from get_vehicle_class
+        :param model:  STR  Vehicle model Name
+        :param speed:  INT  An integer indicating relative speed
+        :return: Int  The row number of the vehicle in the fleet
+        """
+        prototype = self.__prototypes.get(vehicle_class)
+        if prototype is None:
+            prototype = self.__prototypes[vehicle_class] = vehicle_class()
+        return self.__append(vehicle_class, prototype.vehicle_type, prototype.mfg, model, prototype.speed + speed)
+
+    def add_vehicle(self, vehicle):
+        """
+        Add the data of a vehicle object.
+        :param vehicle: A vehicle
+        :return: Int  The row number of the vehicle in the fleet
+        """
+        return self.__append(type(vehicle), vehicle.vehicle_type, vehicle.mfg, vehicle.model, vehicle.speed)
+
+    @property
+    def integral(self):
+        """
+        True while every speed is a whole number.
+        """
+        if np is not None and len(self):
+            return bool(np.frombuffer(self.__whole, dtype=np.int8).all())
+        return all(self.__whole)
+
+    def whole_speeds(self):
+        """
+        One flag per row, 1 while the speed of the row is a whole number: it was
+        an int, and every accelerate of that row was by an int too.
+        The array is the fleet's own, do not change it.
+        :return: array('b')
+        """
+        return self.__whole
+
+    def __speed_value(self, index):
+        speed = self.__speed[index]
+        return int(speed) if self.__whole[index] else speed
+
+    def vehicle(self, index):
+        """
+        Make a vehicle object out of one row.
+        :param index: Int  Row number
+        :return: A vehicle
+        """
+        vehicle = self.classes[self.__class_codes[index]]()
+        vehicle.vehicle_type = self.vehicle_types[self.__type_codes[index]]
+        vehicle.mfg = self.mfgs[self.__mfg_codes[index]]
+        vehicle.model = self.models[self.__model_codes[index]]
+        vehicle.speed = self.__speed_value(index)
+        return vehicle
+
+    def to_vehicles(self):
+        """
+        :return: List of vehicles, one per row
+        """
+        return [self.vehicle(index) for index in range(len(self))]
+
+    def columns(self):
+        """
+        The code columns and the speeds, for code that walks the whole fleet without
+        making vehicle objects. Look the codes up in classes, vehicle_types, mfgs and models.
+        The code arrays are the fleet's own, do not change them. Every speed is an int
+        or a float row by row, the same as on the vehicle objects.
+        :return: Tuple(class codes, vehicle_type codes, mfg codes, model codes, List of speeds)
+        """
+        if np is None:
+            return self.codes() + (self.speeds(),)
+        integral = self.integral
+        speeds = self.speeds().tolist()
+        if not integral and any(self.__whole):
+            speeds = [int(speed) if whole else speed for speed, whole in zip(speeds, self.__whole)]
+        return self.codes() + (speeds,)
+
+    def codes(self):
+        """
+        The code columns alone, see columns().
+        :return: Tuple of 4 array('i')  class, vehicle_type, mfg and model codes
+        """
+        return self.__class_codes, self.__type_codes, self.__mfg_codes, self.__model_codes
+
+    def speeds(self):
+        """
+        A copy of the speed column. The NumPy array holds whole numbers while every
+        speed is one (see integral), and floats otherwise. The list holds an int or
+        a float row by row, like the vehicle objects.
+        :return: numpy.ndarray or List
+        """
+        if np is not None:
+            speeds = np.frombuffer(self.__speed, dtype=np.float64)
+            return speeds.astype(np.int64) if self.integral else speeds.copy()
+        return [int(speed) if whole else speed for speed, whole in zip(self.__speed, self.__whole)]
+
+    def select(self, vehicle_type=None, mfg=None, model=None):
+        """
+        A mask of the rows that match every value given.
+        :param vehicle_type: STR  "Motor Cycle" or "Automobile"
+        :param mfg: STR  Manufacturer Name
+        :param model: STR  Vehicle model Name
+        :return: numpy.ndarray or List of Bool
+        """
+        checks = [(codes, categories.find(value)) for codes, categories, value in
+                  ((self.__type_codes, self.vehicle_types, vehicle_type), (self.__mfg_codes, self.mfgs, mfg),
+                   (self.__model_codes, self.models, model)) if value is not None]
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            for codes, code in checks:
+                mask &= np.frombuffer(codes, dtype=np.intc) == (-1 if code is None else code)
+            return mask
+        mask = [True] * len(self)
+        for codes, code in checks:
+            mask = [flag and row_code == code for flag, row_code in zip(mask, codes)]
+        return mask
+
+    def accelerate(self, speed, where=None):
+        """
+        Speed up many vehicles at once, like calling accelerate(speed) on each one.
+        :param speed: INT  How much to add to the speed
+        :param where: Which vehicles: None for all of them, a mask with one Bool per row,
+                      or a list of row numbers (a row listed twice is sped up twice)
+        :return: None
+        """
+        whole = isinstance(speed, numbers.Integral)
+        if np is not None:
+            speeds = np.frombuffer(self.__speed, dtype=np.float64)
+            flags = np.frombuffer(self.__whole, dtype=np.int8)
+            if where is None:
+                speeds += speed
+                if not whole:
+                    flags[:] = 0
+                return
+            where = np.asarray(where)
+            if where.dtype == bool:
+                if len(where) != len(self):
+                    raise IndexError('The mask must have one entry per vehicle.')
+                speeds[where] += speed
+            elif not where.size:
+                return
+            else:
+                np.add.at(speeds, where, speed)
+            if not whole:
+                flags[where] = 0
+            return
+        if where is None:
+            where = range(len(self))
+        else:
+            where = list(where)
+            if where and isinstance(where[0], bool):
+                if len(where) != len(self):
+                    raise IndexError('The mask must have one entry per vehicle.')
+                where = [index for index, flag in enumerate(where) if flag]
+        for index in where:
+            self.__speed[index] += speed
+            if not whole:
+                self.__whole[index] = 0
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+A compact binary file format for fleets of vehicles.
+
+Pickling a list of millions of vehicle objects writes the class and the
+attribute names of every one of them, and loading it makes every object again
+before the first one can be used.
+
+A fleet file holds the same data as a VehicleFleet:
+
+    MAGIC                 8 bytes   b'VFLEET01'
+    header length         8 bytes   little endian unsigned
+    header                JSON      count, integral, whole_flags and the string
+                                    tables: classes ('module:QualifiedName'),
+                                    vehicle_types, mfgs and models
+    padding               to a multiple of 8 bytes
+    records               RECORD.size bytes each
+    whole flags           1 byte per record, only when whole_flags is true,
+                          padded to a multiple of 8 bytes
+
+Every record is four int32 codes into the string tables (class, vehicle_type,
+mfg, model) and the speed as a float64. When some speeds are whole numbers
+and some are not, the whole flags say which speeds come back as ints, like
+VehicleFleet.whole_speeds(). The FleetFile memory maps the file:
+opening it only reads the header, and a record is unpacked when it is asked
+for. to_fleet() reads every record at once, with NumPy when it is installed.
+
+Opening a file imports the modules its classes come from, so only open fleet
+files from places you trust, the same as with pickle.
+
+Details about the struct module:
+https://docs.python.org/3/library/struct.html
+"""
+import importlib
+import json
+import mmap
+import struct
+from array import array
+
+from src.theory.patterns.abstract_factory.fleet import VehicleFleet
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+MAGIC = b'VFLEET01'
+
+HEADER_LENGTH = struct.Struct('<Q')
+
+RECORD = struct.Struct('<iiiid')
+
+RECORD_FIELDS = ('class_code', 'type_code', 'mfg_code', 'model_code', 'speed')
+
+VERSION = 1
+
+
+def record_dtype():
+    """
+    :return: numpy.dtype  The structured dtype of one record, same layout as RECORD
+    """
+    return np.dtype([(name, '<i4') for name in RECORD_FIELDS[:-1]] + [('speed', '<f8')])
+
+
+def class_name(vehicle_class):
+    """
+    :param vehicle_class: Class
+    :return: Str  'module:QualifiedName'
+    """
+    return '{0}:{1}'.format(vehicle_class.__module__, vehicle_class.__qualname__)
+
+
+def load_class(name):
+    """
+    Import a class named by class_name.
+    :param name: Str  'module:QualifiedName'
+    :return: Class
+    """
+    module_name, _, qualified_name = name.partition(':')
+    found = importlib.import_module(module_name)
+    for attribute in qualified_name.split('.'):
+        found = getattr(found, attribute)
+    return found
+
+
+def save_fleet(vehicles, path):
+    """
+    Write vehicles to a fleet file.
+    :param vehicles: VehicleFleet, or an iterable of vehicles
+    :param path: Str  Path of the file to write
+    :return: Int  The number of vehicles written
+    """
+    fleet = vehicles if isinstance(vehicles, VehicleFleet) else VehicleFleet.from_vehicles(vehicles)
+    class_codes, type_codes, mfg_codes, model_codes = fleet.codes()
+    speeds = fleet.speeds()
+    integral = fleet.integral
+    whole_flags = not integral and any(fleet.whole_speeds())
+    header = json.dumps({
+        'version': VERSION,
+        'count': len(fleet),
+        'integral': integral,
+        'whole_flags': whole_flags,
+        'classes': [class_name(vehicle_class) for vehicle_class in fleet.classes.values],
+        'vehicle_types': fleet.vehicle_types.values,
+        'mfgs': fleet.mfgs.values,
+        'models': fleet.models.values,
+    }).encode('utf-8')
+    padding = -(len(MAGIC) + HEADER_LENGTH.size + len(header)) % 8
+    with open(path, 'wb') as stream:
+        stream.write(MAGIC + HEADER_LENGTH.pack(len(header) + padding) + header + b' ' * padding)
+        if np is not None:
+            records = np.empty(len(fleet), dtype=record_dtype())
+            for name, column in zip(RECORD_FIELDS, (class_codes, type_codes, mfg_codes, model_codes)):
+                records[name] = np.frombuffer(column, dtype=np.intc) if len(column) else 0
+            records['speed'] = speeds
+            records.tofile(stream)
+        else:
+            pack = RECORD.pack
+            stream.write(b''.join(pack(*row) for row in zip(class_codes, type_codes, mfg_codes, model_codes,
+                                                            speeds)))
+        if whole_flags:
+            stream.write(fleet.whole_speeds().tobytes() + b'\0' * (-len(fleet) % 8))
+    return len(fleet)
+
+
+class FleetFile(object):
+    """
+    A memory mapped fleet file, read record by record.
+    Use it as a context manager, or call close() when done.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as stream:
+            self.__map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.__read_header()
+        except Exception:
+            self.__map.close()
+            raise
+
+    def __read_header(self):
+        if self.__map[:len(MAGIC)] != MAGIC:
+            raise ValueError('Not a fleet file: {0}'.format(self.path))
+        length, = HEADER_LENGTH.unpack_from(self.__map, len(MAGIC))
+        self.offset = len(MAGIC) + HEADER_LENGTH.size + length
+        header = json.loads(self.__map[len(MAGIC) + HEADER_LENGTH.size:self.offset].decode('utf-8'))
+        if header.get('version') != VERSION:
+            raise ValueError('Unsupported fleet file version: {0}'.format(header.get('version')))
+        self.count = header['count']
+        self.integral = header['integral']
+        self.__flags = self.offset + self.count * RECORD.size if header.get('whole_flags') else None
+        if len(self.__map) < self.offset + self.count * (RECORD.size + (self.__flags is not None)):
+            raise ValueError('Fleet file is truncated: {0}'.format(self.path))
+        self.classes = [load_class(name) for name in header['classes']]
+        self.vehicle_types = header['vehicle_types']
+        self.mfgs = header['mfgs']
+        self.models = header['models']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.__map.close()
+
+    def __len__(self):
+        return self.count
+
+    def record(self, index):
+        """
+        Unpack one record.
+        :param index: Int  Row number, negative numbers count from the end
+        :return: Tuple(vehicle class, vehicle_type, mfg, model, speed)
+        """
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('Fleet file index out of range.')
+        class_code, type_code, mfg_code, model_code, speed = RECORD.unpack_from(
+            self.__map, self.offset + index * RECORD.size)
+        whole = self.integral if self.__flags is None else self.__map[self.__flags + index]
+        return (self.classes[class_code], self.vehicle_types[type_code], self.mfgs[mfg_code],
+                self.models[model_code], int(speed) if whole else speed)
+
+    def vehicle(self, index):
+        """
+        Make a vehicle object out of one record, like VehicleFleet.vehicle.
+        :param index: Int  Row number
+        :return: A vehicle
+        """
+        vehicle_class, vehicle_type, mfg, model, speed = self.record(index)
+        vehicle = vehicle_class()
+        vehicle.vehicle_type = vehicle_type
+        vehicle.mfg = mfg
+        vehicle.model = model
+        vehicle.speed = speed
+        return vehicle
+
+    __getitem__ = vehicle
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.vehicle(index)
+
+    def to_fleet(self):
+        """
+        Read every record into a VehicleFleet.
+        :return: VehicleFleet
+        """
+        tables = (self.classes, self.vehicle_types, self.mfgs, self.models)
+        columns = [array('i') for _ in range(4)]
+        speeds = array('d')
+        if np is not None:
+            records = np.frombuffer(self.__map, dtype=record_dtype(), count=self.count, offset=self.offset)
+            for column, name in zip(columns, RECORD_FIELDS):
+                column.frombytes(records[name].astype(np.intc).tobytes())
+            speeds.frombytes(records['speed'].astype(np.float64).tobytes())
+            del records
+        else:
+            for row in RECORD.iter_unpack(self.__map[self.offset:self.offset + self.count * RECORD.size]):
+                for column, value in zip(columns, row):
+                    column.append(value)
+                speeds.append(row[-1])
+        whole = self.integral
+        if self.__flags is not None:
+            whole = array('b')
+            whole.frombytes(self.__map[self.__flags:self.__flags + self.count])
+        return VehicleFleet.from_columns(tables, columns, speeds, whole)
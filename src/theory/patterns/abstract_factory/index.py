@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Indexed queries over vehicle objects.
+
+Questions like "all Honda motorcycles faster than 100" or "average speed per
+mfg" are a scan over every vehicle when the vehicles are only in a list. The
+FleetIndex keeps the vehicles grouped by mfg, vehicle_type and model, and
+every group keeps its vehicles sorted by speed, with a running total of their
+speeds. So:
+
+- finding the vehicles of one mfg, type or model is a dict lookup,
+- a speed range inside a group is two binary searches,
+- count, mean and max of a whole group are read straight off the group.
+
+The index watches every vehicle it holds (see abstract_factory.watch), so
+set_model, accelerate and VehiclePool.release keep it up to date. Attributes
+assigned directly, like vehicle.speed = 0, are not seen; call refresh() after
+doing that. Vehicles only hold a weak reference to the index, so an index that
+is dropped gets collected and stops being told about changes.
+
+Details about the bisect module:
+https://docs.python.org/3/library/bisect.html
+"""
+from bisect import bisect_left, insort
+from itertools import chain, count
+
+from src.theory.patterns.abstract_factory.abstract_factory import watch, unwatch
+
+FIELDS = ('mfg', 'vehicle_type', 'model')
+
+
+class SpeedGroup(object):
+    """
+    Vehicles sorted by speed, with the total of their speeds.
+    Entries are (speed, sequence number, vehicle) keys, so every entry is unique and
+    found again with a binary search. They are kept in buckets of at most 2 * load
+    sorted entries, so an insert or delete moves a few hundred entries and not the whole group.
+    """
+
+    def __init__(self, load=512):
+        self.load = load
+        self.buckets = []
+        self.maxes = []
+        self.size = 0
+        self.total = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, key):
+        """
+        :param key: Tuple(speed, sequence number, vehicle)
+        :return: None
+        """
+        self.size += 1
+        self.total += key[0]
+        if not self.buckets:
+            self.buckets.append([key])
+            self.maxes.append(key)
+            return
+        index = bisect_left(self.maxes, key)
+        if index == len(self.buckets):
+            index -= 1
+            self.buckets[index].append(key)
+            self.maxes[index] = key
+        else:
+            insort(self.buckets[index], key)
+        bucket = self.buckets[index]
+        if len(bucket) > 2 * self.load:
+            self.buckets[index:index + 1] = [bucket[:self.load], bucket[self.load:]]
+            self.maxes[index:index + 1] = [bucket[self.load - 1], bucket[-1]]
+
+    def remove(self, key):
+        """
+        :param key: Tuple(speed, sequence number, vehicle)  The key given to add()
+        :return: None
+        """
+        index = bisect_left(self.maxes, key)
+        bucket = self.buckets[index] if index < len(self.buckets) else []
+        position = bisect_left(bucket, key)
+        if position == len(bucket) or bucket[position] is not key:
+            raise ValueError('Vehicle is not in the group with a speed of {0}'.format(key[0]))
+        del bucket[position]
+        self.size -= 1
+        self.total -= key[0]
+        if bucket:
+            self.maxes[index] = bucket[-1]
+        else:
+            del self.buckets[index]
+            del self.maxes[index]
+
+    def __position(self, key):
+        index = bisect_left(self.maxes, key)
+        if index == len(self.buckets):
+            return index, 0
+        return index, bisect_left(self.buckets[index], key)
+
+    def __bounds(self, min_speed, max_speed):
+        start = (0, 0) if min_speed is None else self.__position((min_speed,))
+        stop = (len(self.buckets), 0) if max_speed is None else self.__position((max_speed, float('inf')))
+        return start, max(start, stop)
+
+    def keys(self, min_speed=None, max_speed=None):
+        """
+        :return: Iterator of the keys with min_speed <= speed <= max_speed, slowest first
+        """
+        (first, start), (last, stop) = self.__bounds(min_speed, max_speed)
+        if first == last:
+            return iter(self.buckets[first][start:stop] if first < len(self.buckets) else [])
+        return chain(self.buckets[first][start:], chain.from_iterable(self.buckets[first + 1:last]),
+                     self.buckets[last][:stop] if last < len(self.buckets) else [])
+
+    def count(self, min_speed=None, max_speed=None):
+        """
+        :return: Int  The number of keys with min_speed <= speed <= max_speed
+        """
+        if min_speed is None and max_speed is None:
+            return self.size
+        (first, start), (last, stop) = self.__bounds(min_speed, max_speed)
+        return sum(len(bucket) for bucket in self.buckets[first:last]) - start + stop
+
+    def last(self, min_speed=None, max_speed=None):
+        """
+        :return: The fastest key with min_speed <= speed <= max_speed, None when there is none
+        """
+        start, (last, stop) = self.__bounds(min_speed, max_speed)
+        if start == (last, stop):
+            return None
+        if stop == 0:
+            return self.buckets[last - 1][-1]
+        return self.buckets[last][stop - 1]
+
+
+class FleetIndex(object):
+    """
+    Vehicle objects indexed by mfg, vehicle_type, model and speed.
+    Every query takes the same keywords: mfg, vehicle_type and model must be equal,
+    min_speed and max_speed are inclusive bounds.
+    """
+
+    def __init__(self, vehicles=()):
+        self.__all = SpeedGroup()
+        self.__groups = {field: {} for field in FIELDS}
+        self.__members = {}
+        self.__sequence = count()
+        for vehicle in vehicles:
+            self.add(vehicle)
+
+    def __len__(self):
+        return len(self.__members)
+
+    def __contains__(self, vehicle):
+        return id(vehicle) in self.__members
+
+    def __insert(self, vehicle):
+        values = tuple(getattr(vehicle, field) for field in FIELDS)
+        key = (vehicle.speed, next(self.__sequence), vehicle)
+        self.__members[id(vehicle)] = (key, values)
+        self.__all.add(key)
+        for field, value in zip(FIELDS, values):
+            group = self.__groups[field].get(value)
+            if group is None:
+                group = self.__groups[field][value] = SpeedGroup()
+            group.add(key)
+
+    def __delete(self, vehicle):
+        key, values = self.__members.pop(id(vehicle))
+        self.__all.remove(key)
+        for field, value in zip(FIELDS, values):
+            groups = self.__groups[field]
+            groups[value].remove(key)
+            if not groups[value]:
+                del groups[value]
+
+    def add(self, vehicle):
+        """
+        Index a vehicle and start watching it. Adding a vehicle that is already in the index does nothing.
+        :param vehicle: A vehicle
+        :return: None
+        """
+        if vehicle in self:
+            return
+        self.__insert(vehicle)
+        watch(vehicle, self.changed)
+
+    def remove(self, vehicle):
+        """
+        Drop a vehicle from the index and stop watching it.
+        :param vehicle: A vehicle in the index
+        :return: None
+        """
+        if vehicle not in self:
+            raise KeyError(vehicle)
+        self.__delete(vehicle)
+        unwatch(vehicle, self.changed)
+
+    def refresh(self, vehicle):
+        """
+        Index a vehicle again after its attributes were assigned directly.
+        :param vehicle: A vehicle in the index
+        :return: None
+        """
+        self.__delete(vehicle)
+        self.__insert(vehicle)
+
+    def changed(self, vehicle, name, old):
+        """
+        The watcher the index gives to every vehicle, called after set_model and accelerate.
+        """
+        if vehicle in self:
+            self.refresh(vehicle)
+
+    def __group(self, mfg, vehicle_type, model):
+        """
+        The smallest group matching one of the keywords, and the other keywords still to check.
+        """
+        chosen, chosen_field = self.__all, None
+        wanted = [(field, value) for field, value in zip(FIELDS, (mfg, vehicle_type, model)) if value is not None]
+        for field, value in wanted:
+            group = self.__groups[field].get(value)
+            if group is None:
+                return SpeedGroup(), []
+            if chosen_field is None or len(group) < len(chosen):
+                chosen, chosen_field = group, field
+        return chosen, [(field, value) for field, value in wanted if field != chosen_field]
+
+    def __keys(self, mfg, vehicle_type, model, min_speed, max_speed):
+        """
+        :return: Tuple(SpeedGroup, List of matching keys or None when every key in the speed range matches)
+        """
+        group, checks = self.__group(mfg, vehicle_type, model)
+        if not checks:
+            return group, None
+        return group, [key for key in group.keys(min_speed, max_speed)
+                       if all(getattr(key[2], field) == value for field, value in checks)]
+
+    def find(self, mfg=None, vehicle_type=None, model=None, min_speed=None, max_speed=None):
+        """
+        The vehicles that match every keyword, slowest first.
+        :return: List of vehicles
+        """
+        group, keys = self.__keys(mfg, vehicle_type, model, min_speed, max_speed)
+        return [key[2] for key in (group.keys(min_speed, max_speed) if keys is None else keys)]
+
+    def count(self, mfg=None, vehicle_type=None, model=None, min_speed=None, max_speed=None):
+        """
+        :return: Int  The number of vehicles that match every keyword
+        """
+        group, keys = self.__keys(mfg, vehicle_type, model, min_speed, max_speed)
+        return group.count(min_speed, max_speed) if keys is None else len(keys)
+
+    def mean(self, mfg=None, vehicle_type=None, model=None, min_speed=None, max_speed=None):
+        """
+        :return: Float  The mean speed of the vehicles that match every keyword, None when none do
+        """
+        group, keys = self.__keys(mfg, vehicle_type, model, min_speed, max_speed)
+        if keys is None:
+            if min_speed is None and max_speed is None:
+                return group.total / len(group) if group else None
+            keys = list(group.keys(min_speed, max_speed))
+        return sum(key[0] for key in keys) / len(keys) if keys else None
+
+    def max(self, mfg=None, vehicle_type=None, model=None, min_speed=None, max_speed=None):
+        """
+        :return: The top speed of the vehicles that match every keyword, None when none do
+        """
+        group, keys = self.__keys(mfg, vehicle_type, model, min_speed, max_speed)
+        key = group.last(min_speed, max_speed) if keys is None else (keys[-1] if keys else None)
+        return None if key is None else key[0]
+
+    def stats_by(self, field):
+        """
+        count, mean and max speed of every group of one field, e.g. the average speed per mfg.
+        :param field: STR  'mfg', 'vehicle_type' or 'model'
+        :return: Dict  value -> Dict(count, mean, max)
+        """
+        if field not in self.__groups:
+            raise ValueError('Can not group vehicles by: {0}'.format(field))
+        return {value: {'count': len(group), 'mean': group.total / len(group), 'max': group.last()[0]}
+                for value, group in self.__groups[field].items()}
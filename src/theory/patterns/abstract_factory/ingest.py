@@ -0,0 +1,318 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming ingestion of vehicles from flat files.
+
+Files hold one vehicle per row: type, make, model and speed, the same
+arguments set_vehicle_properties takes. Either as CSV:
+
+    Motorcycle,Harley Davidson,Touring,100
+
+or as JSON lines, each a list or an object with those four keys:
+
+    {"type": "Automobile", "make": "Lexus", "model": "RX 350", "speed": 85}
+
+The VehicleIngest reads the file lazily, chunk_size lines at a time, so the
+whole file is never in memory. The vehicle class for every distinct
+(type, make) is looked up once and reused for the rest of the rows. Rows that
+can not be read or name an unknown type or brand do not stop the stream, they
+are kept in errors with their line number. Every line is one row: a quote
+left open is an error on its own line, it does not swallow the lines after it.
+
+In one process vehicles() is not faster than a plain loop of csv.reader and
+set_vehicle_properties, it is a little slower (see benchmarks.bench_ingest).
+What it adds is the bounded memory, the errors, and the worker processes.
+
+For very large files the chunks can be handed to a pool of worker processes.
+At most `window` chunks are in flight at a time, so memory stays bounded, and
+the vehicles still come out in file order. Worker processes look brands up
+in their own registry, so brands added with register() after start up are only
+seen there when the workers are forked.
+
+Details about the csv module:
+https://docs.python.org/3/library/csv.html
+"""
+import collections
+import concurrent.futures
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+from src.theory.patterns.abstract_factory.abstract_factory import get_vehicle_class
+from src.theory.patterns.abstract_factory.fleet import VehicleFleet
+
+FIELDS = ('type', 'make', 'model', 'speed')
+
+FORMATS = ('csv', 'jsonl')
+
+RowError = collections.namedtuple('RowError', ['line', 'text', 'message'])
+
+
+def parse_speed(speed):
+    """
+    :param speed: Int, Float or Str  The speed column of a row
+    :return: Int or Float
+    """
+    if speed.__class__ is str:
+        try:
+            return int(speed)
+        except ValueError:
+            pass
+    elif speed.__class__ in (int, float):
+        return speed
+    raise ValueError('Speed must be a number: {0!r}'.format(speed))
+
+
+def is_header(row):
+    return isinstance(row, list) and tuple(str(field).strip().lower() for field in row) == FIELDS
+
+
+def check_row(row):
+    """
+    Check the fields of a row that has been read.
+    :param row: List of fields, or a Dict for JSON lines
+    :return: Tuple(type_, make, model, speed), or None for a blank line
+    """
+    if row.__class__ is dict:
+        missing = [field for field in FIELDS if field not in row]
+        if missing:
+            raise ValueError('Row is missing: {0}'.format(', '.join(missing)))
+        row = [row[field] for field in FIELDS]
+    elif row.__class__ is not list:
+        raise ValueError('Row must have {0} fields: {1}'.format(len(FIELDS), ', '.join(FIELDS)))
+    if len(row) != len(FIELDS):
+        if not row or row == ['']:
+            return None
+        raise ValueError('Row must have {0} fields: {1}'.format(len(FIELDS), ', '.join(FIELDS)))
+    type_, make, model, speed = row
+    return type_, make, model, parse_speed(speed)
+
+
+def parse_row(text, fmt='csv'):
+    """
+    Read one line of a file.
+    :param text: Str  The line
+    :param fmt: Str  'csv' or 'jsonl'
+    :return: Tuple(type_, make, model, speed), or None for a header or blank line
+    """
+    if not text.strip():
+        return None
+    row = read_line(text) if fmt == 'csv' else json.loads(text)
+    if isinstance(row, ValueError):
+        raise row
+    return None if is_header(row) else check_row(row)
+
+
+def read_line(text):
+    """
+    Read one CSV line on its own, a quote left open does not carry over to the next line.
+    :param text: Str  The line
+    :return: List of fields, or the ValueError the line raised
+    """
+    try:
+        return next(csv.reader([text]), [])
+    except csv.Error as error:
+        return ValueError(str(error))
+
+
+def read_rows(texts, fmt='csv'):
+    """
+    Read a chunk of lines, every line on its own. CSV lines go through one csv.reader
+    as long as it reads one line per row. When a quote left open runs over into the
+    next lines, or the reader raises, that line is read again by itself and a new
+    reader starts after it. So the rows never depend on where the chunks start and end.
+    :param texts: List of Str  The lines
+    :param fmt: Str  'csv' or 'jsonl'
+    :return: Generator with one entry per line: the fields, or the ValueError the line raised
+    """
+    if fmt != 'csv':
+        for text in texts:
+            try:
+                yield json.loads(text) if text.strip() else []
+            except ValueError as error:
+                yield error
+        return
+    start = 0
+    while start < len(texts):
+        reader = csv.reader(texts if not start else texts[start:])
+        expected = 1
+        try:
+            for row in reader:
+                if reader.line_num != expected:
+                    break
+                yield row
+                expected += 1
+            else:
+                return
+        except csv.Error:
+            pass
+        yield read_line(texts[start + expected - 1])
+        start += expected
+
+
+def convert_chunk(start, texts, fmt='csv', columnar=False):
+    """
+    Turn a chunk of lines into vehicles, this is what runs inside a worker.
+    CSV rows of four fields with a whole number speed skip check_row.
+    :param start: Int  Line number of the first line
+    :param texts: List of Str  The lines
+    :param fmt: Str  'csv' or 'jsonl'
+    :param columnar: Bool  Send back Tuple(vehicle class, model, speed) instead of vehicles
+    :return: Tuple(List of vehicles or rows, List of RowError)
+    """
+    classes = {}
+    results = []
+    errors = []
+    append = results.append
+    csv_rows = fmt == 'csv'  # JSONL speeds are already numbers, or bools that check_row rejects
+    for index, row in enumerate(read_rows(texts, fmt)):
+        try:
+            if csv_rows and row.__class__ is list and len(row) == 4 and (index or start != 1):
+                type_, make, model, speed = row
+                try:
+                    speed = int(speed)
+                except ValueError:
+                    speed = parse_speed(speed)
+            else:
+                if isinstance(row, ValueError):
+                    raise row
+                if not index and start == 1 and is_header(row):
+                    continue
+                row = check_row(row)
+                if row is None:
+                    continue
+                type_, make, model, speed = row
+            vehicle_class = classes.get((type_, make))
+            if vehicle_class is None:
+                try:
+                    vehicle_class = get_vehicle_class(type_, make)
+                except TypeError as error:
+                    vehicle_class = error
+                classes[(type_, make)] = vehicle_class
+            if vehicle_class.__class__ is TypeError:
+                raise vehicle_class
+        except (TypeError, ValueError) as error:
+            errors.append(RowError(start + index, texts[index].rstrip('\r\n'), str(error)))
+            continue
+        if columnar:
+            append((vehicle_class, model, speed))
+        else:
+            vehicle = vehicle_class()
+            vehicle.set_model(model)
+            vehicle.accelerate(speed)
+            append(vehicle)
+    return results, errors
+
+
+class VehicleIngest(object):
+    """
+    Reads vehicles out of a CSV or JSON lines file object, chunk by chunk.
+    """
+
+    def __init__(self, fmt='csv', chunk_size=10000, max_workers=0, window=None):
+        """
+        :param fmt: Str  'csv' or 'jsonl'
+        :param chunk_size: Int  Lines read and converted at a time
+        :param max_workers: Int  Worker processes, 0 converts in this process
+        :param window: Int  Most chunks in flight at once, defaults to two per worker
+        """
+        if fmt not in FORMATS:
+            raise ValueError('fmt must be one of: {0}'.format(', '.join(FORMATS)))
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.window = window or 2 * max(1, max_workers)
+        self.rows = 0
+        self.seconds = 0.0
+        self.errors = []
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def stats(self):
+        """
+        :return: Dict  rows, errors, seconds and rows_per_second of everything read so far
+        """
+        return {'rows': self.rows, 'errors': len(self.errors), 'seconds': self.seconds,
+                'rows_per_second': self.rows_per_second}
+
+    def chunks(self, stream):
+        """
+        Read lines lazily.
+        :param stream: File like object, opened in text mode (newline='' for CSV)
+        :return: Generator of Tuple(line number of the first line, List of lines)
+        """
+        start = 1
+        while True:
+            chunk = list(islice(stream, self.chunk_size))
+            if not chunk:
+                return
+            yield start, chunk
+            start += len(chunk)
+
+    def __converted(self, stream, columnar):
+        """
+        Converted chunks in file order, from this process or from the worker pool.
+        """
+        if not self.max_workers:
+            for start, chunk in self.chunks(stream):
+                yield convert_chunk(start, chunk, self.fmt, columnar)
+            return
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = collections.deque()
+            for start, chunk in self.chunks(stream):
+                pending.append(pool.submit(convert_chunk, start, chunk, self.fmt, columnar))
+                if len(pending) >= self.window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def __ingest(self, stream, columnar):
+        start = time.perf_counter()
+        try:
+            for results, errors in self.__converted(stream, columnar):
+                self.rows += len(results)
+                self.errors.extend(errors)
+                yield from results
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def vehicles(self, stream):
+        """
+        The vehicles in a file, in file order. Rows with errors are skipped and kept in errors.
+        The time counted for rows_per_second includes the time spent by whoever reads the generator.
+        :param stream: File like object
+        :return: Generator of vehicles
+        """
+        return self.__ingest(stream, columnar=False)
+
+    def fill_fleet(self, stream, fleet=None):
+        """
+        Add the vehicles in a file to a VehicleFleet, without making vehicle objects.
+        :param stream: File like object
+        :param fleet: VehicleFleet  Defaults to a new one
+        :return: VehicleFleet
+        """
+        fleet = fleet if fleet is not None else VehicleFleet()
+        for vehicle_class, model, speed in self.__ingest(stream, columnar=True):
+            fleet.append(vehicle_class, model, speed)
+        return fleet
+
+
+def ingest_file(path, fleet=False, **kwargs):
+    """
+    Read a whole file, picking the format from its extension (.csv or .jsonl).
+    :param path: Str  Path to the file
+    :param fleet: Bool  Return a VehicleFleet instead of a list of vehicles
+    :param kwargs: Passed on to VehicleIngest
+    :return: Tuple(List of vehicles or VehicleFleet, VehicleIngest)
+    """
+    fmt = os.path.splitext(path)[1].lstrip('.').lower()
+    ingest = VehicleIngest(fmt, **kwargs)
+    with open(path, newline='') as stream:
+        result = ingest.fill_fleet(stream) if fleet else list(ingest.vehicles(stream))
+    return result, ingest
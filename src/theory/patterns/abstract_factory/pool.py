@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Object pool for the vehicles made by the abstract factories.
+
+A request handler that calls set_vehicle_properties, uses the vehicle once and
+drops it makes the allocator and the garbage collector do work on every
+request. A VehiclePool keeps released vehicles around and hands them out again
+instead of asking the factory for a new one.
+
+Released vehicles get their model and speed reset, so a vehicle that comes out
+of the pool looks just like a new one. Watchers of the vehicle (see
+abstract_factory.watch) hear about both resets. Each brand keeps at most max_per_brand
+vehicles, vehicles released past that are dropped. Releasing a vehicle that
+is already in the pool raises a ValueError, so it can never be handed out twice.
+
+Using the pool is opt in, set_vehicle_properties does not use it.
+
+Details about the Object Pool Pattern:
+https://www.wikiwand.com/en/Object_pool_pattern
+"""
+import threading
+
+from src.theory.patterns.abstract_factory.abstract_factory import changed, factory_provider, get_vehicle_class
+
+
+class VehiclePool(object):
+    """
+    Acquire and release vehicles, reusing released ones.
+    Safe to use from more than one thread.
+    """
+
+    def __init__(self, max_per_brand=64, provider=None):
+        if max_per_brand < 0:
+            raise ValueError('max_per_brand can not be negative.')
+        self.max_per_brand = max_per_brand
+        self.provider = provider if provider is not None else factory_provider
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__free = {}
+        self.__pooled = set()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        with self.__lock:
+            return sum(len(free) for free in self.__free.values())
+
+    def acquire(self, type_, make, model="", speed=0):
+        """
+        Get a vehicle, from the pool when one is free or from the factory when not.
+        Takes the same arguments as set_vehicle_properties and sets the vehicle up the same way.
+        :param type_:  STR  Type of vehicle
+        :param make:   STR  Manufacturer Name
+        :param model:  STR  Vehicle model Name
+        :param speed:  INT  An integer indicating relative speed
+        :return: vehicle_class
+        """
+        vehicle_class = get_vehicle_class(type_, make)
+        vehicle = None
+        with self.__lock:
+            free = self.__free.get(vehicle_class)
+            if free:
+                vehicle = free.pop()
+                self.__pooled.discard(id(vehicle))
+                self.hits += 1
+            else:
+                self.misses += 1
+        if vehicle is None:
+            vehicle = self.provider.get(type_).get_vehicle(make)
+        vehicle.set_model(model)
+        vehicle.accelerate(speed)
+        return vehicle
+
+    def release(self, vehicle):
+        """
+        Give a vehicle back. Its model and speed are reset, do not use it after this.
+        :param vehicle: A vehicle from acquire()
+        :return: Bool  True when it was kept, False when the pool for its brand was full
+        :raises ValueError: If the vehicle is already in the pool
+        """
+        with self.__lock:
+            if id(vehicle) in self.__pooled:
+                raise ValueError('The vehicle was already released to the pool.')
+            self.__pooled.add(id(vehicle))
+        vehicle.set_model("")
+        old = vehicle.speed
+        vehicle.speed = 0
+        if vehicle.watchers:
+            changed(vehicle, 'speed', old)
+        with self.__lock:
+            free = self.__free.setdefault(type(vehicle), [])
+            if len(free) >= self.max_per_brand:
+                self.__pooled.discard(id(vehicle))
+                self.evictions += 1
+                return False
+            free.append(vehicle)
+            return True
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        :return: Dict  hits, misses, evictions, size and hit_rate of the pool
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self),
+                'hit_rate': self.hit_rate}
+
+    def clear(self):
+        with self.__lock:
+            self.__free.clear()
+            self.__pooled.clear()
+            self.hits = self.misses = self.evictions = 0
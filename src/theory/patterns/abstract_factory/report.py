@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Batched vehicle spec reports.
+
+print_vehicle_specs makes two print calls, and a third for the blank line,
+for every vehicle. Each one goes through the sys.stdout machinery, so dumping
+a million vehicles is mostly spent in I/O calls.
+
+The VehicleReportWriter fills in one template per vehicle and collects the
+text in a buffer that is written to the output in large chunks. The text is
+exactly what print_vehicle_specs prints. A VehicleFleet can be written without
+making vehicle objects: the first line and the start of the second only depend
+on the class, vehicle_type and mfg codes of a row, so they are made once per
+distinct combination and reused. Every speed prints the way it would on the
+vehicle object, an int or a float row by row (see VehicleFleet.whole_speeds).
+"""
+import sys
+
+from src.lp_utilities.buffered_writer import BufferedWriter
+
+SPEC = ("This vehicle is a: {0.vehicle_type} and has {0.wheels} wheels.\n"
+        "This vehicle is a {0.mfg} - {0.model} with a speed of {0.speed}\n"
+        "\n").format
+
+SPEC_HEAD = ("This vehicle is a: {0} and has {1} wheels.\n"
+             "This vehicle is a {2} - ").format
+
+
+class VehicleReportWriter(BufferedWriter):
+    """
+    Writes vehicle specs to a file like object in large chunks.
+    Use it as a context manager, or call flush() when done, so the last chunk is written.
+    """
+
+    def __init__(self, stream=None, chunk_size=1 << 16):
+        super(VehicleReportWriter, self).__init__(stream if stream is not None else sys.stdout, chunk_size)
+
+    @staticmethod
+    def spec(vehicle):
+        """
+        Same text as print_vehicle_specs(vehicle) prints
+        :param vehicle: A vehicle
+        :return: Str
+        """
+        return SPEC(vehicle)
+
+    def write_vehicle(self, vehicle):
+        self.write(SPEC(vehicle))
+
+    def write_vehicles(self, vehicles):
+        """
+        :param vehicles: Iterable of vehicles  Can be a generator, vehicles are not kept
+        :return: Int  The number of vehicles written
+        """
+        count = 0
+        for vehicle in vehicles:
+            self.write(SPEC(vehicle))
+            count += 1
+        return count
+
+    def write_fleet(self, fleet):
+        """
+        Write every row of a VehicleFleet, in row order, without making vehicle objects.
+        :param fleet: VehicleFleet
+        :return: Int  The number of vehicles written
+        """
+        class_codes, type_codes, mfg_codes, model_codes, speeds = fleet.columns()
+        models = fleet.models.values
+        wheels = [vehicle_class().wheels for vehicle_class in fleet.classes.values]
+        heads = {}
+        write = self.write
+        for class_code, type_code, mfg_code, model_code, speed in zip(class_codes, type_codes, mfg_codes,
+                                                                      model_codes, speeds):
+            key = (class_code, type_code, mfg_code)
+            head = heads.get(key)
+            if head is None:
+                head = heads[key] = SPEC_HEAD(fleet.vehicle_types[type_code], wheels[class_code],
+                                              fleet.mfgs[mfg_code])
+            write("{0}{1} with a speed of {2}\n\n".format(head, models[model_code], speed))
+        return len(speeds)
+
+
+def write_specs(vehicles, stream=None, chunk_size=1 << 16):
+    """
+    Write the specs of many vehicles, the same text print_vehicle_specs prints for each.
+    :param vehicles: Iterable of vehicles, or a VehicleFleet
+    :param stream: File like object with a write method, defaults to sys.stdout
+    :param chunk_size: Int  Rough number of characters per write
+    :return: Int  The number of vehicles written
+    """
+    with VehicleReportWriter(stream, chunk_size) as writer:
+        if hasattr(vehicles, 'columns'):
+            return writer.write_fleet(vehicles)
+        return writer.write_vehicles(vehicles)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+An asynchronous version of the builder pattern.
+
+In the real world the build steps of a builder usually have to ask someone
+for the parts, an inventory service for example. The Director calls the steps
+one after the other, so a phone takes as long as all of the lookups added up.
+
+The AsyncDirector awaits all six build steps of a phone at the same time with
+asyncio.gather, so a phone takes about as long as its slowest lookup. Each step
+can be given a timeout, and when many phones are built at once the number of
+phones in flight can be capped so the inventory service is not flooded.
+
+Details about asyncio:
+https://docs.python.org/3/library/asyncio-task.html
+"""
+import asyncio
+
+from src.theory.patterns.builder.builder import CellPhone, COMPONENTS
+
+
+class AsyncBuilderInterface(object):
+    """
+    Async Builder Interface, the same build steps as BuilderInterface but every
+    one of them is a coroutine.
+    """
+
+    async def build_circuit_board(self): pass
+
+    async def build_cellular_module(self): pass
+
+    async def build_battery(self): pass
+
+    async def build_speakers(self): pass
+
+    async def build_screen(self): pass
+
+    async def build_external_shell(self): pass
+
+
+class AsyncDirector(object):
+    """
+    Director that awaits the build steps of a phone concurrently.
+    """
+
+    def __init__(self, step_timeout=None, max_concurrent_phones=None):
+        """
+        :param step_timeout: Float  Seconds a single build step may take, None for no limit
+        :param max_concurrent_phones: Int  Most phones built at the same time by build_phones, None for no limit
+        """
+        self.step_timeout = step_timeout
+        self.max_concurrent_phones = max_concurrent_phones
+        self.__builder = None
+
+    def set_builder(self, builder):
+        self.__builder = builder
+
+    async def __step(self, step):
+        if self.step_timeout is None:
+            return await step()
+        return await asyncio.wait_for(step(), self.step_timeout)
+
+    async def build_phone(self, builder=None):
+        """
+        Build a phone, all six build steps run concurrently.
+        :param builder: AsyncBuilderInterface  Optional, defaults to the one given to set_builder
+        :return: CellPhone
+        :raises asyncio.TimeoutError: If a build step takes longer than step_timeout
+        """
+        builder = builder or self.__builder
+        components = await asyncio.gather(*[self.__step(getattr(builder, 'build_' + slot)) for slot in COMPONENTS])
+        phone = CellPhone()
+        phone.mfg = builder.mfg
+        phone.model = builder.model
+        for slot, component in zip(COMPONENTS, components):
+            setattr(phone, slot, component)
+        return phone
+
+    async def build_phones(self, builders):
+        """
+        Build one phone per builder, at most max_concurrent_phones at the same time.
+        :param builders: Iterable of AsyncBuilderInterface
+        :return: List of CellPhone in the order of the builders
+        """
+        if self.max_concurrent_phones is None:
+            return await asyncio.gather(*[self.build_phone(builder) for builder in builders])
+        semaphore = asyncio.Semaphore(self.max_concurrent_phones)
+
+        async def build_one(builder):
+            async with semaphore:
+                return await self.build_phone(builder)
+
+        return await asyncio.gather(*[build_one(builder) for builder in builders])
+
+    def run_build_phones(self, builders):
+        """
+        Build phones from regular (not async) code, runs its own event loop.
+        :param builders: Iterable of AsyncBuilderInterface
+        :return: List of CellPhone in the order of the builders
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.build_phones(builders))
+        finally:
+            loop.close()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Small benchmarks for the builder pattern examples.
+Each benchmark returns a dict of numbers so it can be checked or printed,
+run this file as a script to print all of them.
+
+The timing helpers are in src.lp_utilities.benchmarking.
+"""
+import os
+import sys
+
+from src.lp_utilities.benchmarking import peak_memory, print_results, timed
+from src.theory.patterns.builder.builder import CellPhone, COMPONENTS, Director, MeFone12
+from src.theory.patterns.builder.interning import ComponentInterner, InterningBuilder
+from src.theory.patterns.builder.parallel import ParallelDirector, build_chunk, summarize_phone
+from src.theory.patterns.builder.render import write_catalog
+
+
+def bench_build_phones(count=100000, builder=None):
+    """
+    Compare calling Director.build_phone for every unit with Director.build_phones.
+    :param count: Int  Number of phones to build each way
+    :param builder: BuilderInterface  Defaults to MeFone12
+    :return: Dict
+    """
+    director = Director()
+    director.set_builder(builder or MeFone12())
+
+    def serial():
+        return [director.build_phone() for _ in range(count)]
+
+    def cloned():
+        return director.build_phones(count)
+
+    _, serial_seconds = timed(serial)
+    _, clone_seconds = timed(cloned)
+    _, serial_peak = peak_memory(serial)
+    _, clone_peak = peak_memory(cloned)
+    return {
+        'count': count,
+        'build_phone_us_per_unit': serial_seconds / count * 1e6,
+        'build_phones_us_per_unit': clone_seconds / count * 1e6,
+        'build_phone_bytes_per_unit': serial_peak / count,
+        'build_phones_bytes_per_unit': clone_peak / count,
+    }
+
+
+def bench_interning(count=100000, builder=None):
+    """
+    Memory footprint of phones built with plain components and with interned components.
+    The phones are kept alive until the measurement is done, so the numbers are what
+    a fleet of `count` phones holds on to.
+    :param count: Int  Number of phones to build each way
+    :param builder: BuilderInterface  Defaults to MeFone12
+    :return: Dict
+    """
+    builder = builder or MeFone12()
+    interner = ComponentInterner()
+    plain = Director()
+    plain.set_builder(builder)
+    interned = Director()
+    interned.set_builder(InterningBuilder(builder, interner))
+
+    def build_plain():
+        return [plain.build_phone() for _ in range(count)]
+
+    def build_interned():
+        return [interned.build_phone() for _ in range(count)]
+
+    _, plain_seconds = timed(build_plain)
+    _, interned_seconds = timed(build_interned)
+    _, plain_peak = peak_memory(build_plain)
+    _, interned_peak = peak_memory(build_interned)
+    results = {
+        'count': count,
+        'plain_bytes_per_phone': plain_peak / count,
+        'interned_bytes_per_phone': interned_peak / count,
+        'plain_us_per_phone': plain_seconds / count * 1e6,
+        'interned_us_per_phone': interned_seconds / count * 1e6,
+    }
+    results.update(('interner_' + key, value) for key, value in interner.stats().items())
+    return results
+
+
+def deep_sizeof(obj):
+    """
+    sys.getsizeof of an object plus its attribute dict, if it has one.
+    :param obj: Object
+    :return: Int  bytes
+    """
+    size = sys.getsizeof(obj)
+    try:
+        size += sys.getsizeof(vars(obj))
+    except TypeError:
+        pass
+    return size
+
+
+class DictPart(object):
+    """
+    A component that keeps its fields in a __dict__, the way the components were
+    before they had __slots__. The baseline of bench_phone_size.
+    """
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+# One DictPart class per kind of component, so instances of a kind share the keys of their __dict__
+# the way instances of one component class did.
+class DictCircuitBoard(DictPart):
+    pass
+
+
+class DictCellularModule(DictPart):
+    pass
+
+
+class DictBattery(DictPart):
+    pass
+
+
+class DictSpeakers(DictPart):
+    pass
+
+
+class DictScreen(DictPart):
+    pass
+
+
+class DictExternalShell(DictPart):
+    pass
+
+
+DICT_PARTS = {'circuit_board': DictCircuitBoard, 'cellular_module': DictCellularModule, 'battery': DictBattery,
+              'speakers': DictSpeakers, 'screen': DictScreen, 'external_shell': DictExternalShell}
+
+
+class DictPhone(object):
+    """
+    A CellPhone that keeps its fields in a __dict__, the way it was before it had
+    __slots__. Only the fields, none of the behaviour. The baseline of bench_phone_size.
+    """
+
+    def __init__(self, mfg, model):
+        self.mfg = mfg
+        self.model = model
+        self.cellular_module = None
+        self.circuit_board = None
+        self.revision = None
+        self.battery = None
+        self.speakers = None
+        self.screen = None
+        self.external_shell = None
+        self.price = None
+        self.passive_battery_life = None
+        self.active_battery_life = None
+        self.runtime_passive = None
+        self.runtime_active = None
+        self.price_computations = 0
+        self.serial_number = None
+
+
+def part_fields(component):
+    """
+    :param component: Component
+    :return: Dict  The value of every slot of the component
+    """
+    return {name: getattr(component, name) for name in type(component).__slots__}
+
+
+def bench_phone_size(count=100000, builder=None):
+    """
+    How many bytes a built phone takes and how fast phones are built, with the
+    __slots__ classes and with DictPhone and DictPart holding the same fields in a __dict__.
+    :param count: Int  Number of phones to build
+    :param builder: BuilderInterface  Defaults to MeFone12
+    :return: Dict
+    """
+    builder = builder or MeFone12()
+    director = Director()
+    director.set_builder(builder)
+    specs = [(slot, DICT_PARTS[slot], part_fields(getattr(director.build_phone(), slot))) for slot in COMPONENTS]
+
+    def build():
+        return [director.build_phone() for _ in range(count)]
+
+    def build_dict():
+        phones = []
+        for _ in range(count):
+            phone = DictPhone(builder.mfg, builder.model)
+            for slot, part_class, fields in specs:
+                setattr(phone, slot, part_class(**fields))
+            phones.append(phone)
+        return phones
+
+    results = {'count': count}
+    for prefix, make in (('', build), ('dict_', build_dict)):
+        phones, seconds = timed(make)
+        _, peak = peak_memory(make)
+        phone = phones[0]
+        results.update({
+            prefix + 'phones_per_second': count / seconds,
+            prefix + 'traced_bytes_per_phone': peak / count,
+            prefix + 'getsizeof_phone': deep_sizeof(phone),
+            prefix + 'getsizeof_components': sum(deep_sizeof(getattr(phone, slot)) for slot in COMPONENTS),
+        })
+    return results
+
+
+class NullSink(object):
+    """
+    File like object that throws everything away, so only the rendering is timed.
+    """
+
+    def __init__(self):
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+
+
+def bench_render(count=20000, builder=None):
+    """
+    Compare writing phone.brochure and str(phone) one phone at a time with write_catalog.
+    :param count: Int  Number of phones to render
+    :param builder: BuilderInterface  Defaults to MeFone12
+    :return: Dict
+    """
+    director = Director()
+    director.set_builder(builder or MeFone12())
+    phones = director.build_phones(count)
+    naive_sink = NullSink()
+    streaming_sink = NullSink()
+
+    def naive():
+        for phone in phones:
+            naive_sink.write(phone.brochure + "\n")
+            naive_sink.write(str(phone) + "\n")
+
+    _, naive_seconds = timed(naive)
+    _, streaming_seconds = timed(lambda: write_catalog(phones, streaming_sink))
+    return {
+        'count': count,
+        'properties_us_per_phone': naive_seconds / count * 1e6,
+        'write_catalog_us_per_phone': streaming_seconds / count * 1e6,
+        'properties_writes': naive_sink.writes,
+        'write_catalog_writes': streaming_sink.writes,
+    }
+
+
+def bench_parallel(count=200000, worker_counts=None, builder=None):
+    """
+    How ParallelDirector scales with the number of worker processes, against a plain
+    Director loop. Workers send back summarize_phone tuples.
+    :param count: Int  Number of phones to build
+    :param worker_counts: List of Int  Defaults to 1, 2, 4, ... up to the number of CPUs
+    :param builder: BuilderInterface  Defaults to MeFone12, must be picklable
+    :return: Dict
+    """
+    builders = [builder or MeFone12()] * count
+    if worker_counts is None:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= (os.cpu_count() or 1):
+            worker_counts.append(worker_counts[-1] * 2)
+    _, serial_seconds = timed(lambda: build_chunk(builders, summarize_phone))
+    results = {'count': count, 'serial_phones_per_second': count / serial_seconds}
+    for workers in worker_counts:
+        director = ParallelDirector(max_workers=workers)
+        _, seconds = timed(lambda: director.build_phones(builders, summarize_phone))
+        results['{0}_workers_phones_per_second'.format(workers)] = count / seconds
+        results['{0}_workers_speedup'.format(workers)] = serial_seconds / seconds
+    return results
+
+
+def legacy_active_current_draw(thing_to_calc):
+    """
+    How CellPhone.get_active_current_draw used to read a component, kept to compare against.
+    """
+    total = 0.0
+    try:
+        total += thing_to_calc.active_draw
+    except AttributeError as _:
+        pass
+    return total
+
+
+class LegacyPart(object):
+    """
+    A component the way they were before the Component base class: only the
+    numbers it really has, nothing to fall back to.
+    """
+    __slots__ = ('price', 'active_draw', 'passive_draw', 'assembly_cost')
+
+    def __init__(self, component):
+        for name in LegacyPart.__slots__:
+            if name in type(component).__slots__:
+                setattr(self, name, getattr(component, name))
+
+
+def bench_capabilities(count=100000, builder=None):
+    """
+    Compare reading the active draw of every component with try/except AttributeError
+    on components without defaults, against CellPhone.get_active_current_draw on
+    Component subclasses. Batteries and shells have no draw of their own, so a third
+    of the reads used to raise.
+    :param count: Int  Number of phones
+    :param builder: BuilderInterface  Defaults to MeFone12
+    :return: Dict
+    """
+    director = Director()
+    director.set_builder(builder or MeFone12())
+    phones = director.build_phones(count)
+    components = [getattr(phone, slot) for phone in phones for slot in COMPONENTS]
+    legacy_parts = [LegacyPart(component) for component in components]
+    missing = sum(1 for part in legacy_parts if not hasattr(part, 'active_draw'))
+
+    def legacy():
+        return sum(legacy_active_current_draw(part) for part in legacy_parts)
+
+    def capability():
+        return sum(CellPhone.get_active_current_draw(component) for component in components)
+
+    legacy_total, legacy_seconds = timed(legacy)
+    capability_total, capability_seconds = timed(capability)
+    return {
+        'reads': len(components),
+        'missing_reads': missing,
+        'same_totals': legacy_total == capability_total,
+        'try_except_ns_per_read': legacy_seconds / len(components) * 1e9,
+        'capability_ns_per_read': capability_seconds / len(components) * 1e9,
+    }
+
+
+def main():  # pragma: no cover
+    print_results("Director.build_phone vs Director.build_phones", bench_build_phones())
+    print_results("Plain vs interned components", bench_interning())
+    print_results("Size of a phone", bench_phone_size())
+    print_results("Brochure and spec sheet rendering", bench_render())
+    print_results("ParallelDirector scaling", bench_parallel())
+    print_results("try/except vs component capabilities", bench_capabilities())
+
+
+if __name__ == "__main__":  # pragma: no cover
+    # execute only if run as a script
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+A bill of materials (BOM) that sits on top of a CellPhone built by the Director.
+
+When you want to try a lot of single component swaps on one phone (a different
+Battery, a different Screen) you do not want to walk every component again for
+each try. The BillOfMaterials reads the price and current draw of each component
+once, keeps them per slot, and keeps running totals. Swapping a component only
+reads the new component and replaces its entry, so the cost of a swap does not
+depend on the rest of the phone.
+
+The totals are added up in the same order CellPhone uses, so the MSRP and
+battery durations are exactly the numbers the CellPhone properties give.
+"""
+from src.theory.patterns.builder.builder import CellPhone, COMPONENTS, POWERED_COMPONENTS
+
+
+class BillOfMaterials(object):
+    """
+    Running price and current draw totals for a CellPhone.
+    """
+
+    def __init__(self, phone):
+        self.__phone = phone
+        self.__prices = [CellPhone.get_price(getattr(phone, slot)) for slot in COMPONENTS]
+        self.__passive_draws = [CellPhone.get_passive_current_draw(getattr(phone, slot))
+                                for slot in POWERED_COMPONENTS]
+        self.__active_draws = [CellPhone.get_active_current_draw(getattr(phone, slot))
+                               for slot in POWERED_COMPONENTS]
+        self.__capacity = phone.battery.storage_capacity
+        self.__assembly_cost = CellPhone.get_assembly_cost(phone.external_shell)
+        self.__total_price = sum(self.__prices)
+        self.__passive_draw = sum(self.__passive_draws)
+        self.__active_draw = sum(self.__active_draws)
+
+    @staticmethod
+    def battery_duration(capacity, current_draw):
+        """
+        How long a battery lasts at a given current draw.
+        :param capacity: Float  The storage capacity of the battery in mAh
+        :param current_draw: Float  The total current draw in mA
+        :return: Tuple(days, hours, minutes, seconds)
+        """
+        milli_amp_seconds = CellPhone.convert_hours_to_seconds(capacity)
+        return CellPhone.convert_seconds(round(milli_amp_seconds / current_draw))
+
+    @property
+    def phone(self):
+        return self.__phone
+
+    @property
+    def total_price(self):
+        return self.__total_price
+
+    @property
+    def assembled_price(self):
+        return self.__total_price + self.__assembly_cost
+
+    @property
+    def msrp(self):
+        return CellPhone.calculate_msrp(self.__total_price)
+
+    @property
+    def passive_draw(self):
+        return self.__passive_draw
+
+    @property
+    def active_draw(self):
+        return self.__active_draw
+
+    @property
+    def passive_battery_duration(self):
+        return self.battery_duration(self.__capacity, self.__passive_draw)
+
+    @property
+    def active_battery_duration(self):
+        return self.battery_duration(self.__capacity, self.__active_draw)
+
+    def __totals_with(self, slot, component):
+        """
+        Work out the totals the phone would have with one component replaced.
+        Only the new component is read, the other slots come from the cached entries.
+        :param slot: Str  One of the names in COMPONENTS
+        :param component: Object  The replacement component
+        :return: Tuple(prices, passive_draws, active_draws, capacity, assembly_cost)
+        """
+        if slot not in COMPONENTS:
+            raise ValueError('Unknown component slot: {0}'.format(slot))
+        prices = list(self.__prices)
+        prices[COMPONENTS.index(slot)] = CellPhone.get_price(component)
+        passive_draws = self.__passive_draws
+        active_draws = self.__active_draws
+        if slot in POWERED_COMPONENTS:
+            index = POWERED_COMPONENTS.index(slot)
+            passive_draws = list(passive_draws)
+            passive_draws[index] = CellPhone.get_passive_current_draw(component)
+            active_draws = list(active_draws)
+            active_draws[index] = CellPhone.get_active_current_draw(component)
+        capacity = component.storage_capacity if slot == 'battery' else self.__capacity
+        assembly_cost = CellPhone.get_assembly_cost(component) if slot == 'external_shell' else self.__assembly_cost
+        return prices, passive_draws, active_draws, capacity, assembly_cost
+
+    def try_swap(self, slot, component):
+        """
+        Price a swap without changing the phone or the running totals.
+        :param slot: Str  One of the names in COMPONENTS
+        :param component: Object  The replacement component
+        :return: Tuple(msrp, passive_battery_duration, active_battery_duration)
+        """
+        prices, passive_draws, active_draws, capacity, _ = self.__totals_with(slot, component)
+        return (CellPhone.calculate_msrp(sum(prices)),
+                self.battery_duration(capacity, sum(passive_draws)),
+                self.battery_duration(capacity, sum(active_draws)))
+
+    def swap(self, slot, component):
+        """
+        Install a component on the phone and update the running totals.
+        :param slot: Str  One of the names in COMPONENTS
+        :param component: Object  The replacement component
+        :return: Tuple(msrp, passive_battery_duration, active_battery_duration)
+        """
+        prices, passive_draws, active_draws, capacity, assembly_cost = self.__totals_with(slot, component)
+        setattr(self.__phone, slot, component)
+        self.__prices = prices
+        self.__passive_draws = passive_draws
+        self.__active_draws = active_draws
+        self.__capacity = capacity
+        self.__assembly_cost = assembly_cost
+        self.__total_price = sum(prices)
+        self.__passive_draw = sum(passive_draws)
+        self.__active_draw = sum(active_draws)
+        return self.msrp, self.passive_battery_duration, self.active_battery_duration
@@ -16,13 +16,100 @@ https://www.wikiwand.com/en/Builder_pattern
 Details about the Property Decorator and Property Method:
 https://docs.python.org/2/howto/descriptor.html#properties
 """
+import threading
+from collections import OrderedDict
+
+# The component slots of a CellPhone in the order their prices are added up.
+COMPONENTS = ('circuit_board', 'cellular_module', 'battery', 'speakers', 'screen', 'external_shell')
+
+# The component slots that draw current from the battery, in the order they are added up.
+POWERED_COMPONENTS = ('circuit_board', 'cellular_module', 'speakers', 'screen')
+
+
+class DurationMemo(object):
+    """
+    Bounded LRU cache of battery durations, keyed by the numbers they are worked out from:
+    the battery capacity and the current draw of every powered component, in order.
+    Phones that share a configuration get their durations with one dict lookup.
+    Safe to use from more than one thread. Hits do not take the lock, so when a lot
+    of threads read at once the hit counter can come out a little low.
+    """
+
+    def __init__(self, max_size=4096):
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1.')
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__cache = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__cache)
+
+    def duration(self, signature):
+        """
+        How long a battery lasts with the given components drawing current.
+        The draws are added up in the order given, like CellPhone does.
+        :param signature: Tuple(capacity, draw, ...)  The storage capacity of the battery in mAh,
+                          then the current draw of every powered component in mA
+        :return: Tuple(days, hours, minutes, seconds)
+        """
+        duration = self.__cache.get(signature)
+        if duration is not None:
+            try:
+                self.__cache.move_to_end(signature)
+            except KeyError:  # evicted by another thread since the get
+                pass
+            self.hits += 1
+            return duration
+        total_draw = signature[1]
+        for draw in signature[2:]:
+            total_draw += draw
+        milli_amp_seconds = CellPhone.convert_hours_to_seconds(signature[0])
+        duration = CellPhone.convert_seconds(round(milli_amp_seconds / total_draw))
+        with self.__lock:
+            self.misses += 1
+            self.__cache[signature] = duration
+            if len(self.__cache) > self.max_size:
+                self.__cache.popitem(last=False)
+                self.evictions += 1
+        return duration
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        :return: Dict  hits, misses, evictions, size and hit_rate of the cache
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self),
+                'hit_rate': self.hit_rate}
+
+    def clear(self):
+        with self.__lock:
+            self.__cache.clear()
+            self.hits = self.misses = self.evictions = 0
 
 
 class CellPhone(object):
     """
     Product. This is the final product that is made up of components, that
     are built on the fly.
+    __slots__ replaces the per instance __dict__ with a fixed set of fields, which
+    makes every phone a lot smaller. Names starting with __ are mangled in
+    __slots__ just like they are everywhere else in the class.
     """
+    __slots__ = ('__mfg', '__model', '__cellular_module', '__circuit_board', '__revision', '__battery',
+                 '__speakers', '__screen', '__external_shell', '__price', '__passive_battery_life',
+                 '__active_battery_life', '__runtime_passive', '__runtime_active', '__price_computations',
+                 '__serial_number')
+
+    # Shared by every phone, see DurationMemo
+    duration_memo = DurationMemo()
 
     def __init__(self):
         self.__mfg = None
@@ -39,6 +126,8 @@ class CellPhone(object):
         self.__active_battery_life = None
         self.__runtime_passive = None
         self.__runtime_active = None
+        self.__price_computations = 0
+        self.__serial_number = None
 
     @staticmethod
     def convert_seconds(seconds):
@@ -57,15 +146,12 @@ class CellPhone(object):
         """
         Get the price of a component.
         If one is not set or the component doesn't have one set the value to zero.
+        Components fall back to the zero defaults of Component, so for them this is a
+        plain attribute read. getattr with a default covers anything else without raising.
         :param thing_to_price: Object   Price
         :return: Int Price
         """
-        answer = 0
-        try:
-            answer += thing_to_price.price
-        except AttributeError as _:
-            pass
-        return answer
+        return 0 + getattr(thing_to_price, 'price', 0)
 
     @staticmethod
     def calculate_msrp(cost_price):
@@ -84,12 +170,7 @@ class CellPhone(object):
         :param thing_to_calc: Object  A component object which may have a passive current draw
         :return:  Float  The current during passive draw of a component
         """
-        current_draw = 0.0
-        try:
-            current_draw += thing_to_calc.passive_draw
-        except AttributeError as _:
-            pass
-        return current_draw
+        return 0.0 + getattr(thing_to_calc, 'passive_draw', 0.0)
 
     @staticmethod
     def get_active_current_draw(thing_to_calc):
@@ -99,12 +180,16 @@ class CellPhone(object):
         :param thing_to_calc: Object  A component object to check the draw of
         :return: Float the current draw of the object if it has one. If not 0.0
         """
-        current_draw = 0.0
-        try:
-            current_draw += thing_to_calc.active_draw
-        except AttributeError as _:
-            pass
-        return current_draw
+        return 0.0 + getattr(thing_to_calc, 'active_draw', 0.0)
+
+    @staticmethod
+    def get_assembly_cost(thing_to_calc):
+        """
+        Determine the cost of assembling a phone in a component (the external shell).
+        :param thing_to_calc: Object  A component object which may have an assembly cost
+        :return: Float  The assembly cost, 0.0 if it does not have one
+        """
+        return getattr(thing_to_calc, 'assembly_cost', 0.0)
 
     @staticmethod
     def convert_hours_to_seconds(milli_amp_hours):
@@ -139,6 +224,18 @@ class CellPhone(object):
     def model(self):
         del self.__model
 
+    @property
+    def serial_number(self):
+        return self.__serial_number
+
+    @serial_number.setter
+    def serial_number(self, serial_number):
+        self.__serial_number = serial_number
+
+    @serial_number.deleter
+    def serial_number(self):
+        del self.__serial_number
+
     @property
     def circuit_board(self):
         return self.__circuit_board
@@ -146,10 +243,12 @@ class CellPhone(object):
     @circuit_board.setter
     def circuit_board(self, circuit_board):
         self.__circuit_board = circuit_board
+        self.invalidate_price()
 
     @circuit_board.deleter
     def circuit_board(self):
         del self.__circuit_board
+        self.invalidate_price()
 
     @property
     def cellular_module(self):
@@ -158,10 +257,12 @@ class CellPhone(object):
     @cellular_module.setter
     def cellular_module(self, module_type):
         self.__cellular_module = module_type
+        self.invalidate_price()
 
     @cellular_module.deleter
     def cellular_module(self):
         del self.__cellular_module
+        self.invalidate_price()
 
     @property
     def battery(self):
@@ -170,19 +271,23 @@ class CellPhone(object):
     @battery.setter
     def battery(self, battery):
         self.__battery = battery
+        self.invalidate_price()
 
     @battery.deleter
     def battery(self):
         del self.__battery
+        self.invalidate_price()
 
     def get_speakers(self):
         return self.__speakers
 
     def set_speakers(self, speakers):
         self.__speakers = speakers
+        self.invalidate_price()
 
     def delete_speakers(self):
         del self.__speakers
+        self.invalidate_price()
 
     # Alternate syntax for property decorators
     speakers = property(get_speakers, set_speakers, delete_speakers)
@@ -192,9 +297,11 @@ class CellPhone(object):
 
     def set_screen(self, screen):
         self.__screen = screen
+        self.invalidate_price()
 
     def delete_screen(self):
         del self.__screen
+        self.invalidate_price()
 
     # Alternative syntax for property decorators
     screen = property(get_screen, set_screen, delete_screen)
@@ -204,15 +311,74 @@ class CellPhone(object):
 
     def set_external_shell(self, external_shell):
         self.__external_shell = external_shell
+        self.invalidate_price()
 
     def delete_external_shell(self):
         del self.__external_shell
+        self.invalidate_price()
 
     # Alternate property syntax
     external_shell = property(get_external_shell, set_external_shell, delete_external_shell)
 
+    def clone(self):
+        """
+        Prototype pattern. Make a new phone that shares every component with this one.
+        Nothing is rebuilt, so the clone also keeps the cached price of parts.
+        The components are shared, not copied, so treat them as read only and swap
+        in a new component (clone.battery = Battery(...)) instead of changing one.
+        :return: CellPhone
+        """
+        phone = self.__class__.__new__(self.__class__)
+        try:
+            phone.__mfg = self.__mfg
+            phone.__model = self.__model
+            phone.__cellular_module = self.__cellular_module
+            phone.__circuit_board = self.__circuit_board
+            phone.__revision = self.__revision
+            phone.__battery = self.__battery
+            phone.__speakers = self.__speakers
+            phone.__screen = self.__screen
+            phone.__external_shell = self.__external_shell
+            phone.__price = self.__price
+            phone.__passive_battery_life = self.__passive_battery_life
+            phone.__active_battery_life = self.__active_battery_life
+            phone.__runtime_passive = self.__runtime_passive
+            phone.__runtime_active = self.__runtime_active
+            phone.__serial_number = self.__serial_number
+        except AttributeError as _:
+            # Something was deleted, copy whatever is still set one slot at a time.
+            for name in _CELL_PHONE_FIELDS:
+                try:
+                    setattr(phone, name, getattr(self, name))
+                except AttributeError as _:
+                    pass
+        phone.__price_computations = 0
+        return phone
+
+    def invalidate_price(self):
+        """
+        Throw away the cached price of parts. Every component setter and deleter
+        calls this, so the next read of total_price sums the components again.
+        Changing an attribute of a component that is already installed
+        (phone.battery.price = 3) does not go through the phone, so call this
+        by hand in that case.
+        :return: None
+        """
+        self.__price = None
+
+    @property
+    def price_computations(self):
+        """
+        Number of times the price of parts has actually been summed up.
+        Reading total_price again without changing a component leaves this alone.
+        :return: Int
+        """
+        return self.__price_computations
+
     @property
     def total_price(self):
+        if self.__price is not None:
+            return self.__price
         total = self.get_price(self.circuit_board)
         total += self.get_price(self.cellular_module)
         total += self.get_price(self.battery)
@@ -220,37 +386,33 @@ class CellPhone(object):
         total += self.get_price(self.screen)
         total += self.get_price(self.external_shell)
         self.__price = total
+        self.__price_computations += 1
         return total
 
     @property
     def assembled_price(self):
-        assembly_cost = 0.0
-        try:
-            assembly_cost = self.external_shell.assembly_cost
-        except AttributeError as _:
-            pass
-        return self.total_price + assembly_cost
+        return self.total_price + self.get_assembly_cost(self.external_shell)
 
     @property
     def passive_battery_duration(self):
-        capacity = self.__battery.storage_capacity
-        total_passive_draw = CellPhone.get_passive_current_draw(self.__circuit_board)
-        total_passive_draw += CellPhone.get_passive_current_draw(self.__cellular_module)
-        total_passive_draw += CellPhone.get_passive_current_draw(self.__speakers)
-        total_passive_draw += CellPhone.get_passive_current_draw(self.__screen)
-        milli_amp_seconds = CellPhone.convert_hours_to_seconds(capacity)
-        self.__runtime_passive = self.convert_seconds(round(milli_amp_seconds / total_passive_draw))
+        # Components fall back to a zero draw, so the draws are read straight off them.
+        # getattr still covers slots holding something that is not a Component (None).
+        signature = (self.__battery.storage_capacity,
+                     getattr(self.__circuit_board, 'passive_draw', 0.0),
+                     getattr(self.__cellular_module, 'passive_draw', 0.0),
+                     getattr(self.__speakers, 'passive_draw', 0.0),
+                     getattr(self.__screen, 'passive_draw', 0.0))
+        self.__runtime_passive = self.duration_memo.duration(signature)
         return self.__runtime_passive  # (days, hours, minutes, seconds)
 
     @property
     def active_battery_duration(self):
-        capacity = self.__battery.storage_capacity
-        total_active_draw = CellPhone.get_active_current_draw(self.__circuit_board)
-        total_active_draw += CellPhone.get_active_current_draw(self.__cellular_module)
-        total_active_draw += CellPhone.get_active_current_draw(self.__speakers)
-        total_active_draw += CellPhone.get_active_current_draw(self.__screen)
-        milli_amp_seconds = CellPhone.convert_hours_to_seconds(capacity)
-        self.__runtime_active = self.convert_seconds(round(milli_amp_seconds / total_active_draw))
+        signature = (self.__battery.storage_capacity,
+                     getattr(self.__circuit_board, 'active_draw', 0.0),
+                     getattr(self.__cellular_module, 'active_draw', 0.0),
+                     getattr(self.__speakers, 'active_draw', 0.0),
+                     getattr(self.__screen, 'active_draw', 0.0))
+        self.__runtime_active = self.duration_memo.duration(signature)
         return self.__runtime_active  # (days, hours, minutes, seconds)
 
     @property
@@ -287,10 +449,30 @@ class CellPhone(object):
         return output
 
 
-class CircuitBoard(object):
+# The mangled names of the CellPhone slots, what clone() has to copy.
+_CELL_PHONE_FIELDS = tuple('_CellPhone' + name for name in CellPhone.__slots__)
+
+
+class Component(object):
+    """
+    Base class of the sub-components, and all there is to the capability layer.
+    A component class puts the numbers it adds to a phone in its __slots__.
+    The ones it does not have fall back to the zeros below, so CellPhone can read
+    price, active_draw, passive_draw and assembly_cost off any component without
+    checking whether it has them first.
+    """
+    __slots__ = ()
+    price = 0
+    active_draw = 0.0
+    passive_draw = 0.0
+    assembly_cost = 0.0
+
+
+class CircuitBoard(Component):
     """
     Sub-component of a product highly configurable
     """
+    __slots__ = ('model', 'revision', 'active_draw', 'passive_draw', 'price')
 
     def __init__(self, model, revision, active_current_draw, passive_current_draw, price):
         self.model = model
@@ -308,10 +490,11 @@ class CircuitBoard(object):
         return output
 
 
-class CellularModule(object):
+class CellularModule(Component):
     """
     Sub-component of a product highly configurable
     """
+    __slots__ = ('manufacturer', 'make', 'bands', 'active_draw', 'passive_draw', 'price')
 
     def __init__(self, manufacturer, make, bands, active_current_draw, passive_current_draw, price):
         self.manufacturer = manufacturer
@@ -331,10 +514,11 @@ class CellularModule(object):
         return output
 
 
-class Battery(object):
+class Battery(Component):
     """
     Sub-component of a product highly configurable
     """
+    __slots__ = ('form_factor', 'battery_type', 'storage_capacity', 'charge_cycles', 'price')
 
     def __init__(self, form_factor, battery_type, storage_capacity, charge_cycles, price):
         self.form_factor = form_factor
@@ -353,10 +537,11 @@ class Battery(object):
         return output
 
 
-class Speakers(object):
+class Speakers(Component):
     """
     Sub-component of a product highly configurable
     """
+    __slots__ = ('brand', 'response_frequency', 'impedance', 'passive_draw', 'active_draw', 'price')
 
     def __init__(self, brand, response_frequency, impedance, passive_current_draw, active_current_draw, price):
         self.brand = brand
@@ -378,10 +563,12 @@ class Speakers(object):
         return output
 
 
-class Screen(object):
+class Screen(Component):
     """
     Sub-component of a product highly configurable
     """
+    __slots__ = ('height', 'width', 'pixels_per_mm', 'height_pixels', 'width_pixels', 'refresh_rate', 'passive_draw',
+                 'active_draw', 'price')
 
     def __init__(self, height_mm, width_mm, pixels_per_mm, refresh_rate, passive_current_draw, active_current_draw,
                  price):
@@ -411,10 +598,12 @@ class Screen(object):
         return output
 
 
-class ExternalShell(object):
+class ExternalShell(Component):
     """
     Sub-component of a product highly configurable
     """
+    __slots__ = ('material', 'height', 'width', 'depth', 'drop_resistance_rating', 'assembly_cost', 'is_water_proof',
+                 'is_dust_sand_proof', 'price')
 
     def __init__(self, material, height, width, depth, drop_resistance_rating, assembly_cost_per_unit, is_water_proof,
                  is_dust_sand_proof, price):
@@ -464,6 +653,28 @@ class Director(object):
         phone.external_shell = self.__builder.build_external_shell()
         return phone
 
+    def build_phones(self, count, overrides=None):
+        """
+        Build one phone with the builder and stamp out `count` units by cloning it.
+        Every unit shares the components of the first one, unless an override swaps them.
+        :param count: Int  Number of phones to build
+        :param overrides: Callable  Optional, called with the index of each unit and returns a
+                          dict of attributes to set on that unit, e.g. {'serial_number': 'SN-1'}
+                          or {'battery': Battery(...)}, or None to leave the unit alone
+        :return: List of CellPhone
+        """
+        if count < 1:
+            return []
+        prototype = self.build_phone()
+        phones = [prototype] + [prototype.clone() for _ in range(count - 1)]
+        if overrides is not None:
+            for index, phone in enumerate(phones):
+                changes = overrides(index)
+                if changes:
+                    for name, value in changes.items():
+                        setattr(phone, name, value)
+        return phones
+
 
 class BuilderInterface(object):
     """
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+A columnar catalog of cell phones.
+
+Instead of keeping one CellPhone object graph per SKU, the PhoneCatalog keeps
+the numbers it needs (component prices, current draws, battery capacity and
+assembly cost) in one flat column per value. This is the "structure of arrays"
+layout: every column is a contiguous block of doubles (array.array('d')).
+
+When NumPy is installed the columns are viewed as NumPy arrays without copying
+and the prices and battery durations for the whole catalog are worked out in
+one vectorized pass. Without NumPy the same columns are walked in plain Python.
+Either way the numbers are the same ones the CellPhone properties give, because
+they are added up in the same order.
+
+Details about the array module:
+https://docs.python.org/3/library/array.html
+"""
+from array import array
+
+from src.theory.patterns.builder.builder import CellPhone, COMPONENTS, POWERED_COMPONENTS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class PhoneCatalog(object):
+    """
+    Structure of arrays holding the numeric specs of many phones.
+    """
+
+    def __init__(self):
+        self.mfg = []
+        self.model = []
+        self.__prices = [array('d') for _ in COMPONENTS]
+        self.__passive_draws = [array('d') for _ in POWERED_COMPONENTS]
+        self.__active_draws = [array('d') for _ in POWERED_COMPONENTS]
+        self.__capacity = array('d')
+        self.__assembly_cost = array('d')
+
+    @classmethod
+    def from_phones(cls, phones):
+        """
+        Build a catalog out of CellPhone objects.
+        :param phones: Iterable of CellPhone
+        :return: PhoneCatalog
+        """
+        catalog = cls()
+        for phone in phones:
+            catalog.add_phone(phone)
+        return catalog
+
+    def __len__(self):
+        return len(self.__capacity)
+
+    def add(self, mfg, model, circuit_board, cellular_module, battery, speakers, screen, external_shell):
+        """
+        Add one SKU straight from its components, no CellPhone is created.
+        :return: Int  The row number of the SKU in the catalog
+        """
+        components = dict(circuit_board=circuit_board, cellular_module=cellular_module, battery=battery,
+                          speakers=speakers, screen=screen, external_shell=external_shell)
+        for column, slot in zip(self.__prices, COMPONENTS):
+            column.append(CellPhone.get_price(components[slot]))
+        for passive, active, slot in zip(self.__passive_draws, self.__active_draws, POWERED_COMPONENTS):
+            passive.append(CellPhone.get_passive_current_draw(components[slot]))
+            active.append(CellPhone.get_active_current_draw(components[slot]))
+        self.__capacity.append(battery.storage_capacity)
+        self.__assembly_cost.append(CellPhone.get_assembly_cost(external_shell))
+        self.mfg.append(mfg)
+        self.model.append(model)
+        return len(self) - 1
+
+    def add_phone(self, phone):
+        """
+        Add the specs of a CellPhone.
+        :param phone: CellPhone
+        :return: Int  The row number of the phone in the catalog
+        """
+        return self.add(phone.mfg, phone.model, *[getattr(phone, slot) for slot in COMPONENTS])
+
+    @staticmethod
+    def __column_sum(columns):
+        """
+        Add columns together element by element, left to right.
+        :param columns: List of array('d')
+        :return: numpy.ndarray or array('d')
+        """
+        if np is not None:
+            total = np.frombuffer(columns[0], dtype=np.float64).copy()
+            for column in columns[1:]:
+                total += np.frombuffer(column, dtype=np.float64)
+            return total
+        return array('d', [sum(values) for values in zip(*columns)])
+
+    def total_prices(self):
+        """
+        The price of parts of every SKU, same as CellPhone.total_price
+        :return: numpy.ndarray or array('d')
+        """
+        return self.__column_sum(self.__prices)
+
+    def assembled_prices(self):
+        """
+        The price of parts plus assembly of every SKU, same as CellPhone.assembled_price
+        :return: numpy.ndarray or array('d')
+        """
+        return self.__column_sum([self.total_prices(), self.__assembly_cost])
+
+    def msrps(self):
+        """
+        The MSRP of every SKU, same as CellPhone.calculate_msrp(CellPhone.total_price)
+        :return: numpy.ndarray or array('d')
+        """
+        totals = self.total_prices()
+        if np is not None:
+            return CellPhone.calculate_msrp(totals)
+        return array('d', [CellPhone.calculate_msrp(total) for total in totals])
+
+    def __battery_seconds(self, draw_columns):
+        """
+        Battery life in whole seconds for every SKU at the given draw.
+        :param draw_columns: List of array('d')  One column of current draw per powered component
+        :return: numpy.ndarray or List of Int
+        """
+        draws = self.__column_sum(draw_columns)
+        if np is not None:
+            if len(draws) and not draws.all():
+                raise ZeroDivisionError('float division by zero')
+            milli_amp_seconds = CellPhone.convert_hours_to_seconds(np.frombuffer(self.__capacity, dtype=np.float64))
+            return np.round(milli_amp_seconds / draws).astype(np.int64)
+        return [round(CellPhone.convert_hours_to_seconds(capacity) / draw)
+                for capacity, draw in zip(self.__capacity, draws)]
+
+    @staticmethod
+    def __convert_seconds(seconds):
+        """
+        Vectorized CellPhone.convert_seconds
+        :param seconds: numpy.ndarray or List of Int
+        :return: List of Tuple(days, hours, minutes, seconds)
+        """
+        if np is not None:
+            minutes, seconds = np.divmod(seconds, 60)
+            hours, minutes = np.divmod(minutes, 60)
+            days, hours = np.divmod(hours, 24)
+            return list(zip(days.tolist(), hours.tolist(), minutes.tolist(), seconds.tolist()))
+        return [CellPhone.convert_seconds(value) for value in seconds]
+
+    def passive_battery_seconds(self):
+        return self.__battery_seconds(self.__passive_draws)
+
+    def active_battery_seconds(self):
+        return self.__battery_seconds(self.__active_draws)
+
+    def passive_battery_durations(self):
+        """
+        Standby time of every SKU, same as CellPhone.passive_battery_duration
+        :return: List of Tuple(days, hours, minutes, seconds)
+        """
+        return self.__convert_seconds(self.passive_battery_seconds())
+
+    def active_battery_durations(self):
+        """
+        Talk time of every SKU, same as CellPhone.active_battery_duration
+        :return: List of Tuple(days, hours, minutes, seconds)
+        """
+        return self.__convert_seconds(self.active_battery_seconds())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Flyweight pattern for the builder components.
+
+A MeFone12 builder makes a brand new CircuitBoard('MRL-0032', ...) every time it
+is asked, even though every one of them holds the same data. When millions of
+phones are built you end up with millions of identical components.
+
+The ComponentInterner keeps one shared instance of every distinct component
+spec. Handing it a component (or the class and arguments of one) gives back the
+shared instance with the same spec, so all of the phones point at the same
+objects. The cache is bounded, when it is full the least recently used spec is
+dropped (phones that already use it keep their reference).
+
+Shared components have to be treated as immutable. Changing the price of an
+interned battery changes it for every phone that uses it, so swap in a new
+component instead.
+
+Details about the Flyweight Pattern:
+https://www.wikiwand.com/en/Flyweight_pattern
+"""
+import threading
+from collections import OrderedDict
+
+from src.theory.patterns.builder.builder import BuilderInterface
+
+
+def freeze(value):
+    """
+    Turn a value into something that can be used as a dict key.
+    Lists (like the bands of a CellularModule) become tuples. The type of every
+    value is kept as well, 0 and 0.0 print differently so they are different specs.
+    :param value: Object
+    :return: Hashable version of the value
+    """
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return dict, tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    return type(value), value
+
+
+_CONTAINERS = (list, tuple, dict)
+
+
+def component_fields(component):
+    """
+    The attribute names and values of a component, whether it keeps them
+    in a __dict__ or in __slots__.
+    :param component: Object
+    :return: Iterable of Tuple(name, value)
+    """
+    try:
+        return vars(component).items()
+    except TypeError:
+        return [(name, getattr(component, name)) for name in type(component).__slots__]
+
+
+def component_signature(component):
+    """
+    The spec of a component: its class and all of its attribute values.
+    Two components with the same signature are interchangeable.
+    :param component: Object
+    :return: Tuple
+    """
+    return type(component), tuple([(name, value.__class__, freeze(value) if value.__class__ in _CONTAINERS else value)
+                                   for name, value in component_fields(component)])
+
+
+class ComponentInterner(object):
+    """
+    Bounded cache of shared component instances, keyed by their spec.
+    Safe to use from more than one thread.
+    """
+
+    def __init__(self, max_size=1024):
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1.')
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__cache = OrderedDict()
+        self.__shortcuts = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__cache)
+
+    def __lookup(self, key, component):
+        """
+        Find the shared instance for a spec, storing the component on a miss.
+        Call with the lock held.
+        :param key: Tuple  The spec, see component_signature
+        :param component: Object  The instance to store on a miss
+        :return: Object  The shared instance
+        """
+        try:
+            shared = self.__cache[key]
+        except KeyError:
+            pass
+        else:
+            self.__cache.move_to_end(key)
+            self.hits += 1
+            return shared
+        self.misses += 1
+        self.__cache[key] = component
+        if len(self.__cache) > self.max_size:
+            self.__cache.popitem(last=False)
+            self.evictions += 1
+        return component
+
+    def intern(self, component):
+        """
+        Get the shared instance with the same spec as a component.
+        :param component: Object  Any component
+        :return: Object  The shared instance, the component itself if it is the first of its spec
+        """
+        key = component_signature(component)
+        with self.__lock:
+            return self.__lookup(key, component)
+
+    def get(self, cls, *args):
+        """
+        Get the shared instance of cls(*args), the same one intern() gives for an equal component.
+        The component is only created the first time these arguments are seen, after that
+        the arguments lead straight to its spec.
+        :param cls: Class  The component class
+        :param args: The arguments the class is created with
+        :return: Object  The shared instance
+        """
+        shortcut = (cls, freeze(args))
+        with self.__lock:
+            key = self.__shortcuts.get(shortcut)
+            if key is not None and key in self.__cache:
+                self.__cache.move_to_end(key)
+                self.hits += 1
+                return self.__cache[key]
+            component = cls(*args)
+            key = self.__shortcuts[shortcut] = component_signature(component)
+            if len(self.__shortcuts) > self.max_size:
+                self.__shortcuts.popitem(last=False)
+            return self.__lookup(key, component)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        :return: Dict  hits, misses, evictions, size and hit_rate of the cache
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self),
+                'hit_rate': self.hit_rate}
+
+    def clear(self):
+        with self.__lock:
+            self.__cache.clear()
+            self.__shortcuts.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+class InterningBuilder(BuilderInterface):
+    """
+    Wraps any concrete builder (MeFone12, BirdSungT8, ...) so every component it
+    builds is swapped for the shared instance before it reaches the Director.
+    The freshly built duplicates are garbage right away, only the shared ones are kept.
+    """
+
+    def __init__(self, builder, interner=None):
+        self.builder = builder
+        self.interner = interner if interner is not None else ComponentInterner()
+        self.mfg = builder.mfg
+        self.model = builder.model
+
+    def build_circuit_board(self):
+        return self.interner.intern(self.builder.build_circuit_board())
+
+    def build_cellular_module(self):
+        return self.interner.intern(self.builder.build_cellular_module())
+
+    def build_battery(self):
+        return self.interner.intern(self.builder.build_battery())
+
+    def build_speakers(self):
+        return self.interner.intern(self.builder.build_speakers())
+
+    def build_screen(self):
+        return self.interner.intern(self.builder.build_screen())
+
+    def build_external_shell(self):
+        return self.interner.intern(self.builder.build_external_shell())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Run the Director over many builders at once.
+
+The Director builds one phone at a time with whatever builder was last handed
+to set_builder. When there are thousands of builder recipes to go through
+(a parameter sweep over MeFone12 / BirdSungT8 style builders) the
+ParallelDirector hands them out to a pool of worker processes, or threads when
+the build steps spend their time waiting (on an inventory service for example)
+rather than computing.
+
+Builders are sent to the workers in chunks, so there is one round trip per
+chunk instead of one per phone. Each worker can send back the full CellPhone
+or a small summary of it (see summarize_phone), which is much cheaper to pass
+between processes.
+
+Everything sent to a worker process has to be picklable: the builders and the
+summary function must be defined at the top level of a module.
+
+Details about concurrent.futures:
+https://docs.python.org/3/library/concurrent.futures.html
+"""
+import concurrent.futures
+import os
+from itertools import repeat
+
+from src.theory.patterns.builder.builder import Director
+
+
+def summarize_phone(phone):
+    """
+    A small, cheap to pickle summary of a phone.
+    :param phone: CellPhone
+    :return: Tuple(mfg, model, total_price, assembled_price, msrp, passive_battery_duration, active_battery_duration)
+    """
+    total = phone.total_price
+    return (phone.mfg, phone.model, total, phone.assembled_price, phone.calculate_msrp(total),
+            phone.passive_battery_duration, phone.active_battery_duration)
+
+
+def build_chunk(builders, summarize=None):
+    """
+    Build one phone per builder with a Director, this is what runs inside a worker.
+    :param builders: List of builders
+    :param summarize: Callable  Optional, turns each phone into what is sent back
+    :return: List of CellPhone, or of whatever summarize returns
+    """
+    director = Director()
+    results = []
+    for builder in builders:
+        director.set_builder(builder)
+        phone = director.build_phone()
+        results.append(summarize(phone) if summarize is not None else phone)
+    return results
+
+
+class ParallelDirector(object):
+    """
+    Director front end that spreads builders over a process or thread pool.
+    """
+    EXECUTORS = {
+        'process': concurrent.futures.ProcessPoolExecutor,
+        'thread': concurrent.futures.ThreadPoolExecutor,
+    }
+
+    def __init__(self, max_workers=None, executor='process', chunk_size=None):
+        """
+        :param max_workers: Int  Number of workers, defaults to the number of CPUs
+        :param executor: Str  'process' for CPU bound builders, 'thread' for builders that wait on I/O
+        :param chunk_size: Int  Builders per round trip, defaults to about four chunks per worker
+        """
+        if executor not in self.EXECUTORS:
+            raise ValueError('executor must be one of: {0}'.format(', '.join(sorted(self.EXECUTORS))))
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = executor
+        self.chunk_size = chunk_size
+
+    def chunks(self, builders):
+        """
+        Split the builders into the lists that are sent to the workers.
+        :param builders: List of builders
+        :return: List of List of builders
+        """
+        chunk_size = self.chunk_size or max(1, -(-len(builders) // (self.max_workers * 4)))
+        return [builders[start:start + chunk_size] for start in range(0, len(builders), chunk_size)]
+
+    def build(self, builders, summarize=None, ordered=True):
+        """
+        Build one phone per builder.
+        :param builders: Iterable of builders
+        :param summarize: Callable  Optional, e.g. summarize_phone, applied inside the worker
+        :param ordered: Bool  True yields results in the order of the builders. False yields
+                        Tuple(index of the builder, result) as soon as each chunk is done.
+        :return: Generator
+        """
+        chunks = self.chunks(list(builders))
+        with self.EXECUTORS[self.executor](max_workers=self.max_workers) as pool:
+            if ordered:
+                for results in pool.map(build_chunk, chunks, repeat(summarize)):
+                    for result in results:
+                        yield result
+                return
+            starts = {}
+            start = 0
+            for chunk in chunks:
+                starts[pool.submit(build_chunk, chunk, summarize)] = start
+                start += len(chunk)
+            for future in concurrent.futures.as_completed(starts):
+                for offset, result in enumerate(future.result()):
+                    yield starts[future] + offset, result
+
+    def build_phones(self, builders, summarize=None):
+        """
+        Same as build, but returns a list in the order of the builders.
+        :param builders: Iterable of builders
+        :param summarize: Callable  Optional, applied inside the worker
+        :return: List
+        """
+        return list(self.build(builders, summarize))
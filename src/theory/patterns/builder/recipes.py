@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Declarative builder recipes.
+
+Instead of writing a builder class like MeFone12 by hand, a recipe is written
+down as data (JSON, or TOML on Python 3.11+) and compiled into a builder class
+that the Director can use like any other:
+
+    {
+        "mfg": "NBD",
+        "model": "MeFone12",
+        "circuit_board": ["MRL-0032", "1.3.7a", 0.127, 0.018, 98.79],
+        "cellular_module": {"manufacturer": "Kellog", "make": "ARNIL-3", "bands": ["3G", "4G", "LTE"],
+                            "active_current_draw": 0.118, "passive_current_draw": 0.006, "price": 75.33},
+        ...
+    }
+
+Every component is either a list of the arguments of its constructor, in
+order, or an object of its keyword arguments.
+
+Compiling a recipe is done once per distinct recipe. The RecipeCache keys the
+compiled classes on a hash of the recipe text, so the same recipe in a
+thousand files is compiled once, and a file that has not changed on disk is not
+even read again. When a file changes only its own entry is dropped.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from src.theory.patterns.builder.builder import BuilderInterface, COMPONENTS
+from src.theory.patterns.builder.builder import CircuitBoard, CellularModule, Battery, Speakers, Screen, ExternalShell
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover
+    tomllib = None
+
+COMPONENT_CLASSES = {
+    'circuit_board': CircuitBoard,
+    'cellular_module': CellularModule,
+    'battery': Battery,
+    'speakers': Speakers,
+    'screen': Screen,
+    'external_shell': ExternalShell,
+}
+
+
+def parse_recipe(text, fmt='json'):
+    """
+    Turn the text of a recipe into a dict.
+    :param text: Str or Bytes  The recipe
+    :param fmt: Str  'json' or 'toml'
+    :return: Dict
+    """
+    if isinstance(text, bytes):
+        text = text.decode('utf-8')
+    if fmt == 'json':
+        return json.loads(text)
+    if fmt == 'toml':
+        if tomllib is None:  # pragma: no cover
+            raise ValueError('TOML recipes need Python 3.11 or newer.')
+        return tomllib.loads(text)
+    raise ValueError('Unknown recipe format: {0}'.format(fmt))
+
+
+def _copy_lists(values):
+    return [list(value) if isinstance(value, list) else value for value in values]
+
+
+def _build_step(cls, args, kwargs):
+    """
+    Make a build_* method that creates a new component every time it is called.
+    Lists (like the bands of a cellular module) are copied so components do not share them.
+    """
+    def build(self):
+        return cls(*_copy_lists(args), **dict(zip(kwargs, _copy_lists(kwargs.values()))))
+    build.__name__ = 'build_' + cls.__name__
+    return build
+
+
+def compile_recipe(recipe):
+    """
+    Compile a recipe dict into a builder class.
+    Every component is built once here, so a broken recipe fails now instead of in the Director.
+    :param recipe: Dict  A parsed recipe
+    :return: Class  Subclass of BuilderInterface
+    """
+    missing = [key for key in ('mfg', 'model') + COMPONENTS if key not in recipe]
+    if missing:
+        raise ValueError('Recipe is missing: {0}'.format(', '.join(missing)))
+    namespace = {
+        '__doc__': 'Builder compiled from the recipe for the {0} {1}'.format(recipe['mfg'], recipe['model']),
+        'mfg': recipe['mfg'],
+        'model': recipe['model'],
+    }
+    for slot in COMPONENTS:
+        spec = recipe[slot]
+        if isinstance(spec, dict):
+            args, kwargs = [], dict(spec)
+        elif isinstance(spec, list):
+            args, kwargs = list(spec), {}
+        else:
+            raise ValueError('Recipe {0} must be a list or an object.'.format(slot))
+        step = _build_step(COMPONENT_CLASSES[slot], args, kwargs)
+        try:
+            step(None)
+        except TypeError as error:
+            raise ValueError('Recipe {0} does not fit {1}: {2}'.format(slot, COMPONENT_CLASSES[slot].__name__, error))
+        namespace['build_' + slot] = step
+    name = 'Recipe' + ''.join(char for char in str(recipe['model']) if char.isalnum())
+    return type(name, (BuilderInterface,), namespace)
+
+
+class RecipeCache(object):
+    """
+    Compiled builder classes keyed by the hash of their recipe text.
+    Safe to use from more than one thread.
+    """
+    FORMATS = {'.json': 'json', '.toml': 'toml'}
+
+    def __init__(self):
+        self.compiled = 0
+        self.hits = 0
+        self.__classes = {}  # digest -> builder class
+        self.__files = {}  # path -> (mtime, size, digest)
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__classes)
+
+    @staticmethod
+    def digest(text, fmt):
+        if isinstance(text, str):
+            text = text.encode('utf-8')
+        return hashlib.sha256(fmt.encode('ascii') + b'\0' + text).hexdigest()
+
+    def compile(self, text, fmt='json'):
+        """
+        Get the builder class for a recipe, compiling it only the first time it is seen.
+        :param text: Str or Bytes  The recipe
+        :param fmt: Str  'json' or 'toml'
+        :return: Class  Subclass of BuilderInterface
+        """
+        digest = self.digest(text, fmt)
+        with self.__lock:
+            cls = self.__classes.get(digest)
+            if cls is not None:
+                self.hits += 1
+                return cls
+        cls = compile_recipe(parse_recipe(text, fmt))
+        with self.__lock:
+            self.compiled += 1
+            return self.__classes.setdefault(digest, cls)
+
+    def load_class(self, path):
+        """
+        Get the builder class for a recipe file. A file that has not changed since
+        the last load (same modification time and size) is not read again.
+        :param path: Str  Path to a .json or .toml recipe
+        :return: Class  Subclass of BuilderInterface
+        """
+        fmt = self.FORMATS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise ValueError('Recipe files must end in .json or .toml: {0}'.format(path))
+        stat = os.stat(path)
+        with self.__lock:
+            known = self.__files.get(path)
+            if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size) and known[2] in self.__classes:
+                self.hits += 1
+                return self.__classes[known[2]]
+        with open(path, 'rb') as recipe_file:
+            text = recipe_file.read()
+        cls = self.compile(text, fmt)
+        digest = self.digest(text, fmt)
+        with self.__lock:
+            self.__files[path] = (stat.st_mtime_ns, stat.st_size, digest)
+            if known is not None and known[2] != digest:
+                self.__forget(known[2])
+        return cls
+
+    def load(self, path):
+        """
+        Get a builder for a recipe file, ready for Director.set_builder
+        :param path: Str  Path to a .json or .toml recipe
+        :return: BuilderInterface
+        """
+        return self.load_class(path)()
+
+    def __forget(self, digest):
+        """
+        Drop a compiled class once no file uses it any more. Call with the lock held.
+        """
+        if all(entry[2] != digest for entry in self.__files.values()):
+            self.__classes.pop(digest, None)
+
+    def invalidate(self, path):
+        """
+        Forget a recipe file, its class is dropped too if no other file has the same recipe.
+        :param path: Str
+        :return: None
+        """
+        with self.__lock:
+            known = self.__files.pop(path, None)
+            if known is not None:
+                self.__forget(known[2])
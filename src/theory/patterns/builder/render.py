@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming renderer for CellPhone brochures and spec sheets.
+
+CellPhone.brochure and str(CellPhone) build their text with a lot of +=
+and str.format calls, and work the prices and battery durations out again
+while they do it. That is fine for one phone but slow when a whole catalog is
+printed to a file.
+
+The PhoneRenderer fills in one template per phone (and one per component),
+works every derived value out once per phone, and collects the text in a
+buffer that is written to the output in large chunks. Only one chunk is held
+at a time, so memory stays flat no matter how many phones go through it.
+The text is exactly what CellPhone.brochure and str(CellPhone) return.
+
+Phones built with Director.build_phones or with interned components share
+their component objects, so the text of the last component seen in every
+slot is kept and reused when the next phone has the very same object.
+"""
+from src.lp_utilities.buffered_writer import BufferedWriter
+from src.theory.patterns.builder.builder import CircuitBoard, CellularModule, Battery, Speakers, Screen, ExternalShell
+from src.theory.patterns.builder.builder import COMPONENTS
+
+BROCHURE = ("-" * 80 + "\n"
+            "Manufacturer: {mfg}; Model: {model}\n"
+            "Primary board design: {board.model} v{board.revision}\n"
+            "Supported cellular bands: {cell.bands}\n"
+            "Battery: Capacity: {battery.storage_capacity} mAH;\n"
+            "\tEstimated standby time: {standby_time} days, hours, minutes, seconds;\n"
+            "\tEstimated talk time: {talk_time} days, hours, minutes, seconds;\n"
+            "Speakers response frequency: {speakers.response_frequency}\n"
+            "Screen resolution: {screen.width_pixels}x{screen.height_pixels} @ {screen.refresh_rate} hz\n"
+            "External Dimensions: Height {shell.height} mm, Width {shell.width} mm, Depth {shell.depth} mm.\n"
+            "MSRP: ${msrp:.2f};\n").format
+
+SPEC_SHEET_HEADER = "Manufacturer: {0}; Model: {1};\n".format
+
+SPEC_SHEET_FOOTER = ("Price of Parts: ${0:.2f} USD;\n"
+                     "Assembled Price: ${1:.2f} USD;\n"
+                     "Recommended MSRP: ${2:.2f} USD;\n").format
+
+COMPONENT_TEMPLATES = {
+    CircuitBoard: ("Circuit Board:\n"
+                   "\tModel: {c.model} v{c.revision}\n"
+                   "\tPower Consumption:\n"
+                   "\t\tMax: {c.active_draw} mA; Min {c.passive_draw} mA;\n"
+                   "\tPrice: ${c.price:.2f} USD\n").format,
+    CellularModule: ("Cellular Module:\n"
+                     "\tManufacturer: {c.manufacturer}; Make: {c.make};\n"
+                     "\tSupported Cellular Protocols: {c.bands}\n"
+                     "\tPower Consumption:\n"
+                     "\t\tMax: {c.active_draw} mA; Min {c.passive_draw} mA;\n"
+                     "\tPrice: ${c.price:.2f} USD\n").format,
+    Battery: ("Battery:\n"
+              "\tForm factor: {c.form_factor}\n"
+              "\tBattery type: {c.battery_type}\n"
+              "\tStorage Capacity: {c.storage_capacity} mAh; Average Charging Cycles: {c.charge_cycles};\n"
+              "\tPrice: ${c.price:.2f} USD;\n").format,
+    Speakers: ("Speakers:\n"
+               "\tBrand: {c.brand}\n"
+               "\tResponse Frequency: {c.response_frequency}\n"
+               "\tElectrical Specs:\n"
+               "\t\tImpedance: {c.impedance}\n"
+               "\t\tMax Current Draw: {c.active_draw} mA; Min Current Draw: {c.passive_draw} mA\n"
+               "\tPrice: ${c.price:.2f} USD\n").format,
+    Screen: ("Screen:\n"
+             "\tDimensions:\n"
+             "\t\tHeight: {c.height} mm; Width: {c.width} mm\n"
+             "\tDisplay Details:\n"
+             "\t\tHeight in pixels: {c.height_pixels};\n"
+             "\t\tWidth in pixels: {c.width_pixels};\n"
+             "\t\tPixel Density (ppmm): {c.pixels_per_mm};\n"
+             "\t\tRefresh Rate: {c.refresh_rate}\n"
+             "\tCurrent Draw:\n"
+             "\t\tMax Current Draw: {c.active_draw} mA; Min Current Draw: {c.passive_draw} mA\n"
+             "\tPrice: ${c.price:.2f} USD\n").format,
+    ExternalShell: ("External Shell:\n"
+                    "\tConstruction Material: {c.material};\n"
+                    "\tDimensions:\n"
+                    "\t\tHeight: {c.height} mm; Width: {c.width} mm; Depth: {c.depth} mm;\n"
+                    "\tDrop Resistance: {c.drop_resistance_rating};\n"
+                    "\tWater Proof: {c.is_water_proof};\n"
+                    "\tDust and Sand Proof: {c.is_dust_sand_proof};\n"
+                    "\tPrice: ${c.price:.2f} USD;\n"
+                    "\tAssembly Cost: ${c.assembly_cost:.2f};\n").format,
+}
+
+
+class PhoneRenderer(BufferedWriter):
+    """
+    Writes brochures and spec sheets to a file like object in large chunks.
+    Use it as a context manager, or call flush() when done, so the last chunk is written.
+    """
+
+    def __init__(self, stream, chunk_size=1 << 16):
+        super(PhoneRenderer, self).__init__(stream, chunk_size)
+        self.__last_components = [(None, None)] * len(COMPONENTS)
+
+    def __component_text(self, index, component):
+        """
+        The str() of a component, reusing the text of the last phone if it had the very same object.
+        :param index: Int  Position of the slot in COMPONENTS
+        :param component: Object
+        :return: Str
+        """
+        last, text = self.__last_components[index]
+        if last is component and text is not None:
+            return text
+        template = COMPONENT_TEMPLATES.get(type(component))
+        text = template(c=component) if template is not None else str(component)
+        self.__last_components[index] = (component, text)
+        return text
+
+    @staticmethod
+    def brochure(phone):
+        """
+        Same text as phone.brochure
+        :param phone: CellPhone
+        :return: Str
+        """
+        return BROCHURE(mfg=phone.mfg, model=phone.model, board=phone.circuit_board, cell=phone.cellular_module,
+                        battery=phone.battery, standby_time=phone.passive_battery_duration,
+                        talk_time=phone.active_battery_duration, speakers=phone.speakers, screen=phone.screen,
+                        shell=phone.external_shell, msrp=phone.calculate_msrp(phone.total_price))
+
+    def spec_sheet(self, phone):
+        """
+        Same text as str(phone)
+        :param phone: CellPhone
+        :return: Str
+        """
+        total = phone.total_price
+        assembly_cost = phone.get_assembly_cost(phone.external_shell)
+        parts = [SPEC_SHEET_HEADER(phone.mfg, phone.model)]
+        for index, slot in enumerate(COMPONENTS):
+            parts.append(self.__component_text(index, getattr(phone, slot)))
+        parts.append(SPEC_SHEET_FOOTER(total, total + assembly_cost, phone.calculate_msrp(total)))
+        return ''.join(parts)
+
+    def write_brochure(self, phone, end=''):
+        self.write(self.brochure(phone) + end)
+
+    def write_spec_sheet(self, phone, end=''):
+        self.write(self.spec_sheet(phone) + end)
+
+
+def write_catalog(phones, stream, brochure=True, spec_sheet=True, end='\n', chunk_size=1 << 16):
+    """
+    Stream the brochure and/or spec sheet of every phone to a file like object.
+    With the defaults the output is the same as print(phone.brochure) and print(phone)
+    for every phone, like builder.main() does.
+    :param phones: Iterable of CellPhone  Can be a generator, phones are not kept
+    :param stream: File like object with a write method
+    :param brochure: Bool  Write the brochures
+    :param spec_sheet: Bool  Write the spec sheets
+    :param end: Str  Written after every brochure and spec sheet
+    :param chunk_size: Int  Rough number of characters per write
+    :return: Int  The number of phones written
+    """
+    count = 0
+    with PhoneRenderer(stream, chunk_size) as renderer:
+        for phone in phones:
+            if brochure:
+                renderer.write_brochure(phone, end)
+            if spec_sheet:
+                renderer.write_spec_sheet(phone, end)
+            count += 1
+    return count
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Search the configuration space of the builder components.
+
+Given a catalog of parts for every slot of a CellPhone, find the cheapest
+combinations that meet some constraints (price, standby time, talk time and
+the dimensions of the external shell). Building every combination through the
+Director grows with the product of the catalog sizes, so this uses a
+branch and bound search instead:
+
+1. Parts that are beaten on price and current draw by at least top_k other
+   parts of the same slot can never be in an answer, so they are dropped.
+2. The remaining parts of each slot are sorted by price and the slots are
+   filled one at a time in the order CellPhone adds them up.
+3. At every step a lower bound on the final price (running price plus the
+   cheapest part of every slot still open) and on the final current draw
+   is worked out. When the cheapest possible finish is already more expensive
+   than the k-th best phone found so far, or the battery can not last long
+   enough even with the lowest possible draw, that whole branch is skipped.
+
+Details about branch and bound:
+https://www.wikiwand.com/en/Branch_and_bound
+"""
+import heapq
+
+from src.theory.patterns.builder.builder import CellPhone, COMPONENTS, POWERED_COMPONENTS
+
+
+class _Part(object):
+    """
+    The numbers of one catalog part the search needs, read once up front.
+    """
+    __slots__ = ('component', 'price', 'passive_draw', 'active_draw', 'capacity', 'assembly_cost')
+
+    def __init__(self, component, slot):
+        self.component = component
+        self.price = CellPhone.get_price(component)
+        self.passive_draw = CellPhone.get_passive_current_draw(component) if slot in POWERED_COMPONENTS else 0.0
+        self.active_draw = CellPhone.get_active_current_draw(component) if slot in POWERED_COMPONENTS else 0.0
+        self.capacity = component.storage_capacity if slot == 'battery' else 0.0
+        self.assembly_cost = CellPhone.get_assembly_cost(component) if slot == 'external_shell' else 0.0
+
+    @property
+    def cost(self):
+        return self.price + self.assembly_cost
+
+    def dominates(self, other):
+        """
+        True if this part is at least as good as the other one on every number
+        the search cares about.
+        :param other: _Part
+        :return: Bool
+        """
+        return (self.cost <= other.cost and self.passive_draw <= other.passive_draw and
+                self.active_draw <= other.active_draw and self.capacity >= other.capacity)
+
+
+def battery_seconds(capacity, current_draw):
+    """
+    How many whole seconds a battery lasts, the way CellPhone works it out.
+    :param capacity: Float  Storage capacity in mAh
+    :param current_draw: Float  Total current draw in mA
+    :return: Int or Float  Infinity when nothing draws current
+    """
+    if current_draw <= 0:
+        return float('inf')
+    return round(CellPhone.convert_hours_to_seconds(capacity) / current_draw)
+
+
+def remove_dominated(parts, keep):
+    """
+    Drop every part that is dominated by at least `keep` other parts.
+    Identical parts only count the ones listed earlier, so one copy always survives.
+    :param parts: List of _Part
+    :param keep: Int  How many answers the search is going to return
+    :return: List of _Part
+    """
+    survivors = []
+    for index, part in enumerate(parts):
+        beaten_by = 0
+        for other_index, other in enumerate(parts):
+            if other_index == index or not other.dominates(part):
+                continue
+            if part.dominates(other) and other_index > index:
+                continue
+            beaten_by += 1
+            if beaten_by >= keep:
+                break
+        if beaten_by < keep:
+            survivors.append(part)
+    return survivors
+
+
+def cheapest_phones(circuit_boards, cellular_modules, batteries, speakers, screens, external_shells, top_k=1,
+                    max_price=None, min_standby_time=None, min_talk_time=None, max_height=None, max_width=None,
+                    max_depth=None, mfg=None, model=None):
+    """
+    Find the cheapest phones that can be put together out of the given parts.
+    Phones are ranked by their assembled price (parts plus assembly).
+    :param circuit_boards: List of CircuitBoard
+    :param cellular_modules: List of CellularModule
+    :param batteries: List of Battery
+    :param speakers: List of Speakers
+    :param screens: List of Screen
+    :param external_shells: List of ExternalShell
+    :param top_k: Int  How many phones to return
+    :param max_price: Float  Highest assembled price allowed
+    :param min_standby_time: Int  Least standby time allowed in seconds
+    :param min_talk_time: Int  Least talk time allowed in seconds
+    :param max_height: Float  Tallest external shell allowed in mm
+    :param max_width: Float  Widest external shell allowed in mm
+    :param max_depth: Float  Deepest external shell allowed in mm
+    :param mfg: Str  Manufacturer to put on the phones that are returned
+    :param model: Str  Model to put on the phones that are returned
+    :return: List of CellPhone  Cheapest first, at most top_k of them
+    """
+    if top_k < 1:
+        raise ValueError('top_k must be at least 1.')
+    external_shells = [shell for shell in external_shells
+                       if (max_height is None or shell.height <= max_height) and
+                       (max_width is None or shell.width <= max_width) and
+                       (max_depth is None or shell.depth <= max_depth)]
+    catalogs = [circuit_boards, cellular_modules, batteries, speakers, screens, external_shells]
+    slots = []
+    for slot, components in zip(COMPONENTS, catalogs):
+        parts = remove_dominated([_Part(component, slot) for component in components], top_k)
+        parts.sort(key=lambda part: part.cost)
+        slots.append(parts)
+    if not all(slots):
+        return []
+
+    # Cheapest possible finish and lowest possible draw from each slot to the end.
+    depth = len(slots)
+    cheapest_rest = [0.0] * (depth + 1)
+    for index in range(depth - 1, -1, -1):
+        cheapest_rest[index] = cheapest_rest[index + 1] + slots[index][0].cost
+    lowest_passive = [min(part.passive_draw for part in parts) for parts in slots]
+    lowest_active = [min(part.active_draw for part in parts) for parts in slots]
+    largest_capacity = max(part.capacity for part in slots[COMPONENTS.index('battery')])
+
+    best = []  # heap of (-price, order found, parts) holding the top_k cheapest so far
+    chosen = [None] * depth
+    found = [0]
+
+    def price_limit():
+        limit = float('inf') if max_price is None else max_price
+        if len(best) == top_k:
+            limit = min(limit, -best[0][0])
+        return limit
+
+    def battery_can_last(index, capacity, passive_draw, active_draw):
+        for rest in range(index, depth):
+            passive_draw += lowest_passive[rest]
+            active_draw += lowest_active[rest]
+        if min_standby_time is not None and battery_seconds(capacity, passive_draw) < min_standby_time:
+            return False
+        if min_talk_time is not None and battery_seconds(capacity, active_draw) < min_talk_time:
+            return False
+        return True
+
+    def finish():
+        # Same order of additions as CellPhone.total_price and CellPhone.assembled_price
+        price = sum(part.price for part in chosen) + chosen[-1].assembly_cost
+        if max_price is not None and price > max_price:
+            return
+        if len(best) == top_k and price >= -best[0][0]:
+            return
+        found[0] += 1
+        entry = (-price, -found[0], list(chosen))
+        if len(best) < top_k:
+            heapq.heappush(best, entry)
+        else:
+            heapq.heapreplace(best, entry)
+
+    def branch(index, price, capacity, passive_draw, active_draw):
+        if index == depth:
+            finish()
+            return
+        for part in slots[index]:
+            if price + part.cost + cheapest_rest[index + 1] > price_limit():
+                break
+            next_capacity = part.capacity if COMPONENTS[index] == 'battery' else capacity
+            next_passive = passive_draw + part.passive_draw
+            next_active = active_draw + part.active_draw
+            if not battery_can_last(index + 1, next_capacity, next_passive, next_active):
+                continue
+            chosen[index] = part
+            branch(index + 1, price + part.cost, next_capacity, next_passive, next_active)
+
+    branch(0, 0.0, largest_capacity, 0.0, 0.0)
+
+    phones = []
+    for _, _, parts in sorted(best, key=lambda entry: (-entry[0], -entry[1])):
+        phone = CellPhone()
+        phone.mfg = mfg
+        phone.model = model
+        for slot, part in zip(COMPONENTS, parts):
+            setattr(phone, slot, part.component)
+        phones.append(phone)
+    return phones
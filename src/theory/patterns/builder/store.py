@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+A phone catalog that lives in a SQLite database.
+
+Phones built by the Director are gone when the process ends. The PhoneStore
+writes them, and their components, to a local SQLite file so they can be
+queried again later without building them again.
+
+Every distinct component is written once to the components table, as the
+JSON of its fields, and phones point at their six components. The values you
+search on (manufacturer, battery type, screen resolution, prices and battery
+life) are worked out when the phone is written and kept in their own indexed
+columns, so a query like "MSRP between $300 and $500 with at least 5 hours of
+talk time" is an index lookup and not a scan of every phone.
+
+Phones are only turned back into CellPhone objects when they are read from a
+query, one row at a time. Components already loaded by the store are reused,
+the same way phones from Director.build_phones share their components.
+
+Details about the sqlite3 module:
+https://docs.python.org/3/library/sqlite3.html
+"""
+import json
+import sqlite3
+
+from src.theory.patterns.builder.builder import CellPhone, COMPONENTS, POWERED_COMPONENTS
+from src.theory.patterns.builder.interning import component_fields
+from src.theory.patterns.builder.recipes import COMPONENT_CLASSES
+from src.theory.patterns.builder.search import battery_seconds
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS components (
+    id INTEGER PRIMARY KEY,
+    slot TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    UNIQUE (slot, spec)
+);
+CREATE TABLE IF NOT EXISTS phones (
+    id INTEGER PRIMARY KEY,
+    mfg TEXT,
+    model TEXT,
+    circuit_board INTEGER REFERENCES components (id),
+    cellular_module INTEGER REFERENCES components (id),
+    battery INTEGER REFERENCES components (id),
+    speakers INTEGER REFERENCES components (id),
+    screen INTEGER REFERENCES components (id),
+    external_shell INTEGER REFERENCES components (id),
+    battery_type TEXT,
+    width_pixels INTEGER,
+    height_pixels INTEGER,
+    total_price REAL,
+    assembled_price REAL,
+    msrp REAL,
+    standby_seconds REAL,
+    talk_seconds REAL
+);
+CREATE INDEX IF NOT EXISTS phones_mfg ON phones (mfg, model);
+CREATE INDEX IF NOT EXISTS phones_battery_type ON phones (battery_type);
+CREATE INDEX IF NOT EXISTS phones_resolution ON phones (width_pixels, height_pixels);
+CREATE INDEX IF NOT EXISTS phones_msrp ON phones (msrp);
+CREATE INDEX IF NOT EXISTS phones_standby_seconds ON phones (standby_seconds);
+CREATE INDEX IF NOT EXISTS phones_talk_seconds ON phones (talk_seconds);
+"""
+
+INSERT_PHONE = ("INSERT INTO phones (mfg, model, " + ", ".join(COMPONENTS) + ", battery_type, width_pixels, "
+                "height_pixels, total_price, assembled_price, msrp, standby_seconds, talk_seconds) "
+                "VALUES (" + ", ".join("?" * (len(COMPONENTS) + 10)) + ")")
+
+SELECT_PHONE = "SELECT id, mfg, model, " + ", ".join(COMPONENTS) + " FROM phones"
+
+# Query keyword -> (column, SQL operator)
+FILTERS = {
+    'mfg': ('mfg', '='),
+    'model': ('model', '='),
+    'battery_type': ('battery_type', '='),
+    'width_pixels': ('width_pixels', '='),
+    'height_pixels': ('height_pixels', '='),
+    'min_msrp': ('msrp', '>='),
+    'max_msrp': ('msrp', '<='),
+    'max_price': ('assembled_price', '<='),
+    'min_standby_time': ('standby_seconds', '>='),
+    'min_talk_time': ('talk_seconds', '>='),
+}
+
+ORDER_BY = ('id', 'msrp', 'assembled_price', 'standby_seconds', 'talk_seconds')
+
+
+def component_spec(component):
+    """
+    The JSON text of the fields of a component, used as its key in the components table.
+    :param component: Object  One of the builder components
+    :return: Str
+    """
+    return json.dumps(dict(component_fields(component)), sort_keys=True)
+
+
+def load_component(slot, spec):
+    """
+    Make a component back out of its JSON text. The constructor is not called,
+    so worked out fields like Screen.width_pixels come back exactly as they were saved.
+    :param slot: Str  One of the names in COMPONENTS
+    :param spec: Str  JSON text from component_spec
+    :return: Object
+    """
+    cls = COMPONENT_CLASSES[slot]
+    component = cls.__new__(cls)
+    for name, value in json.loads(spec).items():
+        setattr(component, name, value)
+    return component
+
+
+class PhoneStore(object):
+    """
+    CellPhones saved in a SQLite database, with indexed columns to query them by.
+    Use it as a context manager, or call close() when done.
+    """
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        self.__component_ids = {}
+        self.__components = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM phones").fetchone()[0]
+
+    def __component_id(self, cursor, slot, component):
+        """
+        The row id of a component, writing it to the components table the first time it is seen.
+        Phones that share a component object only turn it into JSON once.
+        """
+        key = (slot, id(component))
+        cached = self.__component_ids.get(key)
+        if cached is not None and cached[0] is component:
+            return cached[1]
+        spec = component_spec(component)
+        cursor.execute("INSERT OR IGNORE INTO components (slot, spec) VALUES (?, ?)", (slot, spec))
+        component_id = cursor.execute("SELECT id FROM components WHERE slot = ? AND spec = ?",
+                                      (slot, spec)).fetchone()[0]
+        self.__component_ids[key] = (component, component_id)
+        return component_id
+
+    def __row(self, cursor, phone):
+        component_ids = [self.__component_id(cursor, slot, getattr(phone, slot)) for slot in COMPONENTS]
+        total_price = phone.total_price
+        passive_draw = sum(phone.get_passive_current_draw(getattr(phone, slot)) for slot in POWERED_COMPONENTS)
+        active_draw = sum(phone.get_active_current_draw(getattr(phone, slot)) for slot in POWERED_COMPONENTS)
+        capacity = phone.battery.storage_capacity
+        return [phone.mfg, phone.model] + component_ids + [
+            phone.battery.battery_type, phone.screen.width_pixels, phone.screen.height_pixels, total_price,
+            phone.assembled_price, phone.calculate_msrp(total_price), battery_seconds(capacity, passive_draw),
+            battery_seconds(capacity, active_draw)]
+
+    def add_phones(self, phones):
+        """
+        Save phones in one transaction.
+        :param phones: Iterable of CellPhone  Can be a generator, phones are not kept
+        :return: List of Int  The row ids of the phones, in order
+        """
+        phone_ids = []
+        try:
+            with self.connection:
+                cursor = self.connection.cursor()
+                for phone in phones:
+                    cursor.execute(INSERT_PHONE, self.__row(cursor, phone))
+                    phone_ids.append(cursor.lastrowid)
+        finally:
+            self.__component_ids.clear()
+        return phone_ids
+
+    def add_phone(self, phone):
+        return self.add_phones([phone])[0]
+
+    def __component(self, slot, component_id):
+        component = self.__components.get(component_id)
+        if component is None:
+            spec = self.connection.execute("SELECT spec FROM components WHERE id = ?", (component_id,)).fetchone()[0]
+            component = load_component(slot, spec)
+            self.__components[component_id] = component
+        return component
+
+    def __phone(self, row):
+        phone = CellPhone()
+        phone.mfg = row[1]
+        phone.model = row[2]
+        for slot, component_id in zip(COMPONENTS, row[3:]):
+            setattr(phone, slot, self.__component(slot, component_id))
+        return phone
+
+    def get(self, phone_id):
+        """
+        Load one phone by its row id.
+        :param phone_id: Int
+        :return: CellPhone
+        """
+        row = self.connection.execute(SELECT_PHONE + " WHERE id = ?", (phone_id,)).fetchone()
+        if row is None:
+            raise KeyError(phone_id)
+        return self.__phone(row)
+
+    @staticmethod
+    def __where(filters):
+        clauses = []
+        params = []
+        for name, value in filters.items():
+            if name not in FILTERS:
+                raise ValueError('Unknown filter: {0}'.format(name))
+            if value is not None:
+                column, operator = FILTERS[name]
+                clauses.append("{0} {1} ?".format(column, operator))
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def find_ids(self, order_by='id', limit=None, **filters):
+        """
+        The row ids of the phones that match every filter, see FILTERS for the names.
+        Battery times are in seconds, like search.cheapest_phones. With only a lower bound on
+        one column, order by that column so SQLite walks its index instead of the whole table.
+        :param order_by: Str  One of ORDER_BY
+        :param limit: Int  Most rows to return
+        :return: List of Int
+        """
+        return [row[0] for row in self.__select("SELECT id FROM phones", order_by, limit, filters)]
+
+    def find(self, order_by='id', limit=None, **filters):
+        """
+        The phones that match every filter, loaded one at a time as the result is walked.
+        Takes the same arguments as find_ids.
+        :return: Generator of CellPhone
+        """
+        for row in self.__select(SELECT_PHONE, order_by, limit, filters):
+            yield self.__phone(row)
+
+    def __select(self, select, order_by, limit, filters):
+        if order_by not in ORDER_BY:
+            raise ValueError('Can not order phones by: {0}'.format(order_by))
+        where, params = self.__where(filters)
+        query = select + where + " ORDER BY " + order_by
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self.connection.execute(query, params)
+
+    def explain(self, order_by='id', **filters):
+        """
+        The SQLite query plan of find_ids, to check that it uses an index.
+        :return: List of Str
+        """
+        return [row[-1] for row in self.__select("EXPLAIN QUERY PLAN SELECT id FROM phones", order_by, None, filters)]
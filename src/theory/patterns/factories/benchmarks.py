@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Small benchmarks for the factory pattern example.
+Each benchmark returns a dict of numbers so it can be checked or printed,
+run this file as a script to print all of them.
+"""
+import contextlib
+import io
+
+from src.lp_utilities.benchmarking import peak_memory, print_results, timed
+from src.theory.patterns.factories.drawing import draw_shapes
+from src.theory.patterns.factories.factory_pattern import ShapeFactory
+from src.theory.patterns.factories.flyweight import FlyweightShapeFactory
+
+TYPES = ('circle', 'square')
+
+
+def bench_flyweight(count=1000000):
+    """
+    Time and memory to get many shapes from ShapeFactory against a FlyweightShapeFactory.
+    The shapes are kept in a list, like a scene waiting to be drawn.
+    :param count: Int  Number of shapes
+    :return: Dict
+    """
+    types = [TYPES[index % len(TYPES)] for index in range(count)]
+    flyweights = FlyweightShapeFactory()
+
+    def new_shapes():
+        get_shape = ShapeFactory.get_shape
+        return [get_shape(type_) for type_ in types]
+
+    def shared_shapes():
+        get_shape = flyweights.get_shape
+        return [get_shape(type_) for type_ in types]
+
+    _, new_seconds = timed(new_shapes)
+    shared, shared_seconds = timed(shared_shapes)
+    results = {
+        'count': count,
+        'new_ns_per_shape': new_seconds / count * 1e9,
+        'flyweight_ns_per_shape': shared_seconds / count * 1e9,
+        'new_peak_bytes': peak_memory(new_shapes)[1],
+        'flyweight_peak_bytes': peak_memory(shared_shapes)[1],
+        'distinct_shapes': len(set(map(id, shared))),
+    }
+    results.update(flyweights.stats())
+    return results
+
+
+def bench_draw(count=1000000):
+    """
+    Time to draw a scene with ShapeFactory.get_shape(type_).draw() for every element,
+    against ShapeFactory.get_shapes and a DrawBatch. Drawing alone is timed too, on
+    shapes that are already made. Everything writes to memory.
+    :param count: Int  Number of shapes
+    :return: Dict
+    """
+    types = [TYPES[index % len(TYPES)] for index in range(count)]
+
+    def per_shape():
+        stream = io.StringIO()
+        with contextlib.redirect_stdout(stream):
+            for type_ in types:
+                ShapeFactory.get_shape(type_).draw()
+        return stream.getvalue()
+
+    def batched():
+        stream = io.StringIO()
+        draw_shapes(ShapeFactory.get_shapes(types), stream)
+        return stream.getvalue()
+
+    def draw_each(shapes):
+        stream = io.StringIO()
+        with contextlib.redirect_stdout(stream):
+            for shape in shapes:
+                shape.draw()
+        return stream.getvalue()
+
+    def draw_batch(shapes):
+        stream = io.StringIO()
+        draw_shapes(shapes, stream)
+        return stream.getvalue()
+
+    per_shape_text, per_shape_seconds = timed(per_shape)
+    batched_text, batched_seconds = timed(batched)
+    shapes, get_shapes_seconds = timed(lambda: ShapeFactory.get_shapes(types))
+    _, draw_each_seconds = timed(lambda: draw_each(shapes))
+    _, draw_batch_seconds = timed(lambda: draw_batch(shapes))
+    return {
+        'count': count,
+        'per_shape_ns': per_shape_seconds / count * 1e9,
+        'batched_ns_per_shape': batched_seconds / count * 1e9,
+        'get_shapes_ns_per_shape': get_shapes_seconds / count * 1e9,
+        'draw_each_ns_per_shape': draw_each_seconds / count * 1e9,
+        'draw_batch_ns_per_shape': draw_batch_seconds / count * 1e9,
+        'same_text': per_shape_text == batched_text,
+    }
+
+
+def main():  # pragma: no cover
+    print_results("ShapeFactory vs FlyweightShapeFactory", bench_flyweight())
+    print_results("Drawing one shape at a time vs DrawBatch", bench_draw())
+
+
+if __name__ == "__main__":  # pragma: no cover
+    # execute only if run as a script
+    main()
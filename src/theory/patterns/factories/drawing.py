@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Batched drawing of many shapes.
+
+Drawing a scene one shape at a time means a print call, and a trip through
+the sys.stdout machinery, for every shape. The DrawBatch asks every shape for
+the text its draw() would print with render(), collects it in a buffer and
+writes the buffer to the output in large chunks. The output is exactly what
+calling draw() on every shape prints.
+
+Shapes that only implement draw(), like plugins added with
+ShapeFactory.register, have no render(). For those draw() is called with
+sys.stdout pointed at a buffer, and what it prints is used instead.
+
+Stateless shapes always render the same text, so it is rendered once per
+shape class and reused.
+"""
+import contextlib
+import io
+import sys
+
+from src.lp_utilities.buffered_writer import BufferedWriter
+from src.theory.patterns.factories.factory_pattern import ShapeInterface
+
+
+class DrawBatch(BufferedWriter):
+    """
+    Writes what shapes draw to a file like object in large chunks.
+    Use it as a context manager, or call flush() when done, so the last chunk is written.
+    """
+
+    def __init__(self, stream=None, chunk_size=1 << 16):
+        super(DrawBatch, self).__init__(stream if stream is not None else sys.stdout, chunk_size)
+        self.__texts = {}
+
+    def __text(self, shape):
+        """
+        What draw() prints for a shape, with its line break, or '' when it prints nothing.
+        """
+        shape_class = type(shape)
+        text = self.__texts.get(shape_class)
+        if text is None:
+            if shape_class.render is ShapeInterface.render:
+                text = self.capture(shape)
+            else:
+                rendered = shape.render()
+                text = '' if rendered is None else rendered + '\n'
+            if not getattr(shape, 'stateless', False):
+                return text
+            self.__texts[shape_class] = text
+        return text
+
+    @staticmethod
+    def capture(shape):
+        """
+        What draw() prints for a shape, found by calling it with sys.stdout pointed at a buffer.
+        :param shape: ShapeInterface
+        :return: STR
+        """
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            shape.draw()
+        return buffer.getvalue()
+
+    def draw(self, shape):
+        self.write(self.__text(shape))
+
+    def draw_all(self, shapes):
+        """
+        :param shapes: Iterable of ShapeInterface  Can be a generator, shapes are not kept
+        :return: Int  The number of shapes drawn
+        """
+        count = 0
+        texts = self.__texts
+        render = self.__text
+        write = self.write
+        for shape in shapes:
+            text = texts.get(shape.__class__)
+            if text is None:
+                text = render(shape)
+            write(text)
+            count += 1
+        return count
+
+
+def draw_shapes(shapes, stream=None, chunk_size=1 << 16):
+    """
+    Draw many shapes, the same output as calling draw() on each of them.
+    :param shapes: Iterable of ShapeInterface
+    :param stream: File like object with a write method, defaults to sys.stdout
+    :param chunk_size: Int  Rough number of characters per write
+    :return: Int  The number of shapes drawn
+    """
+    with DrawBatch(stream, chunk_size) as batch:
+        return batch.draw_all(shapes)
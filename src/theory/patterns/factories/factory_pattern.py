@@ -11,30 +11,121 @@ You require at least:
 You would want to use this type of pattern IF you won't know what class you
 need to generate UNTIL runtime.
 """
+import importlib
 
 
 class ShapeInterface(object):
+    # True when instances hold no state, so one instance can be shared, see FlyweightShapeFactory
+    stateless = False
+
     def draw(self): pass
 
+    # The text draw() prints, None when it prints nothing. Used to draw many shapes at once, see DrawBatch
+    def render(self): return None
+
 
 class Circle(ShapeInterface):
+    stateless = True
+
     def draw(self):
-        print('Draw Circle')
+        print(self.render())
+
+    def render(self):
+        return 'Draw Circle'
 
 
 class Square(ShapeInterface):
+    stateless = True
+
     def draw(self):
-        print('Draw Square')
+        print(self.render())
+
+    def render(self):
+        return 'Draw Square'
 
 
 class ShapeFactory(object):
+    """
+    Shape type -> shape class, filled with register() and register_lazy().
+    Finding a shape is one dict lookup no matter how many shapes there are.
+    """
+    shapes = {}
+
+    @classmethod
+    def register(cls, type_, shape_class=None):
+        """
+        Add a shape. Can also be used as a class decorator:
+            @ShapeFactory.register('triangle')
+            class Triangle(ShapeInterface): ...
+        :param type_: STR  Name the shape is asked for by
+        :param shape_class: Class  A ShapeInterface
+        :return: The shape class, or a decorator when shape_class is left out
+        """
+        if shape_class is None:
+            return lambda decorated: cls.register(type_, decorated)
+        cls.shapes[type_] = shape_class
+        return shape_class
+
+    @classmethod
+    def register_lazy(cls, type_, path):
+        """
+        Add a shape from a module that is only imported the first time the shape is asked for.
+        :param type_: STR  Name the shape is asked for by
+        :param path: STR  'package.module:ClassName'
+        :return: None
+        """
+        cls.shapes[type_] = path
+
+    @classmethod
+    def load(cls, type_):
+        """
+        Import a lazily registered shape and register the class itself in its place.
+        :param type_: STR  A type given to register_lazy()
+        :return: Class
+        """
+        module_name, _, class_name = cls.shapes[type_].partition(':')
+        shape_class = getattr(importlib.import_module(module_name), class_name)
+        cls.shapes[type_] = shape_class
+        return shape_class
+
+    @staticmethod
+    def get_shape_class(type_):
+        """
+        The class of a shape, importing it first when it was registered lazily.
+        :param type_: STR  Name of the shape
+        :return: Class
+        """
+        try:
+            shape_class = ShapeFactory.shapes[type_]
+        except (KeyError, TypeError):
+            raise TypeError('Type must be circle or square.')
+        if shape_class.__class__ is str:
+            shape_class = ShapeFactory.load(type_)
+        return shape_class
+
     @staticmethod
     def get_shape(type_):
-        if type_ == 'circle':
-            return Circle()
-        if type_ == 'square':
-            return Square()
-        raise TypeError('Type must be circle or square.')
+        return ShapeFactory.get_shape_class(type_)()
+
+    @staticmethod
+    def get_shapes(types):
+        """
+        Many shapes in one call. The types are grouped first, so every distinct type is
+        looked up (and imported, when lazy) once, and then the shapes are made in order.
+        :param types: Iterable of STR  Names of the shapes
+        :return: List of ShapeInterface, one per type in the same order
+        """
+        types = types if isinstance(types, (list, tuple)) else list(types)
+        try:
+            distinct = set(types)
+        except TypeError:
+            raise TypeError('Type must be circle or square.')
+        classes = {type_: ShapeFactory.get_shape_class(type_) for type_ in distinct}
+        return [classes[type_]() for type_ in types]
+
+
+ShapeFactory.register('circle', Circle)
+ShapeFactory.register('square', Square)
 
 
 def main():
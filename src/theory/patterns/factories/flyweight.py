@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Flyweight caching for the shapes made by the ShapeFactory.
+
+ShapeFactory.get_shape makes a new object on every call, even for shapes like
+Circle and Square that hold no state at all. Code that asks for millions of
+shapes spends its time allocating and freeing identical objects.
+
+A FlyweightShapeFactory asks the ShapeFactory for a shape the first time a
+type is requested. If the shape class says it is stateless, the instance is
+kept and handed out to every later request for that type. Shapes that are not
+stateless still get a new object every time, so nothing that holds state is
+ever shared.
+
+Using it is opt in, ShapeFactory.get_shape does not cache anything.
+
+Details about the Flyweight Pattern:
+https://www.wikiwand.com/en/Flyweight_pattern
+"""
+import threading
+
+from src.theory.patterns.factories.factory_pattern import ShapeFactory
+
+
+class FlyweightShapeFactory(object):
+    """
+    Hands out shared instances of stateless shapes and new instances of the rest.
+    Safe to use from more than one thread. Hits do not take the lock, so when a lot
+    of threads read at once the hit counter can come out a little low.
+    """
+
+    def __init__(self, factory=None):
+        """
+        :param factory: Anything with a get_shape(type_) method, defaults to ShapeFactory
+        """
+        self.factory = factory if factory is not None else ShapeFactory
+        self.hits = 0
+        self.allocations = 0
+        self.__shared = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__shared)
+
+    def get_shape(self, type_):
+        """
+        A shape, shared when its class is stateless.
+        Raises the same TypeError as ShapeFactory.get_shape for unknown types.
+        :param type_: STR  Name of the shape
+        :return: ShapeInterface
+        """
+        try:
+            shape = self.__shared.get(type_)
+        except TypeError:  # unhashable, so never shared
+            with self.__lock:
+                return self.__make(type_)
+        if shape is not None:
+            self.hits += 1
+            return shape
+        with self.__lock:
+            shape = self.__shared.get(type_)
+            if shape is not None:  # shared by another thread while this one waited
+                self.hits += 1
+                return shape
+            return self.__make(type_)
+
+    def __make(self, type_):
+        """
+        Get a new shape from the factory and share it if it is stateless. Call with the lock held.
+        :param type_: STR  Name of the shape
+        :return: ShapeInterface
+        """
+        shape = self.factory.get_shape(type_)
+        self.allocations += 1
+        if getattr(shape, 'stateless', False):
+            self.__shared[type_] = shape
+        return shape
+
+    @property
+    def hit_rate(self):
+        requests = self.hits + self.allocations
+        return self.hits / requests if requests else 0.0
+
+    def stats(self):
+        """
+        :return: Dict  hits, allocations, shared (number of shared instances) and hit_rate
+        """
+        return {'hits': self.hits, 'allocations': self.allocations, 'shared': len(self), 'hit_rate': self.hit_rate}
+
+    def clear(self):
+        with self.__lock:
+            self.__shared.clear()
+            self.hits = self.allocations = 0
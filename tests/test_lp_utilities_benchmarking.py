@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from src.lp_utilities.benchmarking import timed
+from src.lp_utilities.benchmarking import peak_memory
+from src.lp_utilities.benchmarking import print_results
+
+
+class TestBenchmarking(unittest.TestCase):
+
+    def test_timed(self):
+        result, seconds = timed(lambda: 42)
+        self.assertEqual(42, result)
+        self.assertTrue(seconds >= 0)
+
+    def test_peak_memory(self):
+        result, peak = peak_memory(lambda: [0] * 10000)
+        self.assertEqual(10000, len(result))
+        self.assertTrue(peak >= 10000 * 8)
+
+    def test_print_results(self):
+        stream = io.StringIO()
+        with redirect_stdout(stream):
+            print_results("Name", {'count': 3, 'seconds': 0.125})
+        self.assertEqual("Name\n\tcount: 3\n\tseconds: 0.12\n", stream.getvalue())
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+from src.lp_utilities.buffered_writer import BufferedWriter
+
+
+class CountingStream(object):
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+class TestBufferedWriter(unittest.TestCase):
+
+    def test_writes_in_chunks(self):
+        stream = CountingStream()
+        writer = BufferedWriter(stream, chunk_size=10)
+        for _ in range(7):
+            writer.write("abc")
+        self.assertEqual(["abcabcabcabc"], stream.writes)
+        writer.flush()
+        writer.flush()
+        self.assertEqual(["abcabcabcabc", "abcabcabc"], stream.writes)
+
+    def test_context_manager_flushes(self):
+        stream = CountingStream()
+        with BufferedWriter(stream) as writer:
+            writer.write("abc")
+            self.assertEqual([], stream.writes)
+        self.assertEqual(["abc"], stream.writes)
+
+    def test_nothing_written(self):
+        stream = CountingStream()
+        with BufferedWriter(stream):
+            pass
+        self.assertEqual([], stream.writes)
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import threading
 import unittest
 from unittest.mock import Mock, patch, call
 from src.theory.patterns.abstract_factory.abstract_factory import MotorCycleInterface
@@ -13,6 +14,9 @@ from src.theory.patterns.abstract_factory.abstract_factory import MotorCycleFact
 from src.theory.patterns.abstract_factory.abstract_factory import CarFactory
 from src.theory.patterns.abstract_factory.abstract_factory import print_vehicle_specs
 from src.theory.patterns.abstract_factory.abstract_factory import set_vehicle_properties
+from src.theory.patterns.abstract_factory.abstract_factory import register, register_factory, get_factory_class
+from src.theory.patterns.abstract_factory.abstract_factory import VEHICLE_FACTORIES
+from src.theory.patterns.abstract_factory.abstract_factory import FactoryProvider, factory_provider
 from src.theory.patterns.abstract_factory.abstract_factory import main as af_main
 
 
@@ -157,6 +161,108 @@ class TestCarFactory(unittest.TestCase):
         self.assertTrue("Unknown brand specified." in context.exception.args[0])
 
 
+class TestRegistration(unittest.TestCase):
+
+    def setUp(self):
+        self.motorcycle_brands = dict(MotorCycleFactory.brands)
+        self.car_brands = dict(CarFactory.brands)
+        self.factories = dict(VEHICLE_FACTORIES)
+
+    def tearDown(self):
+        MotorCycleFactory.brands = self.motorcycle_brands
+        CarFactory.brands = self.car_brands
+        VEHICLE_FACTORIES.clear()
+        VEHICLE_FACTORIES.update(self.factories)
+        factory_provider.reset()
+
+    def test_factories_keep_their_own_brands(self):
+        self.assertEqual({"Harley Davidson": HarleyDavidson, "Honda": Honda}, MotorCycleFactory.brands)
+        self.assertEqual({"Mercedez-Benz": MercedezBenz, "Lexus": Lexus}, CarFactory.brands)
+        self.assertEqual({}, VehicleFactoryInterface.brands)
+
+    def test_register_decorator(self):
+        @register("Motorcycle", "Ducati")
+        class Ducati(HarleyDavidson):
+            pass
+
+        self.assertTrue(type(MotorCycleFactory().get_vehicle("Ducati")) is Ducati)
+        with self.assertRaises(TypeError):
+            CarFactory().get_vehicle("Ducati")
+
+    def test_register_explicit(self):
+        self.assertIs(Lexus, register("Automobile", "Toyota", Lexus))
+        v = set_vehicle_properties("Automobile", "Toyota", "Corolla", 50)
+        self.assertEqual("Corolla", v.model)
+
+    def test_register_unknown_type(self):
+        with self.assertRaises(TypeError) as context:
+            register("Boat", "Yamaha", Honda)
+        self.assertEqual('You must specify a Motorcycle or an Automobile for type.', context.exception.args[0])
+
+    def test_register_factory(self):
+        @register_factory("Truck")
+        class TruckFactory(CarFactory):
+            brands = {}
+
+        register("Truck", "Lexus", Lexus)
+        self.assertIs(TruckFactory, get_factory_class("Truck"))
+        self.assertTrue(type(set_vehicle_properties("Truck", "Lexus", "GX", 40)) is Lexus)
+        self.assertNotIn("Truck", self.factories)
+
+    def test_many_brands(self):
+        for index in range(500):
+            register("Automobile", "Brand {0}".format(index), Lexus)
+        self.assertEqual(502, len(CarFactory.brands))
+        self.assertTrue(type(CarFactory().get_vehicle("Brand 499")) is Lexus)
+
+
+class TestFactoryProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.provider = FactoryProvider()
+
+    def tearDown(self):
+        factory_provider.reset()
+
+    def test_get_shares_factories(self):
+        factory = self.provider.get("Motorcycle")
+        self.assertTrue(type(factory) is MotorCycleFactory)
+        self.assertIs(factory, self.provider.get("Motorcycle"))
+        self.assertTrue(type(self.provider.get("Automobile")) is CarFactory)
+
+    def test_get_unknown_type(self):
+        with self.assertRaises(TypeError) as context:
+            self.provider.get("Bat mobile")
+        self.assertEqual('You must specify a Motorcycle or an Automobile for type.', context.exception.args[0])
+
+    def test_override_and_reset(self):
+        fake = Mock()
+        self.provider.override("Automobile", fake)
+        self.assertIs(fake, self.provider.get("Automobile"))
+        self.provider.reset()
+        self.assertTrue(type(self.provider.get("Automobile")) is CarFactory)
+
+    def test_set_vehicle_properties_uses_provider(self):
+        vehicle = Mock()
+        fake = Mock()
+        fake.get_vehicle.return_value = vehicle
+        factory_provider.override("Automobile", fake)
+        self.assertIs(vehicle, set_vehicle_properties("Automobile", "Lexus", "RX 350", 85))
+        fake.get_vehicle.assert_called_once_with("Lexus")
+        vehicle.set_model.assert_called_once_with("RX 350")
+        vehicle.accelerate.assert_called_once_with(85)
+
+    def test_one_factory_across_threads(self):
+        factories = []
+        threads = [threading.Thread(target=lambda: factories.append(self.provider.get("Motorcycle")))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, len(set(id(factory) for factory in factories)))
+
+
 class TestAbstractFactoryFunctions(unittest.TestCase):
 
     @patch('sys.stdout')
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+from src.theory.patterns.abstract_factory.abstract_factory import Lexus
+from src.theory.patterns.abstract_factory.benchmarks import bench_set_vehicle_properties, bench_fleet
+from src.theory.patterns.abstract_factory.benchmarks import bench_pool, bench_ingest, bench_report, bench_index
+from src.theory.patterns.abstract_factory.benchmarks import bench_fleet_file
+from src.theory.patterns.abstract_factory.benchmarks import new_factory_set_vehicle_properties
+
+
+class TestBenchmarks(unittest.TestCase):
+    """
+    Only checks that the benchmarks run and report what they should, the numbers
+    themselves depend on the machine.
+    """
+
+    def test_new_factory_set_vehicle_properties(self):
+        v = new_factory_set_vehicle_properties("Automobile", "Lexus", "RX 350", 85)
+        self.assertTrue(type(v) is Lexus)
+        self.assertEqual(("RX 350", 85), (v.model, v.speed))
+
+    def test_bench_set_vehicle_properties(self):
+        results = bench_set_vehicle_properties(40)
+        self.assertEqual(40, results['count'])
+        self.assertTrue(results['new_factory_ns_per_record'] > 0)
+        self.assertTrue(results['shared_factory_ns_per_record'] > 0)
+
+    def test_bench_fleet(self):
+        results = bench_fleet(40, 2)
+        self.assertEqual(40, results['count'])
+        self.assertTrue(results['same_speeds'])
+        self.assertTrue(results['fleet_bytes_per_vehicle'] < results['objects_bytes_per_vehicle'])
+
+    def test_bench_pool(self):
+        results = bench_pool(40)
+        self.assertEqual(40, results['count'])
+        self.assertEqual(4, results['misses'])
+        self.assertEqual(36, results['hits'])
+        self.assertTrue(results['pooled_ns_per_request'] > 0)
+
+    def test_bench_ingest(self):
+        results = bench_ingest(40)
+        self.assertEqual(40, results['count'])
+        for key in ('loop_rows_per_second', 'vehicles_rows_per_second', 'fill_fleet_rows_per_second'):
+            self.assertTrue(results[key] > 0)
+
+    def test_bench_report(self):
+        results = bench_report(40)
+        self.assertEqual(40, results['count'])
+        self.assertTrue(results['same_text'])
+        self.assertTrue(results['fleet_writer_ns_per_vehicle'] > 0)
+
+    def test_bench_index(self):
+        results = bench_index(40, 2)
+        self.assertEqual(40, results['count'])
+        self.assertTrue(results['same_results'])
+        self.assertTrue(results['index_us_per_query'] > 0)
+
+    def test_bench_fleet_file(self):
+        results = bench_fleet_file(2000)
+        self.assertEqual(2000, results['count'])
+        self.assertTrue(results['same_speeds'])
+        self.assertTrue(results['fleet_file_bytes'] < results['pickle_bytes'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+from array import array
+from unittest.mock import patch
+from src.theory.patterns.abstract_factory.abstract_factory import HarleyDavidson
+from src.theory.patterns.abstract_factory.abstract_factory import set_vehicle_properties
+from src.theory.patterns.abstract_factory import fleet
+from src.theory.patterns.abstract_factory.fleet import Categories, VehicleFleet
+
+RECORDS = [("Motorcycle", "Harley Davidson", "Touring", 100),
+           ("Motorcycle", "Honda", "CBR125R", 125),
+           ("Automobile", "Mercedez-Benz", "Mercedes-AMG C 63 Sedan", 95),
+           ("Automobile", "Lexus", "RX 350", 85)]
+
+
+def vehicle_data(vehicle):
+    return type(vehicle), vehicle.wheels, vehicle.vehicle_type, vehicle.mfg, vehicle.model, vehicle.speed
+
+
+class TestCategories(unittest.TestCase):
+
+    def test_codes(self):
+        categories = Categories()
+        self.assertEqual(0, categories.code("Honda"))
+        self.assertEqual(1, categories.code("Lexus"))
+        self.assertEqual(0, categories.code("Honda"))
+        self.assertEqual(2, len(categories))
+        self.assertEqual("Lexus", categories[1])
+        self.assertEqual(1, categories.find("Lexus"))
+        self.assertIsNone(categories.find("Ducati"))
+
+
+class FleetAssertions(object):
+
+    def setUp(self):
+        self.vehicles = [set_vehicle_properties(*RECORDS[index % 4]) for index in range(20)]
+        self.fleet = VehicleFleet.from_vehicles(self.vehicles)
+
+    def assert_fleet_matches(self, vehicles):
+        self.assertEqual([vehicle_data(v) for v in vehicles], [vehicle_data(v) for v in self.fleet.to_vehicles()])
+        self.assertEqual([v.speed for v in vehicles], list(self.fleet.speeds()))
+
+    def test_round_trip(self):
+        self.assertEqual(20, len(self.fleet))
+        self.assert_fleet_matches(self.vehicles)
+        self.assertEqual(4, len(self.fleet.mfgs))
+        self.assertTrue(type(self.fleet.speeds()[0]) is not float)
+
+    def test_add_like_set_vehicle_properties(self):
+        fleet_ = VehicleFleet()
+        for record in RECORDS:
+            fleet_.add(*record)
+        self.assertEqual([vehicle_data(set_vehicle_properties(*record)) for record in RECORDS],
+                         [vehicle_data(v) for v in fleet_.to_vehicles()])
+
+    def test_add_errors(self):
+        with self.assertRaises(TypeError) as context:
+            self.fleet.add("Bat mobile", "Wayne Enterprises", "Tumbler", 99)
+        self.assertEqual('You must specify a Motorcycle or an Automobile for type.', context.exception.args[0])
+        with self.assertRaises(TypeError) as context:
+            self.fleet.add("Automobile", "Honda", "Civic", 99)
+        self.assertEqual('Unknown brand specified.', context.exception.args[0])
+
+    def test_accelerate_all(self):
+        self.fleet.accelerate(5)
+        for v in self.vehicles:
+            v.accelerate(5)
+        self.assert_fleet_matches(self.vehicles)
+
+    def test_accelerate_mask(self):
+        mask = self.fleet.select(vehicle_type="Automobile")
+        self.assertEqual([v.vehicle_type == "Automobile" for v in self.vehicles], list(mask))
+        self.fleet.accelerate(10, mask)
+        for v in self.vehicles:
+            if v.vehicle_type == "Automobile":
+                v.accelerate(10)
+        self.assert_fleet_matches(self.vehicles)
+
+    def test_accelerate_indexes(self):
+        self.fleet.accelerate(3, [0, 5, 5])
+        self.vehicles[0].accelerate(3)
+        self.vehicles[5].accelerate(3)
+        self.vehicles[5].accelerate(3)
+        self.assert_fleet_matches(self.vehicles)
+
+    def test_accelerate_bad_mask(self):
+        with self.assertRaises(IndexError):
+            self.fleet.accelerate(3, [True, False])
+
+    def test_accelerate_no_rows(self):
+        self.fleet.accelerate(2, [])
+        self.fleet.accelerate(.5, [])
+        self.assert_fleet_matches(self.vehicles)
+        self.assertTrue(self.fleet.integral)
+
+    def test_float_speeds(self):
+        self.fleet.accelerate(.5, [1])
+        self.vehicles[1].accelerate(.5)
+        self.assert_fleet_matches(self.vehicles)
+        self.assertEqual(125.5, self.fleet.vehicle(1).speed)
+        self.assertFalse(self.fleet.integral)
+
+    def test_speed_types_kept_per_row(self):
+        self.fleet.accelerate(.5, [1])
+        self.vehicles[1].accelerate(.5)
+        row_types = [type(v.speed) for v in self.vehicles]
+        self.assertEqual([float if index == 1 else int for index in range(20)], row_types)
+        self.assertEqual(row_types, [type(v.speed) for v in self.fleet.to_vehicles()])
+        self.assertEqual(row_types, [type(speed) for speed in self.fleet.columns()[-1]])
+        self.assertEqual([0 if index == 1 else 1 for index in range(20)], list(self.fleet.whole_speeds()))
+        mask = [index % 4 == 2 for index in range(20)]
+        self.fleet.accelerate(.25, mask)
+        self.assertEqual([not (index == 1 or index % 4 == 2) for index in range(20)],
+                         [type(v.speed) is int for v in self.fleet.to_vehicles()])
+        self.fleet.accelerate(.25)
+        self.assertEqual([float] * 20, [type(speed) for speed in self.fleet.columns()[-1]])
+
+    def test_add_float_speed(self):
+        v = HarleyDavidson()
+        v.speed = 99.5
+        row = self.fleet.add_vehicle(v)
+        self.assertEqual(99.5, self.fleet.vehicle(row).speed)
+        self.assertTrue(type(self.fleet.vehicle(0).speed) is int)
+
+    def test_select(self):
+        self.assertEqual([v.mfg == "Lexus" and v.model == "RX 350" for v in self.vehicles],
+                         list(self.fleet.select(mfg="Lexus", model="RX 350")))
+        self.assertEqual([False] * 20, list(self.fleet.select(mfg="Ducati")))
+        self.assertEqual([True] * 20, list(self.fleet.select()))
+
+    def test_changed_vehicle(self):
+        v = HarleyDavidson()
+        v.set_model("Custom")
+        v.mfg = "HD"
+        row = self.fleet.add_vehicle(v)
+        self.assertEqual(vehicle_data(v), vehicle_data(self.fleet.vehicle(row)))
+
+    def test_from_columns(self):
+        self.fleet.accelerate(0.5)
+        tables = (self.fleet.classes.values, self.fleet.vehicle_types.values, self.fleet.mfgs.values,
+                  self.fleet.models.values)
+        speeds = array('d', self.fleet.speeds())
+        copy = VehicleFleet.from_columns(tables, self.fleet.codes(), speeds, self.fleet.integral)
+        self.assertFalse(copy.integral)
+        self.assertEqual([vehicle_data(v) for v in self.fleet.to_vehicles()],
+                         [vehicle_data(v) for v in copy.to_vehicles()])
+        whole = array('b', [index % 2 for index in range(20)])
+        copy = VehicleFleet.from_columns(tables, self.fleet.codes(), speeds, whole)
+        self.assertEqual([int if index % 2 else float for index in range(20)],
+                         [type(v.speed) for v in copy.to_vehicles()])
+        with self.assertRaises(ValueError):
+            VehicleFleet.from_columns(tables, self.fleet.codes(), speeds, whole[:3])
+        with self.assertRaises(ValueError) as context:
+            VehicleFleet.from_columns(tables, self.fleet.codes(), speeds[:3])
+        self.assertEqual('Every column must have one entry per vehicle.', context.exception.args[0])
+
+    def test_empty_fleet(self):
+        fleet_ = VehicleFleet()
+        fleet_.accelerate(1)
+        self.assertEqual([], fleet_.to_vehicles())
+        self.assertEqual([], list(fleet_.speeds()))
+
+
+@unittest.skipIf(fleet.np is None, "NumPy is not installed")
+class TestVehicleFleetNumPy(FleetAssertions, unittest.TestCase):
+    pass
+
+
+@patch('src.theory.patterns.abstract_factory.fleet.np', None)
+class TestVehicleFleetPurePython(FleetAssertions, unittest.TestCase):
+    pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.theory.patterns.abstract_factory.abstract_factory import HarleyDavidson, Lexus
+from src.theory.patterns.abstract_factory.abstract_factory import set_vehicle_properties
+from src.theory.patterns.abstract_factory import fleet_file
+from src.theory.patterns.abstract_factory.fleet import VehicleFleet
+from src.theory.patterns.abstract_factory.fleet_file import FleetFile, save_fleet, class_name, load_class, RECORD
+
+RECORDS = [("Motorcycle", "Harley Davidson", "Touring", 100),
+           ("Motorcycle", "Honda", "CBR125R", 125),
+           ("Automobile", "Mercedez-Benz", "Mercedes-AMG C 63 Sedan", 95),
+           ("Automobile", "Lexus", "RX 350", 85)]
+
+
+def vehicle_data(vehicle):
+    return type(vehicle), vehicle.wheels, vehicle.vehicle_type, vehicle.mfg, vehicle.model, vehicle.speed
+
+
+class FleetFileAssertions(object):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'fleet.vfleet')
+        self.vehicles = [set_vehicle_properties(*RECORDS[index % 4]) for index in range(21)]
+        custom = HarleyDavidson()
+        custom.set_model("Nöt ascii")
+        custom.mfg = "HD"
+        self.vehicles.append(custom)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_round_trip_vehicles(self):
+        self.assertEqual(22, save_fleet(self.vehicles, self.path))
+        with FleetFile(self.path) as loaded:
+            self.assertEqual(22, len(loaded))
+            self.assertEqual([vehicle_data(v) for v in self.vehicles], [vehicle_data(v) for v in loaded])
+            self.assertEqual(vehicle_data(self.vehicles[-1]), vehicle_data(loaded[-1]))
+            self.assertEqual((Lexus, "Automobile", "Lexus", "RX 350", 85), loaded.record(3))
+            self.assertTrue(type(loaded.record(0)[-1]) is int)
+            with self.assertRaises(IndexError):
+                loaded.record(22)
+            with self.assertRaises(IndexError):
+                loaded.vehicle(-23)
+
+    def test_round_trip_fleet(self):
+        fleet = VehicleFleet.from_vehicles(self.vehicles)
+        fleet.accelerate(0.25, [1, 2])
+        save_fleet(fleet, self.path)
+        self.assertEqual(os.path.getsize(self.path) % 8, 0)
+        with FleetFile(self.path) as loaded:
+            self.assertTrue(type(loaded.record(0)[-1]) is int)
+            self.assertTrue(type(loaded.record(1)[-1]) is float)
+            self.assertEqual(125.25, loaded.record(1)[-1])
+            copy = loaded.to_fleet()
+        self.assertFalse(copy.integral)
+        self.assertEqual(list(fleet.whole_speeds()), list(copy.whole_speeds()))
+        self.assertEqual([vehicle_data(v) for v in fleet.to_vehicles()], [vehicle_data(v) for v in copy.to_vehicles()])
+
+    def test_round_trip_float_fleet(self):
+        fleet = VehicleFleet.from_vehicles(self.vehicles)
+        fleet.accelerate(0.5)
+        save_fleet(fleet, self.path)
+        with FleetFile(self.path) as loaded:
+            self.assertEqual(loaded.offset + 22 * RECORD.size, os.path.getsize(self.path))
+            self.assertEqual(100.5, loaded.record(0)[-1])
+            self.assertEqual([vehicle_data(v) for v in fleet.to_vehicles()], [vehicle_data(v) for v in loaded])
+
+    def test_empty(self):
+        save_fleet([], self.path)
+        with FleetFile(self.path) as loaded:
+            self.assertEqual(0, len(loaded))
+            self.assertEqual([], list(loaded))
+            self.assertEqual(0, len(loaded.to_fleet()))
+
+    def test_record_size(self):
+        save_fleet(self.vehicles, self.path)
+        with FleetFile(self.path) as loaded:
+            self.assertEqual(loaded.offset + 22 * RECORD.size, os.path.getsize(self.path))
+            self.assertEqual(0, loaded.offset % 8)
+
+    def test_bad_files(self):
+        with open(self.path, 'wb') as stream:
+            stream.write(b'not a fleet file at all')
+        with self.assertRaises(ValueError) as context:
+            FleetFile(self.path)
+        self.assertTrue(context.exception.args[0].startswith('Not a fleet file:'))
+        save_fleet(self.vehicles, self.path)
+        with open(self.path, 'r+b') as stream:
+            stream.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(ValueError) as context:
+            FleetFile(self.path)
+        self.assertTrue(context.exception.args[0].startswith('Fleet file is truncated:'))
+
+
+@unittest.skipIf(fleet_file.np is None, "NumPy is not installed")
+class TestFleetFileNumPy(FleetFileAssertions, unittest.TestCase):
+    pass
+
+
+@patch('src.theory.patterns.abstract_factory.fleet.np', None)
+@patch('src.theory.patterns.abstract_factory.fleet_file.np', None)
+class TestFleetFilePurePython(FleetFileAssertions, unittest.TestCase):
+    pass
+
+
+class TestClassNames(unittest.TestCase):
+
+    def test_round_trip(self):
+        name = class_name(Lexus)
+        self.assertEqual('src.theory.patterns.abstract_factory.abstract_factory:Lexus', name)
+        self.assertIs(Lexus, load_class(name))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import gc
+import random
+import weakref
+import unittest
+from src.theory.patterns.abstract_factory.abstract_factory import set_vehicle_properties, watch, unwatch
+from src.theory.patterns.abstract_factory.abstract_factory import Honda
+from src.theory.patterns.abstract_factory.index import FleetIndex, SpeedGroup
+
+
+def make_vehicles():
+    return [set_vehicle_properties("Motorcycle", "Harley Davidson", "Touring", 100),
+            set_vehicle_properties("Motorcycle", "Honda", "CBR125R", 125),
+            set_vehicle_properties("Motorcycle", "Honda", "Gold Wing", 90),
+            set_vehicle_properties("Motorcycle", "Honda", "CBR125R", 110),
+            set_vehicle_properties("Automobile", "Mercedez-Benz", "Mercedes-AMG C 63 Sedan", 95),
+            set_vehicle_properties("Automobile", "Lexus", "RX 350", 85),
+            set_vehicle_properties("Automobile", "Lexus", "RX 350", 100)]
+
+
+def scan(vehicles, mfg=None, vehicle_type=None, model=None, min_speed=None, max_speed=None):
+    return [v for v in vehicles if (mfg is None or v.mfg == mfg) and
+            (vehicle_type is None or v.vehicle_type == vehicle_type) and (model is None or v.model == model) and
+            (min_speed is None or v.speed >= min_speed) and (max_speed is None or v.speed <= max_speed)]
+
+
+QUERIES = [{}, {'mfg': 'Honda'}, {'mfg': 'Honda', 'min_speed': 101}, {'vehicle_type': 'Automobile'},
+           {'vehicle_type': 'Motor Cycle', 'model': 'CBR125R'}, {'mfg': 'Lexus', 'model': 'RX 350', 'max_speed': 90},
+           {'min_speed': 90, 'max_speed': 100}, {'mfg': 'Ducati'}, {'mfg': 'Honda', 'vehicle_type': 'Automobile'},
+           {'min_speed': 200}, {'min_speed': 120, 'max_speed': 80}]
+
+
+class TestFleetIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.vehicles = make_vehicles()
+        self.index = FleetIndex(self.vehicles)
+
+    def assertMatchesScan(self):
+        for query in QUERIES:
+            expected = scan(self.vehicles, **query)
+            found = self.index.find(**query)
+            self.assertEqual(sorted(map(id, expected)), sorted(map(id, found)), query)
+            self.assertEqual(sorted(v.speed for v in found), [v.speed for v in found])
+            self.assertEqual(len(expected), self.index.count(**query))
+            speeds = [v.speed for v in expected]
+            self.assertEqual(sum(speeds) / len(speeds) if speeds else None, self.index.mean(**query))
+            self.assertEqual(max(speeds) if speeds else None, self.index.max(**query))
+
+    def test_queries(self):
+        self.assertEqual(len(self.vehicles), len(self.index))
+        self.assertMatchesScan()
+
+    def test_accelerate_and_set_model(self):
+        self.vehicles[0].accelerate(50)
+        self.vehicles[2].set_model("CBR125R")
+        self.vehicles[5].accelerate(-10)
+        self.vehicles[6].set_model("IS 500")
+        self.assertMatchesScan()
+        self.assertEqual([self.vehicles[2]], self.index.find(model="CBR125R", max_speed=100))
+
+    def test_add_remove(self):
+        extra = set_vehicle_properties("Motorcycle", "Honda", "Shadow", 75)
+        self.index.add(extra)
+        self.index.add(extra)
+        self.vehicles.append(extra)
+        self.assertMatchesScan()
+        removed = self.vehicles.pop(1)
+        self.index.remove(removed)
+        self.assertNotIn(removed, self.index)
+        self.assertEqual((), removed.watchers)
+        removed.accelerate(10)
+        self.assertMatchesScan()
+        with self.assertRaises(KeyError):
+            self.index.remove(removed)
+
+    def test_refresh(self):
+        self.vehicles[3].speed = 10
+        self.index.refresh(self.vehicles[3])
+        self.assertMatchesScan()
+
+    def test_stats_by(self):
+        stats = self.index.stats_by('mfg')
+        self.assertEqual({'count': 3, 'mean': 325 / 3, 'max': 125}, stats['Honda'])
+        self.assertEqual({'Harley Davidson', 'Honda', 'Mercedez-Benz', 'Lexus'}, set(stats))
+        self.vehicles[4].set_model("C 300")
+        self.assertNotIn("Mercedes-AMG C 63 Sedan", self.index.stats_by('model'))
+        with self.assertRaises(ValueError) as context:
+            self.index.stats_by('speed')
+        self.assertEqual('Can not group vehicles by: speed', str(context.exception))
+
+    def test_many_vehicles(self):
+        self.vehicles = make_vehicles()
+        for number in range(3000):
+            self.vehicles.append(set_vehicle_properties("Automobile", "Lexus", "RX {0}".format(number % 7),
+                                                        number % 130))
+        self.index = FleetIndex(self.vehicles)
+        for vehicle in self.vehicles[::5]:
+            vehicle.accelerate(3)
+        self.assertMatchesScan()
+
+    def test_two_indexes(self):
+        other = FleetIndex(self.vehicles[:2])
+        self.vehicles[1].accelerate(5)
+        self.assertEqual(130, other.max())
+        self.assertEqual(130, self.index.max(mfg="Honda"))
+
+
+class TestSpeedGroup(unittest.TestCase):
+
+    def test_buckets(self):
+        rng = random.Random(7)
+        group = SpeedGroup(load=2)
+        keys = [(rng.randint(0, 20), sequence, object()) for sequence in range(200)]
+        for key in keys:
+            group.add(key)
+        for key in keys[::3]:
+            group.remove(key)
+        kept = sorted(key for index, key in enumerate(keys) if index % 3)
+        self.assertTrue(len(group.buckets) > 10)
+        self.assertEqual(kept, list(group.keys()))
+        self.assertEqual(sum(key[0] for key in kept), group.total)
+        for low, high in ((None, None), (5, None), (None, 5), (5, 12), (12, 5), (21, None), (None, -1), (7, 7)):
+            expected = [key for key in kept if (low is None or key[0] >= low) and (high is None or key[0] <= high)]
+            self.assertEqual(expected, list(group.keys(low, high)))
+            self.assertEqual(len(expected), group.count(low, high))
+            self.assertEqual(expected[-1] if expected else None, group.last(low, high))
+
+    def test_remove_missing(self):
+        group = SpeedGroup()
+        key = (10, 0, object())
+        with self.assertRaises(ValueError):
+            group.remove(key)
+        group.add(key)
+        with self.assertRaises(ValueError) as context:
+            group.remove((10, 1, object()))
+        self.assertEqual('Vehicle is not in the group with a speed of 10', str(context.exception))
+
+
+class TestWatch(unittest.TestCase):
+
+    def test_watch(self):
+        seen = []
+        v = Honda()
+        watch(v, lambda *args: seen.append(args))
+        v.set_model("CBR125R")
+        v.accelerate(5)
+        v.accelerate(5)
+        self.assertEqual([(v, 'model', ""), (v, 'speed', 0), (v, 'speed', 5)], seen)
+
+    def test_unwatch(self):
+        seen = []
+        v = Honda()
+        watcher = seen.append
+        watch(v, watcher)
+        unwatch(v, watcher)
+        v.accelerate(5)
+        self.assertEqual([], seen)
+        self.assertNotIn('watchers', vars(v))
+
+    def test_dropped_index_collected(self):
+        vehicles = make_vehicles()
+        index = FleetIndex(vehicles)
+        kept = FleetIndex(vehicles)
+        dropped = weakref.ref(index)
+        del index
+        gc.collect()
+        self.assertIsNone(dropped())
+        vehicles[0].accelerate(50)
+        self.assertEqual([vehicles[0]], kept.find(min_speed=150))
+        self.assertEqual(1, len(vehicles[0].watchers))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from src.theory.patterns.abstract_factory.abstract_factory import set_vehicle_properties
+from src.theory.patterns.abstract_factory.fleet import VehicleFleet
+from src.theory.patterns.abstract_factory.ingest import VehicleIngest, RowError, convert_chunk, ingest_file
+from src.theory.patterns.abstract_factory.ingest import parse_row
+
+RECORDS = [("Motorcycle", "Harley Davidson", "Touring", 100),
+           ("Motorcycle", "Honda", "CBR125R", 125),
+           ("Automobile", "Mercedez-Benz", "Mercedes-AMG C 63 Sedan", 95),
+           ("Automobile", "Lexus", "RX 350", 85)]
+
+CSV = ("type,make,model,speed\n"
+       "Motorcycle,Harley Davidson,Touring,100\n"
+       "Motorcycle,Honda,CBR125R,125\n"
+       "Automobile,Honda,Civic,60\n"
+       "\n"
+       "Automobile,Mercedez-Benz,Mercedes-AMG C 63 Sedan,95\n"
+       "Automobile,Lexus,RX 350,fast\n"
+       "Automobile,Lexus,\"RX 350, F Sport\",85\n")
+
+
+def vehicle_data(vehicle):
+    return type(vehicle), vehicle.vehicle_type, vehicle.mfg, vehicle.model, vehicle.speed
+
+
+class TestParseRow(unittest.TestCase):
+
+    def test_csv(self):
+        self.assertEqual(("Automobile", "Lexus", "RX 350", 85), parse_row("Automobile,Lexus,RX 350,85\n"))
+        self.assertIsNone(parse_row("Type, Make, Model, Speed"))
+        self.assertEqual(("a", "b", "c", 1), parse_row("a,b,c,1"))
+        self.assertIsNone(parse_row("  \n"))
+
+    def test_jsonl(self):
+        self.assertEqual(("Automobile", "Lexus", "RX 350", 85),
+                         parse_row('{"type": "Automobile", "make": "Lexus", "model": "RX 350", "speed": 85}', 'jsonl'))
+        self.assertEqual(("Automobile", "Lexus", "RX 350", 8.5),
+                         parse_row('["Automobile", "Lexus", "RX 350", 8.5]', 'jsonl'))
+
+    def test_bad_rows(self):
+        with self.assertRaises(ValueError) as context:
+            parse_row("Automobile,Lexus,RX 350")
+        self.assertEqual('Row must have 4 fields: type, make, model, speed', context.exception.args[0])
+        with self.assertRaises(ValueError) as context:
+            parse_row('{"type": "Automobile", "make": "Lexus"}', 'jsonl')
+        self.assertEqual('Row is missing: model, speed', context.exception.args[0])
+        with self.assertRaises(ValueError) as context:
+            parse_row('["Automobile", "Lexus", "RX 350", true]', 'jsonl')
+        self.assertEqual('Speed must be a number: True', context.exception.args[0])
+        with self.assertRaises(ValueError):
+            parse_row('{"type": ', 'jsonl')
+
+
+class TestVehicleIngest(unittest.TestCase):
+
+    def expected(self):
+        return [vehicle_data(set_vehicle_properties(*record)) for record in
+                (RECORDS[0], RECORDS[1], RECORDS[2], ("Automobile", "Lexus", "RX 350, F Sport", 85))]
+
+    def test_vehicles_and_errors(self):
+        ingest = VehicleIngest(chunk_size=3)
+        vehicles = ingest.vehicles(io.StringIO(CSV))
+        self.assertEqual(self.expected()[0], vehicle_data(next(vehicles)))
+        self.assertEqual(self.expected()[1:], [vehicle_data(v) for v in vehicles])
+        self.assertEqual([RowError(4, "Automobile,Honda,Civic,60", 'Unknown brand specified.'),
+                          RowError(7, "Automobile,Lexus,RX 350,fast", "Speed must be a number: 'fast'")],
+                         ingest.errors)
+        stats = ingest.stats()
+        self.assertEqual((4, 2), (stats['rows'], stats['errors']))
+        self.assertTrue(ingest.rows_per_second > 0)
+
+    def test_jsonl(self):
+        text = "\n".join(json.dumps(dict(zip(('type', 'make', 'model', 'speed'), record))) for record in RECORDS)
+        text += '\n["Bat mobile", "Wayne Enterprises", "Tumbler", 99]\n'
+        ingest = VehicleIngest('jsonl')
+        self.assertEqual([vehicle_data(set_vehicle_properties(*record)) for record in RECORDS],
+                         [vehicle_data(v) for v in ingest.vehicles(io.StringIO(text))])
+        self.assertEqual(['You must specify a Motorcycle or an Automobile for type.'],
+                         [error.message for error in ingest.errors])
+
+    def test_jsonl_list_speeds_kept(self):
+        text = '["Motorcycle", "Honda", "a", 90]\n["Motorcycle", "Honda", "b", 100.5]\n' \
+               '["Motorcycle", "Honda", "c", true]\n'
+        for chunk_size in (1, 10):
+            ingest = VehicleIngest('jsonl', chunk_size=chunk_size)
+            self.assertEqual([90, 100.5], [v.speed for v in ingest.vehicles(io.StringIO(text))], chunk_size)
+            self.assertEqual([(3, 'Speed must be a number: True')],
+                             [(error.line, error.message) for error in ingest.errors])
+
+    def test_open_quote_stays_on_its_line(self):
+        text = 'Motorcycle,Honda,x,1\nMotorcycle,Honda,"bad,2\nAutomobile,Lexus,y,3\nAutomobile,Lexus,z,4\n'
+        for chunk_size in (1, 2, 3, 10):
+            ingest = VehicleIngest(chunk_size=chunk_size)
+            self.assertEqual(["x", "y", "z"], [v.model for v in ingest.vehicles(io.StringIO(text))], chunk_size)
+            self.assertEqual([2], [error.line for error in ingest.errors])
+
+    def test_csv_errors_do_not_stop_the_stream(self):
+        limit = csv.field_size_limit()
+        csv.field_size_limit(50)
+        try:
+            text = "Automobile,Lexus,{0},1\nAutomobile,Lexus,RX 350,2\n".format("x" * 60)
+            ingest = VehicleIngest()
+            self.assertEqual(["RX 350"], [v.model for v in ingest.vehicles(io.StringIO(text))])
+        finally:
+            csv.field_size_limit(limit)
+        self.assertEqual([1], [error.line for error in ingest.errors])
+        self.assertTrue(ingest.errors[0].message.startswith('field larger than field limit'))
+
+    def test_fill_fleet(self):
+        ingest = VehicleIngest(chunk_size=2)
+        fleet = ingest.fill_fleet(io.StringIO(CSV))
+        self.assertTrue(isinstance(fleet, VehicleFleet))
+        self.assertEqual(self.expected(), [vehicle_data(v) for v in fleet.to_vehicles()])
+        self.assertEqual(2, len(ingest.errors))
+        same = VehicleFleet()
+        self.assertIs(same, ingest.fill_fleet(io.StringIO(CSV), same))
+
+    def test_chunks_are_lazy(self):
+        ingest = VehicleIngest(chunk_size=2)
+        chunks = ingest.chunks(io.StringIO(CSV))
+        self.assertEqual((1, ["type,make,model,speed\n", "Motorcycle,Harley Davidson,Touring,100\n"]),
+                         next(chunks))
+        self.assertEqual([3, 5, 7], [start for start, _ in chunks])
+
+    def test_convert_chunk_resolves_once(self):
+        texts = ["Automobile,Lexus,RX 350,{0}".format(index) for index in range(5)]
+        rows, errors = convert_chunk(2, texts, columnar=True)
+        self.assertEqual([], errors)
+        self.assertEqual(1, len(set(row[0] for row in rows)))
+        self.assertEqual([0, 1, 2, 3, 4], [row[2] for row in rows])
+
+    def test_process_pool(self):
+        ingest = VehicleIngest(chunk_size=2, max_workers=2, window=2)
+        self.assertEqual(self.expected(), [vehicle_data(v) for v in ingest.vehicles(io.StringIO(CSV))])
+        self.assertEqual([4, 7], [error.line for error in ingest.errors])
+
+    def test_bad_format(self):
+        with self.assertRaises(ValueError) as context:
+            VehicleIngest('xml')
+        self.assertEqual('fmt must be one of: csv, jsonl', context.exception.args[0])
+
+
+class TestIngestFile(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'vehicles.csv')
+        with open(self.path, 'w', newline='') as csv_file:
+            csv_file.write(CSV)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_vehicles(self):
+        vehicles, ingest = ingest_file(self.path)
+        self.assertEqual(4, len(vehicles))
+        self.assertEqual(2, len(ingest.errors))
+
+    def test_fleet(self):
+        fleet, _ = ingest_file(self.path, fleet=True, chunk_size=1)
+        self.assertEqual(4, len(fleet))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+from unittest.mock import Mock
+from src.theory.patterns.abstract_factory.abstract_factory import HarleyDavidson
+from src.theory.patterns.abstract_factory.abstract_factory import Lexus
+from src.theory.patterns.abstract_factory.abstract_factory import FactoryProvider
+from src.theory.patterns.abstract_factory.index import FleetIndex
+from src.theory.patterns.abstract_factory.pool import VehiclePool
+
+
+class TestVehiclePool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = VehiclePool(max_per_brand=2)
+
+    def test_acquire_like_set_vehicle_properties(self):
+        v = self.pool.acquire("Motorcycle", "Harley Davidson", "Touring", 100)
+        self.assertTrue(type(v) is HarleyDavidson)
+        self.assertEqual(("Motor Cycle", 2, "Touring", 100), (v.vehicle_type, v.wheels, v.model, v.speed))
+
+    def test_release_resets_and_reuses(self):
+        v = self.pool.acquire("Automobile", "Lexus", "RX 350", 85)
+        self.assertTrue(self.pool.release(v))
+        self.assertEqual(("", 0), (v.model, v.speed))
+        again = self.pool.acquire("Automobile", "Lexus", "GX", 10)
+        self.assertIs(v, again)
+        self.assertEqual(("GX", 10), (again.model, again.speed))
+        self.assertEqual({'hits': 1, 'misses': 1, 'evictions': 0, 'size': 0, 'hit_rate': .5}, self.pool.stats())
+
+    def test_double_release(self):
+        v = self.pool.acquire("Automobile", "Lexus", "RX 350", 85)
+        self.assertTrue(self.pool.release(v))
+        with self.assertRaises(ValueError):
+            self.pool.release(v)
+        self.assertEqual(1, len(self.pool))
+        first = self.pool.acquire("Automobile", "Lexus")
+        second = self.pool.acquire("Automobile", "Lexus")
+        self.assertIsNot(first, second)
+        self.assertTrue(self.pool.release(first))
+
+    def test_release_keeps_index_up_to_date(self):
+        v = self.pool.acquire("Automobile", "Lexus", "RX 350", 85)
+        index = FleetIndex([v])
+        self.pool.release(v)
+        self.assertEqual([v], index.find(model="", max_speed=0))
+        self.assertEqual([], index.find(min_speed=1))
+        self.assertEqual(0, index.max(mfg="Lexus"))
+
+    def test_pools_are_per_brand(self):
+        self.pool.release(self.pool.acquire("Automobile", "Lexus"))
+        v = self.pool.acquire("Automobile", "Mercedez-Benz")
+        self.assertEqual("Mercedez-Benz", v.mfg)
+        self.assertEqual(0, self.pool.hits)
+
+    def test_max_per_brand(self):
+        vehicles = [self.pool.acquire("Automobile", "Lexus") for _ in range(3)]
+        self.assertEqual([True, True, False], [self.pool.release(v) for v in vehicles])
+        self.assertEqual(1, self.pool.evictions)
+        self.assertEqual(2, len(self.pool))
+        self.assertTrue(self.pool.release(self.pool.acquire("Motorcycle", "Honda")))
+
+    def test_unknown_brand_and_type(self):
+        with self.assertRaises(TypeError) as context:
+            self.pool.acquire("Automobile", "Honda")
+        self.assertEqual('Unknown brand specified.', context.exception.args[0])
+        with self.assertRaises(TypeError) as context:
+            self.pool.acquire("Bat mobile", "Wayne Enterprises")
+        self.assertEqual('You must specify a Motorcycle or an Automobile for type.', context.exception.args[0])
+
+    def test_uses_provider(self):
+        provider = FactoryProvider()
+        factory = Mock()
+        factory.get_vehicle.return_value = Lexus()
+        provider.override("Automobile", factory)
+        pool = VehiclePool(provider=provider)
+        self.assertIs(factory.get_vehicle.return_value, pool.acquire("Automobile", "Lexus"))
+        factory.get_vehicle.assert_called_once_with("Lexus")
+
+    def test_clear(self):
+        self.pool.release(self.pool.acquire("Automobile", "Lexus"))
+        self.pool.clear()
+        self.assertEqual({'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'hit_rate': 0.0}, self.pool.stats())
+
+    def test_bad_size(self):
+        with self.assertRaises(ValueError):
+            VehiclePool(max_per_brand=-1)
+
+    def test_threads_never_share_a_vehicle(self):
+        pool = VehiclePool(max_per_brand=4)
+        errors = []
+
+        def work():
+            for _ in range(200):
+                v = pool.acquire("Motorcycle", "Honda", "CBR125R", 1)
+                if v.speed != 1:
+                    errors.append(v.speed)
+                v.accelerate(1)
+                pool.release(v)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        self.assertEqual(1600, pool.hits + pool.misses)
+        self.assertTrue(len(pool) <= 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import unittest
+from unittest.mock import patch
+from src.theory.patterns.abstract_factory.abstract_factory import set_vehicle_properties, print_vehicle_specs
+from src.theory.patterns.abstract_factory.fleet import VehicleFleet
+from src.theory.patterns.abstract_factory.report import VehicleReportWriter, write_specs
+import src.theory.patterns.abstract_factory.fleet as fleet_module
+
+
+class CountingStream(object):
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+def make_vehicles():
+    vehicles = [set_vehicle_properties("Motorcycle", "Harley Davidson", "Touring", 100),
+                set_vehicle_properties("Motorcycle", "Honda", "CBR125R", 125),
+                set_vehicle_properties("Automobile", "Mercedez-Benz", "Mercedes-AMG C 63 Sedan", 95),
+                set_vehicle_properties("Automobile", "Lexus", "RX 350", 85),
+                set_vehicle_properties("Automobile", "Lexus", "", 0)]
+    vehicles[-1].accelerate(2.5)
+    return vehicles
+
+
+def printed(vehicles):
+    stream = io.StringIO()
+    with contextlib.redirect_stdout(stream):
+        for vehicle in vehicles:
+            print_vehicle_specs(vehicle)
+    return stream.getvalue()
+
+
+class TestVehicleReportWriter(unittest.TestCase):
+
+    def test_spec_matches(self):
+        for vehicle in make_vehicles():
+            self.assertEqual(printed([vehicle]), VehicleReportWriter.spec(vehicle))
+
+    def test_write_vehicles(self):
+        vehicles = make_vehicles()
+        stream = io.StringIO()
+        self.assertEqual(len(vehicles), write_specs(iter(vehicles), stream))
+        self.assertEqual(printed(vehicles), stream.getvalue())
+
+    def test_write_fleet(self):
+        vehicles = make_vehicles()[:-1] * 3
+        stream = io.StringIO()
+        self.assertEqual(len(vehicles), write_specs(VehicleFleet.from_vehicles(vehicles), stream))
+        self.assertEqual(printed(vehicles), stream.getvalue())
+
+    @patch.object(fleet_module, 'np', None)
+    def test_write_fleet_without_numpy(self):
+        vehicles = make_vehicles()[:-1]
+        stream = io.StringIO()
+        write_specs(VehicleFleet.from_vehicles(vehicles), stream)
+        self.assertEqual(printed(vehicles), stream.getvalue())
+
+    def test_write_fleet_float_speeds(self):
+        vehicles = make_vehicles()
+        for vehicle in vehicles:
+            vehicle.accelerate(0.5)
+        stream = io.StringIO()
+        write_specs(VehicleFleet.from_vehicles(vehicles), stream)
+        self.assertEqual(printed(vehicles), stream.getvalue())
+
+    def test_write_fleet_mixed_speeds(self):
+        vehicles = make_vehicles()
+        vehicles[1].accelerate(0.5)
+        fleet = VehicleFleet.from_vehicles(vehicles[:-1])
+        fleet.add_vehicle(vehicles[-1])
+        fleet.accelerate(0.25, [2])
+        vehicles[2].accelerate(0.25)
+        stream = io.StringIO()
+        write_specs(fleet, stream)
+        self.assertIn("Harley Davidson - Touring with a speed of 100\n", stream.getvalue())
+        self.assertEqual(printed(vehicles), stream.getvalue())
+
+    @patch.object(fleet_module, 'np', None)
+    def test_write_fleet_mixed_speeds_without_numpy(self):
+        self.test_write_fleet_mixed_speeds()
+
+    def test_write_empty_fleet(self):
+        stream = CountingStream()
+        self.assertEqual(0, write_specs(VehicleFleet(), stream))
+        self.assertEqual([], stream.writes)
+
+    def test_large_writes(self):
+        vehicles = make_vehicles() * 100
+        stream = CountingStream()
+        with VehicleReportWriter(stream, chunk_size=4096) as writer:
+            writer.write_vehicles(vehicles)
+            writer.write_vehicle(vehicles[0])
+        self.assertTrue(1 < len(stream.writes) < 20)
+        self.assertEqual(printed(vehicles + vehicles[:1]), "".join(stream.writes))
+
+    def test_defaults_to_stdout(self):
+        vehicles = make_vehicles()
+        stream = io.StringIO()
+        with contextlib.redirect_stdout(stream):
+            write_specs(vehicles)
+        self.assertEqual(printed(vehicles), stream.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
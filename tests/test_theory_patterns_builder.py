@@ -4,6 +4,8 @@ import unittest
 from unittest.mock import patch
 from unittest.mock import Mock
 from src.theory.patterns.builder.builder import CellPhone
+from src.theory.patterns.builder.builder import POWERED_COMPONENTS
+from src.theory.patterns.builder.builder import Component
 from src.theory.patterns.builder.builder import CircuitBoard
 from src.theory.patterns.builder.builder import CellularModule
 from src.theory.patterns.builder.builder import Battery
@@ -11,6 +13,7 @@ from src.theory.patterns.builder.builder import Speakers
 from src.theory.patterns.builder.builder import Screen
 from src.theory.patterns.builder.builder import ExternalShell
 from src.theory.patterns.builder.builder import Director
+from src.theory.patterns.builder.builder import DurationMemo
 from src.theory.patterns.builder.builder import MeFone12
 from src.theory.patterns.builder.builder import BirdSungT8
 
@@ -185,6 +188,14 @@ class TestCellPhone(unittest.TestCase):
         answer = CellPhone.get_active_current_draw(component)
         self.assertEqual(1.8, answer)
 
+    def test_assembly_cost_not_set(self):
+        self.assertEqual(0.0, CellPhone.get_assembly_cost(ComponentTestClassEmpty()))
+        self.assertEqual(0.0, CellPhone.get_assembly_cost(None))
+
+    def test_assembly_cost_set(self):
+        shell = ExternalShell('ABS', 160, 78, .38, '1.2 ft.', 8.10, False, True, 1.20)
+        self.assertEqual(8.10, CellPhone.get_assembly_cost(shell))
+
     def test_convert_hours_to_seconds(self):
         answer = CellPhone.convert_hours_to_seconds(1)
         self.assertEqual(60 * 60, answer)
@@ -304,6 +315,49 @@ class TestCellPhone(unittest.TestCase):
         self.cp.external_shell = TestCellPhone.build_external_shell_price(1.0, 1.0)
         self.assertEqual(3.0, self.cp.assembled_price)
 
+    def test_total_price_cached_until_component_changes(self):
+        self.cp.circuit_board = TestCellPhone.build_circuit_board_price(1.0)
+        self.cp.external_shell = TestCellPhone.build_external_shell_price(1.0, 1.0)
+        self.assertEqual(0, self.cp.price_computations)
+        self.assertEqual(2.0, self.cp.total_price)
+        self.assertEqual(3.0, self.cp.assembled_price)
+        str(self.cp)
+        self.assertEqual(1, self.cp.price_computations)
+
+        self.cp.battery = TestCellPhone.build_battery_price(2.0)
+        self.assertEqual(4.0, self.cp.total_price)
+        self.assertEqual(4.0, self.cp.total_price)
+        self.assertEqual(2, self.cp.price_computations)
+
+    def test_total_price_invalidated_by_each_component(self):
+        self.assertEqual(0, self.cp.total_price)
+        setters = [('circuit_board', TestCellPhone.build_circuit_board_price(1.0)),
+                   ('cellular_module', TestCellPhone.build_cellular_module_price(1.0)),
+                   ('battery', TestCellPhone.build_battery_price(1.0)),
+                   ('speakers', TestCellPhone.build_speakers_price(1.0)),
+                   ('screen', TestCellPhone.build_screen_price(1.0)),
+                   ('external_shell', TestCellPhone.build_external_shell_price(0.0, 1.0))]
+        for count, (name, component) in enumerate(setters, start=1):
+            setattr(self.cp, name, component)
+            self.assertEqual(float(count), self.cp.total_price)
+            self.assertEqual(count + 1, self.cp.price_computations)
+
+    def test_total_price_invalidated_by_delete(self):
+        self.cp.screen = TestCellPhone.build_screen_price(5.0)
+        self.assertEqual(5.0, self.cp.total_price)
+        del self.cp.screen
+        with self.assertRaises(AttributeError):
+            self.cp.total_price
+
+    def test_invalidate_price(self):
+        self.cp.battery = TestCellPhone.build_battery_price(1.0)
+        self.assertEqual(1.0, self.cp.total_price)
+        self.cp.battery.price = 7.0
+        self.assertEqual(1.0, self.cp.total_price)
+        self.cp.invalidate_price()
+        self.assertEqual(7.0, self.cp.total_price)
+        self.assertEqual(2, self.cp.price_computations)
+
     def test_passive_battery_duration_no_components_set(self):
         self.cp.circuit_board = TestCellPhone.build_circuit_board_passive_battery_duration(0.0)
         self.cp.cellular_module = TestCellPhone.build_cellular_module_passive_battery_duration(0.0)
@@ -665,6 +719,34 @@ class TestExternalShell(unittest.TestCase):
         self.assertEqual(expected, str(self.es))
 
 
+class TestComponentCapabilities(unittest.TestCase):
+
+    def setUp(self):
+        d = Director()
+        d.set_builder(MeFone12())
+        self.phone = d.build_phone()
+
+    def test_components_have_zero_defaults(self):
+        for cls in (CircuitBoard, CellularModule, Battery, Speakers, Screen, ExternalShell):
+            self.assertTrue(issubclass(cls, Component))
+        self.assertEqual((0, 0.0, 0.0, 0.0), (Component.price, Component.active_draw, Component.passive_draw,
+                                              Component.assembly_cost))
+
+    def test_missing_numbers_read_as_zero(self):
+        battery = self.phone.battery
+        shell = self.phone.external_shell
+        self.assertEqual((0.0, 0.0, 0.0), (battery.active_draw, battery.passive_draw, battery.assembly_cost))
+        self.assertEqual((0.0, 0.0), (shell.active_draw, shell.passive_draw))
+        self.assertEqual(0.0, self.phone.screen.assembly_cost)
+
+    def test_only_own_numbers_are_settable(self):
+        battery = self.phone.battery
+        with self.assertRaises(AttributeError):
+            battery.active_draw = 1.0
+        self.phone.speakers.active_draw = .25
+        self.assertEqual(.25, self.phone.speakers.active_draw)
+
+
 class MockBuilder(object):
     mfg = "test_mfg"
     model = "test_model"
@@ -703,6 +785,188 @@ class TestDirector(unittest.TestCase):
         self.assertEqual("test_screen", phone.screen)
         self.assertEqual("test_external_shell", phone.external_shell)
 
+    def test_build_phones_shares_components(self):
+        d = Director()
+        d.set_builder(MeFone12())
+        phones = d.build_phones(3)
+        self.assertEqual(3, len(phones))
+        self.assertEqual(3, len(set(id(phone) for phone in phones)))
+        for phone in phones[1:]:
+            self.assertEqual("NBD", phone.mfg)
+            self.assertEqual("MeFone12", phone.model)
+            self.assertIs(phones[0].circuit_board, phone.circuit_board)
+            self.assertIs(phones[0].external_shell, phone.external_shell)
+            self.assertEqual(phones[0].brochure, phone.brochure)
+
+    def test_build_phones_overrides(self):
+        d = Director()
+        d.set_builder(MeFone12())
+        bigger_battery = Battery("M-005", "Lion", 12, 500, 9.99)
+
+        def overrides(index):
+            if index == 1:
+                return {'serial_number': 'SN-1', 'battery': bigger_battery}
+            return {'serial_number': 'SN-{0}'.format(index)}
+
+        phones = d.build_phones(3, overrides)
+        self.assertEqual(['SN-0', 'SN-1', 'SN-2'], [phone.serial_number for phone in phones])
+        self.assertIs(bigger_battery, phones[1].battery)
+        self.assertIsNot(bigger_battery, phones[2].battery)
+        self.assertAlmostEqual(phones[0].total_price - 5.38 + 9.99, phones[1].total_price)
+        self.assertNotEqual(phones[0].active_battery_duration, phones[1].active_battery_duration)
+
+    def test_build_phones_none(self):
+        d = Director()
+        d.set_builder(MockBuilder())
+        self.assertEqual([], d.build_phones(0))
+
+
+class TestDurationMemo(unittest.TestCase):
+
+    def setUp(self):
+        self.memo = DurationMemo(max_size=2)
+
+    def test_duration(self):
+        self.assertEqual(CellPhone.convert_seconds(round(8 * 60 * 60 / (.1 + .2))), self.memo.duration((8, .1, .2)))
+
+    def test_hits_and_misses(self):
+        first = self.memo.duration((8, .1, .2))
+        self.assertIs(first, self.memo.duration((8, .1, .2)))
+        self.memo.duration((8, .2, .1))
+        self.assertEqual({'hits': 1, 'misses': 2, 'evictions': 0, 'size': 2, 'hit_rate': 1 / 3}, self.memo.stats())
+
+    def test_least_recently_used_evicted(self):
+        self.memo.duration((8, .1))
+        self.memo.duration((8, .2))
+        self.memo.duration((8, .1))
+        self.memo.duration((8, .3))
+        self.assertEqual(1, self.memo.evictions)
+        self.memo.duration((8, .1))
+        self.assertEqual(2, self.memo.hits)
+        self.memo.duration((8, .2))
+        self.assertEqual(4, self.memo.misses)
+
+    def test_errors_not_cached(self):
+        with self.assertRaises(ZeroDivisionError):
+            self.memo.duration((8, 0.0))
+        self.assertEqual(0, len(self.memo))
+
+    def test_clear(self):
+        self.memo.duration((8, .1))
+        self.memo.duration((8, .1))
+        self.memo.clear()
+        self.assertEqual({'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'hit_rate': 0.0}, self.memo.stats())
+
+    def test_bad_size(self):
+        with self.assertRaises(ValueError):
+            DurationMemo(max_size=0)
+
+
+class TestBatteryDurationMemo(unittest.TestCase):
+
+    def setUp(self):
+        d = Director()
+        d.set_builder(MeFone12())
+        self.phone = d.build_phone()
+        self.memo = DurationMemo()
+        patcher = patch.object(CellPhone, 'duration_memo', self.memo)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeated_reads_hit(self):
+        passive = self.phone.passive_battery_duration
+        active = self.phone.active_battery_duration
+        with patch.object(CellPhone, 'convert_seconds') as convert_seconds:
+            self.assertIs(passive, self.phone.passive_battery_duration)
+            self.assertIs(active, self.phone.active_battery_duration)
+            convert_seconds.assert_not_called()
+        self.assertEqual((2, 2), (self.memo.hits, self.memo.misses))
+
+    def test_phones_share_durations(self):
+        d = Director()
+        d.set_builder(MeFone12())
+        first, second = d.build_phones(2)
+        self.assertEqual(first.passive_battery_duration, second.passive_battery_duration)
+        self.assertEqual(first.active_battery_duration, second.active_battery_duration)
+        self.assertEqual((2, 2), (self.memo.hits, self.memo.misses))
+        second.battery = Battery("DNN0", "Lion", 7.8, 500, 10.12)
+        self.assertNotEqual(first.passive_battery_duration, second.passive_battery_duration)
+        self.assertEqual(3, self.memo.misses)
+
+    def test_each_powered_component_counts(self):
+        for name in POWERED_COMPONENTS:
+            durations = (self.phone.passive_battery_duration, self.phone.active_battery_duration)
+            component = getattr(self.phone, name)
+            setattr(self.phone, name, None)
+            self.assertNotEqual(durations, (self.phone.passive_battery_duration, self.phone.active_battery_duration),
+                                name)
+            setattr(self.phone, name, component)
+
+    def test_edited_component_not_stale(self):
+        passive = self.phone.passive_battery_duration
+        active = self.phone.active_battery_duration
+        self.phone.battery.storage_capacity *= 2
+        self.assertNotEqual(passive, self.phone.passive_battery_duration)
+        self.assertNotEqual(active, self.phone.active_battery_duration)
+        active = self.phone.active_battery_duration
+        self.phone.screen.active_draw *= 2
+        self.assertNotEqual(active, self.phone.active_battery_duration)
+
+    def test_external_shell_ignored(self):
+        passive = self.phone.passive_battery_duration
+        self.phone.external_shell = None
+        self.assertIs(passive, self.phone.passive_battery_duration)
+
+
+class TestCellPhoneClone(unittest.TestCase):
+
+    def test_clone(self):
+        d = Director()
+        d.set_builder(BirdSungT8())
+        phone = d.build_phone()
+        phone.serial_number = 'SN-0'
+        price = phone.total_price
+        clone = phone.clone()
+        self.assertIsNot(phone, clone)
+        self.assertEqual('SN-0', clone.serial_number)
+        self.assertEqual(price, clone.total_price)
+        self.assertEqual(0, clone.price_computations)
+        self.assertEqual(str(phone), str(clone))
+
+        clone.serial_number = 'SN-1'
+        clone.screen = None
+        self.assertEqual('SN-0', phone.serial_number)
+        self.assertIsNotNone(phone.screen)
+        self.assertEqual(price, phone.total_price)
+        self.assertAlmostEqual(price - 55.69, clone.total_price)
+
+    def test_clone_with_deleted_field(self):
+        d = Director()
+        d.set_builder(MeFone12())
+        phone = d.build_phone()
+        del phone.serial_number
+        clone = phone.clone()
+        self.assertTrue(not hasattr(clone, "serial_number"))
+        self.assertEqual(phone.brochure, clone.brochure)
+
+    def test_compact_representation(self):
+        d = Director()
+        d.set_builder(MeFone12())
+        phone = d.build_phone()
+        for thing in [phone] + [getattr(phone, slot) for slot in ('circuit_board', 'cellular_module', 'battery',
+                                                                    'speakers', 'screen', 'external_shell')]:
+            self.assertFalse(hasattr(thing, '__dict__'))
+        with self.assertRaises(AttributeError):
+            phone.color = 'red'
+
+    def test_serial_number(self):
+        phone = CellPhone()
+        self.assertIsNone(phone.serial_number)
+        phone.serial_number = 'SN-7'
+        self.assertEqual('SN-7', phone.serial_number)
+        del phone.serial_number
+        self.assertTrue(not hasattr(phone, "serial_number"))
+
 
 class TestMeFone12(unittest.TestCase):
 
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+import unittest
+from src.theory.patterns.builder.builder import BuilderInterface
+from src.theory.patterns.builder.builder import Director
+from src.theory.patterns.builder.builder import MeFone12
+from src.theory.patterns.builder.async_builder import AsyncBuilderInterface, AsyncDirector
+
+LOOKUP_DELAY = .05
+
+
+class FakeInventory(object):
+    """
+    In process stand in for the inventory service. Every lookup takes LOOKUP_DELAY
+    seconds and hands back the part made by the recipe.
+    """
+
+    def __init__(self, delay=LOOKUP_DELAY):
+        self.delay = delay
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self.lookups = 0
+
+    def lookup(self, make_part):
+        self.lookups += 1
+        time.sleep(self.delay)
+        return make_part()
+
+    async def async_lookup(self, make_part):
+        self.lookups += 1
+        self.in_flight += 1
+        self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return make_part()
+
+
+class InventoryMeFone12(BuilderInterface):
+    """
+    Sync builder that has to look every part up in the inventory.
+    """
+
+    def __init__(self, inventory):
+        self.inventory = inventory
+        self.recipe = MeFone12()
+        self.mfg = self.recipe.mfg
+        self.model = self.recipe.model
+
+    def build_circuit_board(self):
+        return self.inventory.lookup(self.recipe.build_circuit_board)
+
+    def build_cellular_module(self):
+        return self.inventory.lookup(self.recipe.build_cellular_module)
+
+    def build_battery(self):
+        return self.inventory.lookup(self.recipe.build_battery)
+
+    def build_speakers(self):
+        return self.inventory.lookup(self.recipe.build_speakers)
+
+    def build_screen(self):
+        return self.inventory.lookup(self.recipe.build_screen)
+
+    def build_external_shell(self):
+        return self.inventory.lookup(self.recipe.build_external_shell)
+
+
+class AsyncInventoryMeFone12(AsyncBuilderInterface):
+    """
+    Async builder that looks every part up in the inventory.
+    """
+
+    def __init__(self, inventory):
+        self.inventory = inventory
+        self.recipe = MeFone12()
+        self.mfg = self.recipe.mfg
+        self.model = self.recipe.model
+
+    async def build_circuit_board(self):
+        return await self.inventory.async_lookup(self.recipe.build_circuit_board)
+
+    async def build_cellular_module(self):
+        return await self.inventory.async_lookup(self.recipe.build_cellular_module)
+
+    async def build_battery(self):
+        return await self.inventory.async_lookup(self.recipe.build_battery)
+
+    async def build_speakers(self):
+        return await self.inventory.async_lookup(self.recipe.build_speakers)
+
+    async def build_screen(self):
+        return await self.inventory.async_lookup(self.recipe.build_screen)
+
+    async def build_external_shell(self):
+        return await self.inventory.async_lookup(self.recipe.build_external_shell)
+
+
+class SlowScreenMeFone12(AsyncInventoryMeFone12):
+
+    async def build_screen(self):
+        await asyncio.sleep(1)
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestAsyncBuilderInterface(unittest.TestCase):
+
+    def test_steps_return_none(self):
+        builder = AsyncBuilderInterface()
+        for step in ('circuit_board', 'cellular_module', 'battery', 'speakers', 'screen', 'external_shell'):
+            self.assertIsNone(run(getattr(builder, 'build_' + step)()))
+
+
+class TestAsyncDirector(unittest.TestCase):
+
+    def test_build_phone_matches_sync(self):
+        d = Director()
+        d.set_builder(MeFone12())
+        ad = AsyncDirector()
+        ad.set_builder(AsyncInventoryMeFone12(FakeInventory(0)))
+        phone = run(ad.build_phone())
+        self.assertEqual(d.build_phone().brochure, phone.brochure)
+        self.assertEqual("NBD", phone.mfg)
+
+    def test_lower_latency_than_sync(self):
+        inventory = FakeInventory()
+        d = Director()
+        d.set_builder(InventoryMeFone12(inventory))
+        start = time.perf_counter()
+        sync_phone = d.build_phone()
+        sync_latency = time.perf_counter() - start
+
+        ad = AsyncDirector()
+        ad.set_builder(AsyncInventoryMeFone12(inventory))
+        start = time.perf_counter()
+        async_phone = run(ad.build_phone())
+        async_latency = time.perf_counter() - start
+
+        self.assertEqual(sync_phone.brochure, async_phone.brochure)
+        self.assertEqual(6, inventory.most_in_flight)
+        self.assertTrue(sync_latency >= 6 * LOOKUP_DELAY)
+        self.assertTrue(async_latency < sync_latency / 2)
+
+    def test_step_timeout(self):
+        ad = AsyncDirector(step_timeout=.05)
+        ad.set_builder(SlowScreenMeFone12(FakeInventory(0)))
+        with self.assertRaises(asyncio.TimeoutError):
+            run(ad.build_phone())
+
+    def test_build_phones_capped(self):
+        inventory = FakeInventory(.01)
+        ad = AsyncDirector(max_concurrent_phones=2)
+        builders = [AsyncInventoryMeFone12(inventory) for _ in range(6)]
+        phones = ad.run_build_phones(builders)
+        self.assertEqual(6, len(phones))
+        self.assertEqual(36, inventory.lookups)
+        self.assertEqual(12, inventory.most_in_flight)
+
+    def test_build_phones_uncapped(self):
+        inventory = FakeInventory(.01)
+        phones = AsyncDirector().run_build_phones([AsyncInventoryMeFone12(inventory) for _ in range(5)])
+        self.assertEqual(["MeFone12"] * 5, [phone.model for phone in phones])
+        self.assertEqual(30, inventory.most_in_flight)
+
+
+if __name__ == "__main__":
+    unittest.main()
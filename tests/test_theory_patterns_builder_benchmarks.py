@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+from src.theory.patterns.builder.benchmarks import bench_build_phones
+from src.theory.patterns.builder.benchmarks import bench_interning, bench_phone_size, deep_sizeof
+from src.theory.patterns.builder.benchmarks import bench_render, bench_parallel, bench_capabilities
+from src.theory.patterns.builder.benchmarks import legacy_active_current_draw, part_fields, DictPart, DictPhone
+from src.theory.patterns.builder.builder import Director, MeFone12
+
+
+class TestBenchmarkHelpers(unittest.TestCase):
+
+    def test_deep_sizeof(self):
+        class WithDict(object):
+            pass
+        self.assertTrue(deep_sizeof(WithDict()) > deep_sizeof(object()))
+
+class TestBenchmarks(unittest.TestCase):
+    """
+    Only checks that the benchmarks run and report what they should, the numbers
+    themselves depend on the machine.
+    """
+
+    def test_bench_build_phones(self):
+        results = bench_build_phones(50)
+        self.assertEqual(50, results['count'])
+        self.assertTrue(results['build_phones_bytes_per_unit'] < results['build_phone_bytes_per_unit'])
+        self.assertTrue(results['build_phone_us_per_unit'] > 0)
+
+    def test_bench_interning(self):
+        results = bench_interning(50)
+        self.assertTrue(results['interned_bytes_per_phone'] < results['plain_bytes_per_phone'])
+        self.assertEqual(6, results['interner_misses'])
+        self.assertEqual(6, results['interner_size'])
+
+    def test_bench_phone_size(self):
+        results = bench_phone_size(50)
+        self.assertEqual(50, results['count'])
+        self.assertTrue(results['phones_per_second'] > 0)
+        self.assertTrue(results['getsizeof_phone'] > 0)
+        self.assertTrue(results['getsizeof_components'] > 0)
+        self.assertTrue(results['dict_phones_per_second'] > 0)
+        self.assertTrue(results['dict_getsizeof_phone'] > results['getsizeof_phone'])
+        self.assertTrue(results['dict_getsizeof_components'] > results['getsizeof_components'])
+
+    def test_dict_baseline(self):
+        director = Director()
+        director.set_builder(MeFone12())
+        phone = director.build_phone()
+        fields = part_fields(phone.battery)
+        self.assertEqual(phone.battery.storage_capacity, fields['storage_capacity'])
+        part = DictPart(**fields)
+        self.assertEqual(fields, vars(part))
+        self.assertFalse(hasattr(phone.battery, '__dict__'))
+        self.assertEqual(16, len(vars(DictPhone("Me", "Fone"))))
+
+    def test_bench_render(self):
+        results = bench_render(50)
+        self.assertEqual(100, results['properties_writes'])
+        self.assertTrue(results['write_catalog_writes'] < results['properties_writes'])
+
+    def test_bench_parallel(self):
+        results = bench_parallel(100, [1, 2])
+        self.assertEqual(100, results['count'])
+        for key in ('serial_phones_per_second', '1_workers_phones_per_second', '2_workers_speedup'):
+            self.assertTrue(results[key] > 0)
+
+    def test_bench_capabilities(self):
+        results = bench_capabilities(50)
+        self.assertEqual(300, results['reads'])
+        self.assertEqual(100, results['missing_reads'])
+        self.assertTrue(results['same_totals'])
+        self.assertTrue(results['capability_ns_per_read'] > 0)
+
+    def test_legacy_active_current_draw(self):
+        self.assertEqual(0.0, legacy_active_current_draw(object()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+from src.theory.patterns.builder.builder import Battery
+from src.theory.patterns.builder.builder import Screen
+from src.theory.patterns.builder.builder import Speakers
+from src.theory.patterns.builder.builder import ExternalShell
+from src.theory.patterns.builder.builder import Director
+from src.theory.patterns.builder.builder import MeFone12
+from src.theory.patterns.builder.builder import BirdSungT8
+from src.theory.patterns.builder.bom import BillOfMaterials
+
+
+class TestBillOfMaterials(unittest.TestCase):
+
+    def setUp(self):
+        d = Director()
+        d.set_builder(MeFone12())
+        self.phone = d.build_phone()
+        self.bom = BillOfMaterials(self.phone)
+
+    def assert_matches_phone(self, bom, phone):
+        self.assertEqual(phone.total_price, bom.total_price)
+        self.assertEqual(phone.assembled_price, bom.assembled_price)
+        self.assertEqual(phone.calculate_msrp(phone.total_price), bom.msrp)
+        self.assertEqual(phone.passive_battery_duration, bom.passive_battery_duration)
+        self.assertEqual(phone.active_battery_duration, bom.active_battery_duration)
+
+    def test_init_matches_phone(self):
+        self.assertIs(self.phone, self.bom.phone)
+        self.assert_matches_phone(self.bom, self.phone)
+
+    def test_draw_totals(self):
+        self.assertAlmostEqual(.127 + .118 + .2 + .68, self.bom.active_draw)
+        self.assertAlmostEqual(.018 + .006 + 0 + .3, self.bom.passive_draw)
+
+    def test_swap_battery(self):
+        battery = Battery("DNN0", "Lion", 7.8, 500, 10.12)
+        result = self.bom.swap('battery', battery)
+        self.assertIs(battery, self.phone.battery)
+        self.assertEqual((self.bom.msrp, self.bom.passive_battery_duration, self.bom.active_battery_duration),
+                         result)
+        self.assert_matches_phone(self.bom, self.phone)
+
+    def test_swap_every_slot(self):
+        other = BirdSungT8()
+        for slot in ('circuit_board', 'cellular_module', 'battery', 'speakers', 'screen', 'external_shell'):
+            self.bom.swap(slot, getattr(other, 'build_' + slot)())
+            self.assert_matches_phone(self.bom, self.phone)
+        d = Director()
+        d.set_builder(other)
+        self.assert_matches_phone(self.bom, d.build_phone())
+
+    def test_try_swap_leaves_phone_alone(self):
+        original = self.phone.screen
+        before = (self.bom.msrp, self.bom.passive_battery_duration, self.bom.active_battery_duration)
+        screen = Screen(154.00, 72.4, 14, 60, 0.1, 0.71, 55.69)
+        result = self.bom.try_swap('screen', screen)
+        self.assertIs(original, self.phone.screen)
+        self.assertEqual(before, (self.bom.msrp, self.bom.passive_battery_duration, self.bom.active_battery_duration))
+
+        self.phone.screen = screen
+        self.assertEqual((self.phone.calculate_msrp(self.phone.total_price), self.phone.passive_battery_duration,
+                          self.phone.active_battery_duration), result)
+
+    def test_swap_speakers_and_shell(self):
+        self.bom.swap('speakers', Speakers("SpiffySoundTek", "28 - 22kHz", 4, 0.05, .3, 7.00))
+        self.bom.swap('external_shell', ExternalShell('ABS', 160, 78, .38, '1.2 ft.', 8.10, False, True, 1.20))
+        self.assert_matches_phone(self.bom, self.phone)
+
+    def test_swap_unknown_slot(self):
+        with self.assertRaises(ValueError) as context:
+            self.bom.swap('antenna', object())
+        self.assertEqual('Unknown component slot: antenna', context.exception.args[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
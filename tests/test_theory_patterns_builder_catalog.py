@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import random
+import unittest
+from unittest.mock import patch
+from src.theory.patterns.builder.builder import CellPhone
+from src.theory.patterns.builder.builder import CircuitBoard
+from src.theory.patterns.builder.builder import CellularModule
+from src.theory.patterns.builder.builder import Battery
+from src.theory.patterns.builder.builder import Speakers
+from src.theory.patterns.builder.builder import Screen
+from src.theory.patterns.builder.builder import ExternalShell
+from src.theory.patterns.builder.builder import Director
+from src.theory.patterns.builder.builder import MeFone12
+from src.theory.patterns.builder.builder import BirdSungT8
+from src.theory.patterns.builder import catalog
+from src.theory.patterns.builder.catalog import PhoneCatalog
+
+
+def build_random_phone(rand):
+    phone = CellPhone()
+    phone.mfg = "mfg_{0}".format(rand.randint(0, 9))
+    phone.model = "model_{0}".format(rand.randint(0, 99))
+    phone.circuit_board = CircuitBoard('b', '1', rand.uniform(.05, .3), rand.uniform(.001, .03),
+                                       round(rand.uniform(20, 100), 2))
+    phone.cellular_module = CellularModule('m', 'x', ['LTE'], rand.uniform(.05, .3), rand.uniform(.001, .03),
+                                           round(rand.uniform(20, 100), 2))
+    phone.battery = Battery('f', 'Lion', rand.choice([5, 7.8, 8, 9.25]), 300, round(rand.uniform(2, 12), 2))
+    phone.speakers = Speakers('s', '20 - 20kHz', 4, rand.choice([0, .01]), rand.uniform(.1, .3),
+                              round(rand.uniform(1, 9), 2))
+    phone.screen = Screen(150, 75, 15, 60, rand.uniform(.05, .4), rand.uniform(.3, .9),
+                          round(rand.uniform(30, 90), 2))
+    phone.external_shell = ExternalShell('ABS', 160, 78, .4, '1 ft.', round(rand.uniform(1, 15), 2), False, False,
+                                         round(rand.uniform(1, 9), 2))
+    return phone
+
+
+class CatalogAssertions(object):
+
+    def assert_catalog_matches(self, phones):
+        pc = PhoneCatalog.from_phones(phones)
+        self.assertEqual(len(phones), len(pc))
+        self.assertEqual([phone.mfg for phone in phones], pc.mfg)
+        self.assertEqual([phone.model for phone in phones], pc.model)
+        self.assertEqual([phone.total_price for phone in phones], list(pc.total_prices()))
+        self.assertEqual([phone.assembled_price for phone in phones], list(pc.assembled_prices()))
+        self.assertEqual([phone.calculate_msrp(phone.total_price) for phone in phones], list(pc.msrps()))
+        self.assertEqual([phone.passive_battery_duration for phone in phones], pc.passive_battery_durations())
+        self.assertEqual([phone.active_battery_duration for phone in phones], pc.active_battery_durations())
+
+    def build_phones(self):
+        d = Director()
+        phones = []
+        for builder in (MeFone12(), BirdSungT8()):
+            d.set_builder(builder)
+            phones.append(d.build_phone())
+        rand = random.Random(1234)
+        phones.extend(build_random_phone(rand) for _ in range(500))
+        return phones
+
+    def test_matches_cell_phone(self):
+        self.assert_catalog_matches(self.build_phones())
+
+    def test_empty_catalog(self):
+        pc = PhoneCatalog()
+        self.assertEqual(0, len(pc))
+        self.assertEqual([], list(pc.msrps()))
+        self.assertEqual([], pc.active_battery_durations())
+
+    def test_add_returns_row(self):
+        pc = PhoneCatalog()
+        mf = MeFone12()
+        row = pc.add(mf.mfg, mf.model, mf.build_circuit_board(), mf.build_cellular_module(), mf.build_battery(),
+                     mf.build_speakers(), mf.build_screen(), mf.build_external_shell())
+        self.assertEqual(0, row)
+        self.assertEqual(1, pc.add_phone(build_random_phone(random.Random(1))))
+
+    def test_zero_draw(self):
+        phone = build_random_phone(random.Random(2))
+        phone.circuit_board = None
+        phone.cellular_module = None
+        phone.speakers = None
+        phone.screen = None
+        pc = PhoneCatalog.from_phones([phone])
+        with self.assertRaises(ZeroDivisionError):
+            pc.passive_battery_durations()
+
+
+@unittest.skipIf(catalog.np is None, "NumPy is not installed")
+class TestPhoneCatalogNumPy(CatalogAssertions, unittest.TestCase):
+    pass
+
+
+@patch('src.theory.patterns.builder.catalog.np', None)
+class TestPhoneCatalogPurePython(CatalogAssertions, unittest.TestCase):
+    pass
+
+
+if __name__ == "__main__":
+    unittest.main()
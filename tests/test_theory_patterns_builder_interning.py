@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+from src.theory.patterns.builder.builder import CircuitBoard
+from src.theory.patterns.builder.builder import CellularModule
+from src.theory.patterns.builder.builder import Battery
+from src.theory.patterns.builder.builder import Speakers
+from src.theory.patterns.builder.builder import Director
+from src.theory.patterns.builder.builder import MeFone12
+from src.theory.patterns.builder.builder import BirdSungT8
+from src.theory.patterns.builder.interning import freeze, component_signature
+from src.theory.patterns.builder.interning import ComponentInterner, InterningBuilder
+
+
+class TestFreeze(unittest.TestCase):
+
+    def test_freeze(self):
+        self.assertEqual((int, 1), freeze(1))
+        self.assertEqual((list, ((str, '3G'), (str, 'LTE'))), freeze(['3G', 'LTE']))
+        self.assertEqual(hash(freeze({'a': [1]})), hash(freeze({'a': [1]})))
+
+    def test_component_signature(self):
+        first = CellularModule('Kellog', 'ARNIL-3', ['3G', '4G'], .118, .006, 75.33)
+        second = CellularModule('Kellog', 'ARNIL-3', ['3G', '4G'], .118, .006, 75.33)
+        third = CellularModule('Kellog', 'ARNIL-3', ['3G'], .118, .006, 75.33)
+        self.assertEqual(component_signature(first), component_signature(second))
+        self.assertNotEqual(component_signature(first), component_signature(third))
+
+    def test_int_and_float_are_different_specs(self):
+        whole = Speakers("Lanteek", "35 - 21 kHz", 4, 0, .2, 5.00)
+        floating = Speakers("Lanteek", "35 - 21 kHz", 4, 0.0, .2, 5.00)
+        self.assertNotEqual(component_signature(whole), component_signature(floating))
+
+
+class TestComponentInterner(unittest.TestCase):
+
+    def test_intern(self):
+        interner = ComponentInterner()
+        first = Battery("M-004", "NiCAD", 8, 250, 5.38)
+        second = Battery("M-004", "NiCAD", 8, 250, 5.38)
+        self.assertIs(first, interner.intern(first))
+        self.assertIs(first, interner.intern(second))
+        self.assertEqual(1, interner.hits)
+        self.assertEqual(1, interner.misses)
+        self.assertEqual(1, len(interner))
+        self.assertEqual(.5, interner.hit_rate)
+
+    def test_get(self):
+        interner = ComponentInterner()
+        board = interner.get(CircuitBoard, 'MRL-0032', '1.3.7a', .127, .018, 98.79)
+        self.assertTrue(type(board) is CircuitBoard)
+        self.assertIs(board, interner.get(CircuitBoard, 'MRL-0032', '1.3.7a', .127, .018, 98.79))
+        self.assertIsNot(board, interner.get(CircuitBoard, 'MRL-0032', '1.3.7b', .127, .018, 98.79))
+
+    def test_get_and_intern_share_one_instance(self):
+        interner = ComponentInterner()
+        battery = interner.get(Battery, 'M-004', 'NiCAD', 8, 250, 5.38)
+        self.assertIs(battery, interner.intern(Battery('M-004', 'NiCAD', 8, 250, 5.38)))
+        board = interner.intern(CircuitBoard('MRL-0032', '1.3.7a', .127, .018, 98.79))
+        self.assertIs(board, interner.get(CircuitBoard, 'MRL-0032', '1.3.7a', .127, .018, 98.79))
+        self.assertIs(board, interner.get(CircuitBoard, 'MRL-0032', '1.3.7a', .127, .018, 98.79))
+        self.assertEqual({'hits': 3, 'misses': 2, 'evictions': 0, 'size': 2, 'hit_rate': .6}, interner.stats())
+
+    def test_eviction(self):
+        interner = ComponentInterner(max_size=2)
+        first = interner.get(Battery, "A", "NiCAD", 8, 250, 1)
+        interner.get(Battery, "B", "NiCAD", 8, 250, 1)
+        interner.get(Battery, "A", "NiCAD", 8, 250, 1)
+        interner.get(Battery, "C", "NiCAD", 8, 250, 1)
+        self.assertEqual(1, interner.evictions)
+        self.assertEqual(2, len(interner))
+        self.assertIs(first, interner.get(Battery, "A", "NiCAD", 8, 250, 1))
+        self.assertEqual({'hits': 2, 'misses': 3, 'evictions': 1, 'size': 2, 'hit_rate': .4}, interner.stats())
+
+    def test_bad_size(self):
+        with self.assertRaises(ValueError) as context:
+            ComponentInterner(max_size=0)
+        self.assertEqual('max_size must be at least 1.', context.exception.args[0])
+
+    def test_clear(self):
+        interner = ComponentInterner()
+        interner.get(Battery, "A", "NiCAD", 8, 250, 1)
+        interner.clear()
+        self.assertEqual({'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'hit_rate': 0.0}, interner.stats())
+
+    def test_threads_share_one_instance(self):
+        interner = ComponentInterner()
+        results = []
+
+        def worker():
+            for _ in range(200):
+                results.append(interner.get(Battery, "A", "NiCAD", 8, 250, 1))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, len(set(id(result) for result in results)))
+        self.assertEqual(800, interner.hits + interner.misses)
+
+
+class TestInterningBuilder(unittest.TestCase):
+
+    def test_phones_share_components(self):
+        interner = ComponentInterner()
+        d = Director()
+        d.set_builder(InterningBuilder(MeFone12(), interner))
+        first = d.build_phone()
+        second = d.build_phone()
+        self.assertEqual("NBD", second.mfg)
+        self.assertEqual("MeFone12", second.model)
+        for slot in ('circuit_board', 'cellular_module', 'battery', 'speakers', 'screen', 'external_shell'):
+            self.assertIs(getattr(first, slot), getattr(second, slot))
+        self.assertEqual(6, interner.misses)
+        self.assertEqual(6, interner.hits)
+
+    def test_output_unchanged(self):
+        plain = Director()
+        plain.set_builder(BirdSungT8())
+        interned = Director()
+        interned.set_builder(InterningBuilder(BirdSungT8()))
+        self.assertEqual(str(plain.build_phone()), str(interned.build_phone()))
+        self.assertEqual(plain.build_phone().brochure, interned.build_phone().brochure)
+
+
+if __name__ == "__main__":
+    unittest.main()
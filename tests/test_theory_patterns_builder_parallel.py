@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+from src.theory.patterns.builder.builder import Battery
+from src.theory.patterns.builder.builder import Director
+from src.theory.patterns.builder.builder import MeFone12
+from src.theory.patterns.builder.builder import BirdSungT8
+from src.theory.patterns.builder.parallel import ParallelDirector, build_chunk, summarize_phone
+
+
+class SweepBuilder(MeFone12):
+    """
+    MeFone12 with a battery size that changes, like a parameter sweep would use.
+    Has to live at module level so it can be pickled for the worker processes.
+    """
+
+    def __init__(self, capacity):
+        super(SweepBuilder, self).__init__()
+        self.capacity = capacity
+
+    def build_battery(self):
+        return Battery("M-004", "NiCAD", self.capacity, 250, 5.38)
+
+
+def serial_summaries(builders):
+    d = Director()
+    summaries = []
+    for builder in builders:
+        d.set_builder(builder)
+        summaries.append(summarize_phone(d.build_phone()))
+    return summaries
+
+
+class TestParallelHelpers(unittest.TestCase):
+
+    def test_summarize_phone(self):
+        d = Director()
+        d.set_builder(BirdSungT8())
+        phone = d.build_phone()
+        self.assertEqual(("Birdsung", "T8", phone.total_price, phone.assembled_price,
+                          phone.calculate_msrp(phone.total_price), phone.passive_battery_duration,
+                          phone.active_battery_duration), summarize_phone(phone))
+
+    def test_build_chunk(self):
+        phones = build_chunk([MeFone12(), BirdSungT8()])
+        self.assertEqual(["MeFone12", "T8"], [phone.model for phone in phones])
+        self.assertEqual(["MeFone12", "T8"], [summary[1] for summary in build_chunk([MeFone12(), BirdSungT8()],
+                                                                                      summarize_phone)])
+
+    def test_chunks(self):
+        pd = ParallelDirector(max_workers=2)
+        self.assertEqual([[1, 2], [3, 4], [5, 6], [7, 8], [9]], pd.chunks(list(range(1, 10))))
+        self.assertEqual([[1, 2, 3], [4]], ParallelDirector(chunk_size=3).chunks([1, 2, 3, 4]))
+        self.assertEqual([], pd.chunks([]))
+
+    def test_bad_executor(self):
+        with self.assertRaises(ValueError) as context:
+            ParallelDirector(executor='gpu')
+        self.assertEqual('executor must be one of: process, thread', context.exception.args[0])
+
+
+class TestParallelDirector(unittest.TestCase):
+
+    def setUp(self):
+        self.builders = [SweepBuilder(capacity) for capacity in range(5, 45)] + [BirdSungT8()]
+
+    def test_process_pool_in_order(self):
+        pd = ParallelDirector(max_workers=2)
+        self.assertEqual(serial_summaries(self.builders), pd.build_phones(self.builders, summarize_phone))
+
+    def test_process_pool_full_phones(self):
+        pd = ParallelDirector(max_workers=2, chunk_size=7)
+        phones = pd.build_phones(self.builders)
+        d = Director()
+        for builder, phone in zip(self.builders, phones):
+            d.set_builder(builder)
+            self.assertEqual(d.build_phone().brochure, phone.brochure)
+
+    def test_thread_pool_as_completed(self):
+        pd = ParallelDirector(max_workers=3, executor='thread', chunk_size=4)
+        results = list(pd.build(self.builders, summarize_phone, ordered=False))
+        self.assertEqual(len(self.builders), len(results))
+        self.assertEqual(serial_summaries(self.builders), [summary for _, summary in sorted(results)])
+
+    def test_nothing_to_build(self):
+        self.assertEqual([], ParallelDirector(max_workers=1, executor='thread').build_phones([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
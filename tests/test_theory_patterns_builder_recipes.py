@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from src.theory.patterns.builder.builder import BuilderInterface
+from src.theory.patterns.builder.builder import Director
+from src.theory.patterns.builder.builder import MeFone12
+from src.theory.patterns.builder.recipes import RecipeCache, compile_recipe, parse_recipe
+from src.theory.patterns.builder import recipes
+
+ME_FONE_12 = {
+    "mfg": "NBD",
+    "model": "MeFone12",
+    "circuit_board": ["MRL-0032", "1.3.7a", .127, .018, 98.79],
+    "cellular_module": {"manufacturer": "Kellog", "make": "ARNIL-3", "bands": ["3G", "4G", "LTE"],
+                        "active_current_draw": .118, "passive_current_draw": .006, "price": 75.33},
+    "battery": ["M-004", "NiCAD", 8, 250, 5.38],
+    "speakers": ["Lanteek", "35 - 21 kHz", 4, 0, .2, 5.00],
+    "screen": [158.4, 78.1, 17.78, 60, 0.3, 0.68, 65.88],
+    "external_shell": ["Aluminum", 158.9, 85.1, .4, "3 ft.", 12.10, False, False, 6.12],
+}
+
+ME_FONE_12_TOML = """
+mfg = "NBD"
+model = "MeFone12"
+circuit_board = ["MRL-0032", "1.3.7a", 0.127, 0.018, 98.79]
+battery = ["M-004", "NiCAD", 8, 250, 5.38]
+speakers = ["Lanteek", "35 - 21 kHz", 4, 0, 0.2, 5.00]
+screen = [158.4, 78.1, 17.78, 60, 0.3, 0.68, 65.88]
+external_shell = ["Aluminum", 158.9, 85.1, 0.4, "3 ft.", 12.10, false, false, 6.12]
+
+[cellular_module]
+manufacturer = "Kellog"
+make = "ARNIL-3"
+bands = ["3G", "4G", "LTE"]
+active_current_draw = 0.118
+passive_current_draw = 0.006
+price = 75.33
+"""
+
+
+def build(builder):
+    d = Director()
+    d.set_builder(builder)
+    return d.build_phone()
+
+
+class TestCompileRecipe(unittest.TestCase):
+
+    def test_same_phone_as_hand_written_builder(self):
+        cls = compile_recipe(ME_FONE_12)
+        self.assertTrue(issubclass(cls, BuilderInterface))
+        self.assertEqual('RecipeMeFone12', cls.__name__)
+        phone = build(cls())
+        expected = build(MeFone12())
+        self.assertEqual(expected.brochure, phone.brochure)
+        self.assertEqual(str(expected), str(phone))
+
+    def test_components_are_new_every_build(self):
+        builder = compile_recipe(ME_FONE_12)()
+        first = builder.build_cellular_module()
+        second = builder.build_cellular_module()
+        self.assertIsNot(first, second)
+        first.bands.append('5G')
+        self.assertEqual(['3G', '4G', 'LTE'], second.bands)
+
+    def test_missing_parts(self):
+        recipe = dict(ME_FONE_12)
+        del recipe['battery']
+        del recipe['mfg']
+        with self.assertRaises(ValueError) as context:
+            compile_recipe(recipe)
+        self.assertEqual('Recipe is missing: mfg, battery', context.exception.args[0])
+
+    def test_bad_arguments(self):
+        recipe = dict(ME_FONE_12, battery=["M-004", "NiCAD"])
+        with self.assertRaises(ValueError) as context:
+            compile_recipe(recipe)
+        self.assertTrue(context.exception.args[0].startswith('Recipe battery does not fit Battery:'))
+
+    def test_bad_component_type(self):
+        with self.assertRaises(ValueError) as context:
+            compile_recipe(dict(ME_FONE_12, screen="big"))
+        self.assertEqual('Recipe screen must be a list or an object.', context.exception.args[0])
+
+
+class TestParseRecipe(unittest.TestCase):
+
+    def test_json(self):
+        self.assertEqual(ME_FONE_12, parse_recipe(json.dumps(ME_FONE_12).encode('utf-8')))
+
+    @unittest.skipIf(recipes.tomllib is None, "tomllib needs Python 3.11")
+    def test_toml(self):
+        self.assertEqual(ME_FONE_12, parse_recipe(ME_FONE_12_TOML, 'toml'))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError) as context:
+            parse_recipe('', 'yaml')
+        self.assertEqual('Unknown recipe format: yaml', context.exception.args[0])
+
+
+class TestRecipeCache(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache = RecipeCache()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def write(self, name, recipe):
+        path = os.path.join(self.folder, name)
+        with open(path, 'w') as recipe_file:
+            recipe_file.write(recipe if isinstance(recipe, str) else json.dumps(recipe))
+        return path
+
+    def test_compile_once_per_content(self):
+        text = json.dumps(ME_FONE_12)
+        self.assertIs(self.cache.compile(text), self.cache.compile(text.encode('utf-8')))
+        self.assertEqual(1, self.cache.compiled)
+        self.assertEqual(1, self.cache.hits)
+
+    def test_many_files_same_recipe(self):
+        paths = [self.write('phone_{0}.json'.format(index), ME_FONE_12) for index in range(20)]
+        classes = set(self.cache.load_class(path) for path in paths)
+        self.assertEqual(1, len(classes))
+        self.assertEqual(1, self.cache.compiled)
+        self.assertEqual(1, len(self.cache))
+        builder = self.cache.load(paths[0])
+        self.assertEqual(build(MeFone12()).brochure, build(builder).brochure)
+
+    def test_unchanged_file_not_read_again(self):
+        path = self.write('phone.json', ME_FONE_12)
+        cls = self.cache.load_class(path)
+        hits = self.cache.hits
+        self.assertIs(cls, self.cache.load_class(path))
+        self.assertEqual(hits + 1, self.cache.hits)
+
+    def test_change_invalidates_only_its_entry(self):
+        first = self.write('first.json', ME_FONE_12)
+        second = self.write('second.json', dict(ME_FONE_12, model="MeFone12 Pro"))
+        first_cls = self.cache.load_class(first)
+        second_cls = self.cache.load_class(second)
+        self.assertEqual(2, len(self.cache))
+
+        self.write('second.json', dict(ME_FONE_12, model="MeFone12 Max", mfg="NBD Corp"))
+        os.utime(second, ns=(0, 0))
+        changed = self.cache.load_class(second)
+        self.assertIsNot(second_cls, changed)
+        self.assertEqual("MeFone12 Max", changed.model)
+        self.assertIs(first_cls, self.cache.load_class(first))
+        self.assertEqual(2, len(self.cache))
+        self.assertEqual(3, self.cache.compiled)
+
+    def test_invalidate(self):
+        path = self.write('phone.json', ME_FONE_12)
+        other = self.write('other.json', ME_FONE_12)
+        self.cache.load_class(path)
+        self.cache.load_class(other)
+        self.cache.invalidate(path)
+        self.assertEqual(1, len(self.cache))
+        self.cache.invalidate(other)
+        self.assertEqual(0, len(self.cache))
+        self.cache.invalidate(other)
+
+    @unittest.skipIf(recipes.tomllib is None, "tomllib needs Python 3.11")
+    def test_toml_file(self):
+        path = self.write('phone.toml', ME_FONE_12_TOML)
+        self.assertEqual(build(MeFone12()).brochure, build(self.cache.load(path)).brochure)
+
+    def test_bad_extension(self):
+        with self.assertRaises(ValueError) as context:
+            self.cache.load_class('phone.yaml')
+        self.assertEqual('Recipe files must end in .json or .toml: phone.yaml', context.exception.args[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
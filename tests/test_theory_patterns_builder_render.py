@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import io
+import unittest
+from src.theory.patterns.builder.builder import CellPhone
+from src.theory.patterns.builder.builder import Battery
+from src.theory.patterns.builder.builder import Speakers
+from src.theory.patterns.builder.builder import Director
+from src.theory.patterns.builder.builder import MeFone12
+from src.theory.patterns.builder.builder import BirdSungT8
+from src.theory.patterns.builder.render import PhoneRenderer, write_catalog
+
+
+class CountingStream(object):
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+class OddComponent(object):
+    price = 1.0
+
+    def __str__(self):
+        return "Odd Component\n"
+
+
+def build_phones():
+    d = Director()
+    phones = []
+    for builder in (MeFone12(), BirdSungT8()):
+        d.set_builder(builder)
+        phones.append(d.build_phone())
+    phones.extend(d.build_phones(3, lambda index: {'battery': Battery("B", "Lion", 5 + index, 300, 4.5 + index)}))
+    odd = phones[0].clone()
+    odd.speakers = Speakers("Whoever", "10 - 10kHz", 8, 0, 0.3, 2)
+    odd.mfg = None
+    phones.append(odd)
+    return phones
+
+
+class TestPhoneRenderer(unittest.TestCase):
+
+    def test_brochure_matches(self):
+        for phone in build_phones():
+            self.assertEqual(phone.brochure, PhoneRenderer.brochure(phone))
+
+    def test_spec_sheet_matches(self):
+        renderer = PhoneRenderer(io.StringIO())
+        for phone in build_phones():
+            self.assertEqual(str(phone), renderer.spec_sheet(phone))
+            # a second time comes out of the per slot cache
+            self.assertEqual(str(phone), renderer.spec_sheet(phone))
+
+    def test_spec_sheet_unknown_component(self):
+        phone = build_phones()[0]
+        phone.speakers = OddComponent()
+        self.assertEqual(str(phone), PhoneRenderer(io.StringIO()).spec_sheet(phone))
+
+    def test_spec_sheet_no_shell(self):
+        phone = CellPhone()
+        phone.circuit_board = MeFone12().build_circuit_board()
+        renderer = PhoneRenderer(io.StringIO())
+        self.assertEqual(str(phone), renderer.spec_sheet(phone))
+
+    def test_chunked_writes(self):
+        stream = CountingStream()
+        renderer = PhoneRenderer(stream, chunk_size=1000)
+        phone = build_phones()[0]
+        for _ in range(10):
+            renderer.write_brochure(phone)
+        self.assertTrue(len(stream.writes) < 10)
+        for text in stream.writes:
+            self.assertTrue(len(text) >= 1000)
+        renderer.flush()
+        renderer.flush()
+        self.assertEqual(phone.brochure * 10, ''.join(stream.writes))
+
+    def test_context_manager_flushes(self):
+        stream = io.StringIO()
+        phone = build_phones()[1]
+        with PhoneRenderer(stream) as renderer:
+            renderer.write_spec_sheet(phone, end='\n')
+            self.assertEqual('', stream.getvalue())
+        self.assertEqual(str(phone) + '\n', stream.getvalue())
+
+
+class TestWriteCatalog(unittest.TestCase):
+
+    def test_matches_print(self):
+        phones = build_phones()
+        stream = io.StringIO()
+        self.assertEqual(len(phones), write_catalog(phones, stream))
+        expected = io.StringIO()
+        for phone in phones:
+            print(phone.brochure, file=expected)
+            print(phone, file=expected)
+        self.assertEqual(expected.getvalue(), stream.getvalue())
+
+    def test_sections(self):
+        phones = build_phones()
+        stream = io.StringIO()
+        write_catalog(iter(phones), stream, spec_sheet=False, end='')
+        self.assertEqual(''.join(phone.brochure for phone in phones), stream.getvalue())
+        stream = io.StringIO()
+        write_catalog(iter(phones), stream, brochure=False, end='')
+        self.assertEqual(''.join(str(phone) for phone in phones), stream.getvalue())
+
+    def test_generator_chunks(self):
+        d = Director()
+        d.set_builder(MeFone12())
+        prototype = d.build_phone()
+        stream = CountingStream()
+        count = write_catalog((prototype.clone() for _ in range(2000)), stream, chunk_size=1 << 14)
+        self.assertEqual(2000, count)
+        self.assertTrue(max(len(text) for text in stream.writes) < (1 << 14) + 2000)
+        self.assertEqual(len(prototype.brochure + str(prototype)) * 2000 + 4000,
+                         sum(len(text) for text in stream.writes))
+
+
+if __name__ == "__main__":
+    unittest.main()
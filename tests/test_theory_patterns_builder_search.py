@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import itertools
+import random
+import time
+import unittest
+from src.theory.patterns.builder.builder import CellPhone
+from src.theory.patterns.builder.builder import CircuitBoard
+from src.theory.patterns.builder.builder import CellularModule
+from src.theory.patterns.builder.builder import Battery
+from src.theory.patterns.builder.builder import Speakers
+from src.theory.patterns.builder.builder import Screen
+from src.theory.patterns.builder.builder import ExternalShell
+from src.theory.patterns.builder.search import cheapest_phones, remove_dominated, battery_seconds, _Part
+
+
+def random_catalogs(rand, size):
+    return [
+        [CircuitBoard('b{0}'.format(i), '1', rand.uniform(.05, .3), rand.uniform(.001, .03),
+                      round(rand.uniform(20, 100), 2)) for i in range(size)],
+        [CellularModule('m', 'x{0}'.format(i), ['LTE'], rand.uniform(.05, .3), rand.uniform(.001, .03),
+                        round(rand.uniform(20, 100), 2)) for i in range(size)],
+        [Battery('f', 'Lion', rand.uniform(4, 12), 300, round(rand.uniform(2, 12), 2)) for _ in range(size)],
+        [Speakers('s', '20 - 20kHz', 4, rand.uniform(0, .02), rand.uniform(.1, .3), round(rand.uniform(1, 9), 2))
+         for _ in range(size)],
+        [Screen(150, 75, 15, 60, rand.uniform(.05, .4), rand.uniform(.3, .9), round(rand.uniform(30, 90), 2))
+         for _ in range(size)],
+        [ExternalShell('ABS', rand.uniform(140, 170), rand.uniform(70, 90), .4, '1 ft.',
+                       round(rand.uniform(1, 15), 2), False, False, round(rand.uniform(1, 9), 2))
+         for _ in range(size)],
+    ]
+
+
+def brute_force(catalogs, top_k, max_price=None, min_standby_time=None, min_talk_time=None, max_height=None):
+    answers = []
+    for parts in itertools.product(*catalogs):
+        phone = CellPhone()
+        (phone.circuit_board, phone.cellular_module, phone.battery, phone.speakers, phone.screen,
+         phone.external_shell) = parts
+        days, hours, minutes, seconds = phone.passive_battery_duration
+        standby = ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+        days, hours, minutes, seconds = phone.active_battery_duration
+        talk = ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+        if max_price is not None and phone.assembled_price > max_price:
+            continue
+        if min_standby_time is not None and standby < min_standby_time:
+            continue
+        if min_talk_time is not None and talk < min_talk_time:
+            continue
+        if max_height is not None and phone.external_shell.height > max_height:
+            continue
+        answers.append(phone.assembled_price)
+    return sorted(answers)[:top_k]
+
+
+class TestCheapestPhones(unittest.TestCase):
+
+    def setUp(self):
+        self.catalogs = random_catalogs(random.Random(42), 4)
+
+    def test_cheapest_no_constraints(self):
+        phones = cheapest_phones(*self.catalogs, top_k=5, mfg='test_mfg', model='test_model')
+        self.assertEqual(brute_force(self.catalogs, 5), [phone.assembled_price for phone in phones])
+        self.assertEqual('test_mfg', phones[0].mfg)
+        self.assertEqual('test_model', phones[0].model)
+
+    def test_talk_time(self):
+        phones = cheapest_phones(*self.catalogs, top_k=3, min_talk_time=9 * 3600)
+        self.assertEqual(brute_force(self.catalogs, 3, min_talk_time=9 * 3600),
+                         [phone.assembled_price for phone in phones])
+        self.assertTrue(len(phones) > 0)
+        for phone in phones:
+            self.assertTrue(phone.active_battery_duration >= (0, 9, 0, 0))
+
+    def test_standby_price_and_height(self):
+        kwargs = dict(max_price=250, min_standby_time=3 * 24 * 3600, max_height=160)
+        phones = cheapest_phones(*self.catalogs, top_k=10, **kwargs)
+        self.assertEqual(brute_force(self.catalogs, 10, **kwargs), [phone.assembled_price for phone in phones])
+
+    def test_nothing_fits(self):
+        self.assertEqual([], cheapest_phones(*self.catalogs, min_talk_time=10 ** 9))
+        self.assertEqual([], cheapest_phones(*self.catalogs, max_width=1))
+
+    def test_bad_top_k(self):
+        with self.assertRaises(ValueError) as context:
+            cheapest_phones(*self.catalogs, top_k=0)
+        self.assertEqual('top_k must be at least 1.', context.exception.args[0])
+
+    def test_hundreds_of_parts_per_slot(self):
+        catalogs = random_catalogs(random.Random(7), 300)
+        start = time.perf_counter()
+        phones = cheapest_phones(*catalogs, top_k=5, min_talk_time=11 * 3600, min_standby_time=5 * 24 * 3600)
+        self.assertTrue(time.perf_counter() - start < 30)
+        self.assertEqual(5, len(phones))
+        prices = [phone.assembled_price for phone in phones]
+        self.assertEqual(sorted(prices), prices)
+
+
+class TestSearchHelpers(unittest.TestCase):
+
+    def test_battery_seconds(self):
+        self.assertEqual(3600, battery_seconds(1, 1.0))
+        self.assertEqual(float('inf'), battery_seconds(1, 0.0))
+
+    def test_remove_dominated(self):
+        cheap = _Part(Battery('f', 'Lion', 8, 300, 1.0), 'battery')
+        same = _Part(Battery('f', 'Lion', 8, 300, 1.0), 'battery')
+        worse = _Part(Battery('f', 'Lion', 7, 300, 2.0), 'battery')
+        bigger = _Part(Battery('f', 'Lion', 9, 300, 3.0), 'battery')
+        parts = [cheap, same, worse, bigger]
+        self.assertEqual([cheap, bigger], remove_dominated(parts, 1))
+        self.assertEqual([cheap, same, bigger], remove_dominated(parts, 2))
+        self.assertEqual(parts, remove_dominated(parts, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
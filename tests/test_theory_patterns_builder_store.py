@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+from src.theory.patterns.builder.builder import Battery
+from src.theory.patterns.builder.builder import Director
+from src.theory.patterns.builder.builder import MeFone12
+from src.theory.patterns.builder.builder import BirdSungT8
+from src.theory.patterns.builder.search import battery_seconds
+from src.theory.patterns.builder.store import PhoneStore, component_spec, load_component
+
+
+def build(builder, count=1):
+    d = Director()
+    d.set_builder(builder)
+    return d.build_phones(count)
+
+
+class TestComponentSpec(unittest.TestCase):
+
+    def test_round_trip(self):
+        phone = build(MeFone12())[0]
+        for slot in ('circuit_board', 'cellular_module', 'battery', 'speakers', 'screen', 'external_shell'):
+            component = getattr(phone, slot)
+            loaded = load_component(slot, component_spec(component))
+            self.assertIs(type(component), type(loaded))
+            self.assertEqual(str(component), str(loaded))
+
+
+class TestPhoneStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = PhoneStore()
+        self.me_fone_ids = self.store.add_phones(build(MeFone12(), 3))
+        self.bird_sung_id = self.store.add_phone(build(BirdSungT8())[0])
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_add_and_get(self):
+        self.assertEqual(4, len(self.store))
+        self.assertEqual([1, 2, 3], self.me_fone_ids)
+        expected = build(MeFone12())[0]
+        phone = self.store.get(self.me_fone_ids[0])
+        self.assertEqual(expected.brochure, phone.brochure)
+        self.assertEqual(str(expected), str(phone))
+        self.assertEqual(build(BirdSungT8())[0].brochure, self.store.get(self.bird_sung_id).brochure)
+
+    def test_components_written_once(self):
+        count = self.store.connection.execute("SELECT COUNT(*) FROM components").fetchone()[0]
+        self.assertEqual(12, count)
+
+    def test_loaded_phones_share_components(self):
+        first, second = self.store.find(mfg="NBD", limit=2)
+        self.assertIs(first.battery, second.battery)
+        self.assertIsNot(first, second)
+
+    def test_get_missing(self):
+        with self.assertRaises(KeyError):
+            self.store.get(99)
+
+    def test_find_by_columns(self):
+        me_fone = build(MeFone12())[0]
+        bird_sung = build(BirdSungT8())[0]
+        self.assertEqual(self.me_fone_ids, self.store.find_ids(mfg="NBD"))
+        self.assertEqual([self.bird_sung_id], self.store.find_ids(battery_type=bird_sung.battery.battery_type,
+                                                                  mfg=bird_sung.mfg))
+        self.assertEqual(self.me_fone_ids, self.store.find_ids(width_pixels=me_fone.screen.width_pixels,
+                                                               height_pixels=me_fone.screen.height_pixels))
+        msrp = me_fone.calculate_msrp(me_fone.total_price)
+        self.assertEqual(self.me_fone_ids, self.store.find_ids(min_msrp=msrp - .01, max_msrp=msrp + .01))
+        self.assertEqual([], self.store.find_ids(mfg="NBD", max_price=me_fone.assembled_price - .01))
+
+    def test_find_by_battery_time(self):
+        phone = build(MeFone12())[0]
+        seconds = battery_seconds(phone.battery.storage_capacity, .127 + .118 + .2 + .68)
+        self.assertEqual(seconds, self.store.connection.execute(
+            "SELECT talk_seconds FROM phones WHERE id = 1").fetchone()[0])
+        self.assertIn(1, self.store.find_ids(min_talk_time=seconds))
+        self.assertNotIn(1, self.store.find_ids(min_talk_time=seconds + 1))
+
+    def test_find_ordered_and_limited(self):
+        phones = list(self.store.find(order_by='msrp'))
+        msrps = [phone.calculate_msrp(phone.total_price) for phone in phones]
+        self.assertEqual(sorted(msrps), msrps)
+        self.assertEqual(2, len(self.store.find_ids(limit=2)))
+
+    def test_find_is_lazy(self):
+        phones = self.store.find()
+        self.assertEqual("NBD", next(phones).mfg)
+
+    def test_queries_use_indexes(self):
+        for filters in (dict(min_msrp=100, max_msrp=500), dict(mfg="NBD"), dict(battery_type="NiCAD"),
+                        dict(width_pixels=1389, height_pixels=2816), dict(min_talk_time=60, order_by='talk_seconds')):
+            plan = " ".join(self.store.explain(**filters))
+            self.assertIn("INDEX phones_", plan)
+
+    def test_bad_query(self):
+        with self.assertRaises(ValueError) as context:
+            self.store.find_ids(color="red")
+        self.assertEqual('Unknown filter: color', context.exception.args[0])
+        with self.assertRaises(ValueError) as context:
+            self.store.find_ids(order_by="id; DROP TABLE phones")
+        self.assertEqual('Can not order phones by: id; DROP TABLE phones', context.exception.args[0])
+
+    def test_failed_add_rolls_back(self):
+        phone = build(MeFone12())[0]
+        phone.battery = Battery("DNN0", "Lion", 7.8, 500, 10.12)
+        del phone.screen
+        with self.assertRaises(AttributeError):
+            self.store.add_phones([build(MeFone12())[0], phone])
+        self.assertEqual(4, len(self.store))
+        self.assertEqual(1, len(self.store.add_phones([build(MeFone12())[0]])))
+
+
+class TestPhoneStoreFile(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'phones.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_phones_kept_across_connections(self):
+        with PhoneStore(self.path) as store:
+            store.add_phones(build(MeFone12(), 5))
+        with PhoneStore(self.path) as store:
+            self.assertEqual(5, len(store))
+            self.assertEqual(build(MeFone12())[0].brochure, store.get(5).brochure)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import os
+import shutil
+import sys
+import tempfile
 import unittest
 from unittest.mock import patch, call
 
@@ -59,6 +63,79 @@ class TestFactoryPatternShapeFactory(unittest.TestCase):
         sq = sf.get_shape('square')
         self.assertTrue(type(sq) is Square)
 
+    def test_get_shapes(self):
+        types = ['circle', 'square', 'circle', 'circle']
+        shapes = ShapeFactory.get_shapes(types)
+        self.assertEqual([Circle, Square, Circle, Circle], [type(shape) for shape in shapes])
+        self.assertEqual(4, len(set(map(id, shapes))))
+        self.assertEqual([Square, Circle], [type(shape) for shape in ShapeFactory.get_shapes(iter(types[1:3]))])
+        self.assertEqual([], ShapeFactory.get_shapes([]))
+
+    def test_get_shapes_bad_type(self):
+        for types in (['circle', 'orange'], ['circle', ['square']]):
+            with self.assertRaises(TypeError) as context:
+                ShapeFactory.get_shapes(types)
+            self.assertEqual("Type must be circle or square.", context.exception.args[0])
+
+    def test_get_shape_class(self):
+        self.assertIs(Circle, ShapeFactory.get_shape_class('circle'))
+
+    def test_render(self):
+        self.assertEqual('Draw Circle', Circle().render())
+        self.assertEqual('Draw Square', Square().render())
+        self.assertIsNone(ShapeInterface().render())
+
+
+class TestFactoryPatternRegistration(unittest.TestCase):
+
+    def setUp(self):
+        self.shapes = dict(ShapeFactory.shapes)
+        self.folder = tempfile.mkdtemp()
+        with open(os.path.join(self.folder, 'lazy_shapes_for_tests.py'), 'w') as module:
+            module.write("from src.theory.patterns.factories.factory_pattern import ShapeInterface\n\n\n"
+                         "class Hexagon(ShapeInterface):\n"
+                         "    def draw(self):\n"
+                         "        print('Draw Hexagon')\n")
+        sys.path.insert(0, self.folder)
+
+    def tearDown(self):
+        ShapeFactory.shapes.clear()
+        ShapeFactory.shapes.update(self.shapes)
+        sys.path.remove(self.folder)
+        sys.modules.pop('lazy_shapes_for_tests', None)
+        shutil.rmtree(self.folder)
+
+    def test_decorator(self):
+        @ShapeFactory.register('triangle')
+        class Triangle(ShapeInterface):
+            pass
+
+        self.assertTrue(type(ShapeFactory.get_shape('triangle')) is Triangle)
+        self.assertTrue(type(ShapeFactory.get_shape('circle')) is Circle)
+
+    def test_register_replaces(self):
+        ShapeFactory.register('circle', Square)
+        self.assertTrue(type(ShapeFactory.get_shape('circle')) is Square)
+
+    def test_lazy(self):
+        ShapeFactory.register_lazy('hexagon', 'lazy_shapes_for_tests:Hexagon')
+        self.assertNotIn('lazy_shapes_for_tests', sys.modules)
+        hexagon = ShapeFactory.get_shape('hexagon')
+        self.assertIn('lazy_shapes_for_tests', sys.modules)
+        self.assertEqual('Hexagon', type(hexagon).__name__)
+        self.assertIs(type(hexagon), ShapeFactory.shapes['hexagon'])
+        self.assertIs(type(hexagon), type(ShapeFactory.get_shape('hexagon')))
+
+    def test_lazy_missing_module(self):
+        ShapeFactory.register_lazy('octagon', 'no_such_shapes_module:Octagon')
+        with self.assertRaises(ImportError):
+            ShapeFactory.get_shape('octagon')
+
+    def test_unhashable_type(self):
+        with self.assertRaises(TypeError) as context:
+            ShapeFactory.get_shape(['circle'])
+        self.assertEqual("Type must be circle or square.", context.exception.args[0])
+
 
 class TestFactoryPatternMain(unittest.TestCase):
 
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+from src.theory.patterns.factories.benchmarks import bench_flyweight, bench_draw
+
+
+class TestBenchmarks(unittest.TestCase):
+    """
+    Only checks that the benchmarks run and report what they should, the numbers
+    themselves depend on the machine.
+    """
+
+    def test_bench_flyweight(self):
+        results = bench_flyweight(40)
+        self.assertEqual(40, results['count'])
+        self.assertEqual(2, results['distinct_shapes'])
+        self.assertEqual(2, results['allocations'])
+        self.assertTrue(results['flyweight_ns_per_shape'] > 0)
+
+    def test_bench_draw(self):
+        results = bench_draw(40)
+        self.assertEqual(40, results['count'])
+        self.assertTrue(results['same_text'])
+        self.assertTrue(results['batched_ns_per_shape'] > 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import unittest
+from src.theory.patterns.factories.factory_pattern import ShapeInterface, Circle, Square, ShapeFactory
+from src.theory.patterns.factories.drawing import DrawBatch, draw_shapes
+
+
+class CountingStream(object):
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+class Label(ShapeInterface):
+
+    def __init__(self, text):
+        self.text = text
+
+    def draw(self):
+        print(self.render())
+
+    def render(self):
+        return 'Draw Label ' + self.text
+
+
+class Blank(ShapeInterface):
+    stateless = True
+    renders = 0
+
+    def render(self):
+        Blank.renders += 1
+        return None
+
+
+class Triangle(ShapeInterface):
+    stateless = True
+    draws = 0
+
+    def draw(self):
+        Triangle.draws += 1
+        print('Draw Triangle')
+
+
+def drawn(shapes):
+    stream = io.StringIO()
+    with contextlib.redirect_stdout(stream):
+        for shape in shapes:
+            shape.draw()
+    return stream.getvalue()
+
+
+class TestDrawBatch(unittest.TestCase):
+
+    def test_matches_draw(self):
+        shapes = ShapeFactory.get_shapes(['circle', 'square', 'circle'])
+        shapes.extend([ShapeInterface(), Label('one'), Label('two'), Circle()])
+        stream = io.StringIO()
+        self.assertEqual(len(shapes), draw_shapes(iter(shapes), stream))
+        self.assertEqual(drawn(shapes), stream.getvalue())
+
+    def test_stateful_shapes_rendered_every_time(self):
+        label = Label('one')
+        stream = io.StringIO()
+        with DrawBatch(stream) as batch:
+            batch.draw(label)
+            label.text = 'two'
+            batch.draw(label)
+            batch.draw(Square())
+        self.assertEqual('Draw Label one\nDraw Label two\nDraw Square\n', stream.getvalue())
+
+    def test_empty_text_rendered_once(self):
+        Blank.renders = 0
+        stream = CountingStream()
+        self.assertEqual(4, draw_shapes([Blank(), Circle(), Blank(), Blank()], stream))
+        self.assertEqual(1, Blank.renders)
+        self.assertEqual(['Draw Circle\n'], stream.writes)
+
+    def test_draw_only_shapes_captured(self):
+        registered = dict(ShapeFactory.shapes)
+        self.addCleanup(ShapeFactory.shapes.update, registered)
+        self.addCleanup(ShapeFactory.shapes.clear)
+        ShapeFactory.register('triangle', Triangle)
+        stream = io.StringIO()
+        Triangle.draws = 0
+        shapes = ShapeFactory.get_shapes(['triangle', 'circle', 'triangle', 'triangle'])
+        self.assertEqual(4, draw_shapes(shapes, stream))
+        self.assertEqual('Draw Triangle\nDraw Circle\nDraw Triangle\nDraw Triangle\n', stream.getvalue())
+        self.assertEqual(1, Triangle.draws)
+
+    def test_large_writes(self):
+        shapes = ShapeFactory.get_shapes(['circle', 'square'] * 1000)
+        stream = CountingStream()
+        with DrawBatch(stream, chunk_size=4096) as batch:
+            batch.draw_all(shapes[:1500])
+            batch.draw(Label('middle'))
+            batch.draw_all(shapes[1500:])
+        self.assertTrue(1 < len(stream.writes) < 20)
+        self.assertEqual(drawn(shapes[:1500] + [Label('middle')] + shapes[1500:]), ''.join(stream.writes))
+
+    def test_nothing_to_draw(self):
+        stream = CountingStream()
+        self.assertEqual(0, draw_shapes([], stream))
+        self.assertEqual([], stream.writes)
+
+    def test_defaults_to_stdout(self):
+        stream = io.StringIO()
+        with contextlib.redirect_stdout(stream):
+            draw_shapes([Circle(), Square()])
+        self.assertEqual('Draw Circle\nDraw Square\n', stream.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+from src.theory.patterns.factories.factory_pattern import ShapeInterface, Circle, Square, ShapeFactory
+from src.theory.patterns.factories.flyweight import FlyweightShapeFactory
+
+
+class Brush(ShapeInterface):
+
+    def __init__(self):
+        self.strokes = []
+
+
+class BrushFactory(object):
+
+    @staticmethod
+    def get_shape(type_):
+        if type_ == 'brush':
+            return Brush()
+        return ShapeFactory.get_shape(type_)
+
+
+class TestFlyweightShapeFactory(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = FlyweightShapeFactory()
+
+    def test_shared(self):
+        circle = self.factory.get_shape('circle')
+        self.assertTrue(type(circle) is Circle)
+        self.assertIs(circle, self.factory.get_shape('circle'))
+        square = self.factory.get_shape('square')
+        self.assertTrue(type(square) is Square)
+        self.assertIsNot(circle, square)
+        self.assertEqual({'hits': 1, 'allocations': 2, 'shared': 2, 'hit_rate': 1 / 3}, self.factory.stats())
+
+    def test_stateful_not_shared(self):
+        factory = FlyweightShapeFactory(BrushFactory())
+        brush = factory.get_shape('brush')
+        brush.strokes.append('line')
+        other = factory.get_shape('brush')
+        self.assertIsNot(brush, other)
+        self.assertEqual([], other.strokes)
+        self.assertIs(factory.get_shape('circle'), factory.get_shape('circle'))
+        self.assertEqual(1, len(factory))
+        self.assertEqual(1, factory.hits)
+        self.assertEqual(3, factory.allocations)
+
+    def test_unknown_type(self):
+        for type_ in ('hexagon', ['circle']):
+            with self.assertRaises(TypeError) as context:
+                self.factory.get_shape(type_)
+            self.assertEqual('Type must be circle or square.', context.exception.args[0])
+        self.assertEqual(0, self.factory.allocations)
+
+    def test_clear(self):
+        circle = self.factory.get_shape('circle')
+        self.factory.clear()
+        self.assertEqual({'hits': 0, 'allocations': 0, 'shared': 0, 'hit_rate': 0.0}, self.factory.stats())
+        self.assertIsNot(circle, self.factory.get_shape('circle'))
+
+    def test_threads(self):
+        seen = []
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            seen.extend(self.factory.get_shape('circle') for _ in range(500))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(4000, len(seen))
+        self.assertEqual(1, len(set(map(id, seen))))
+        self.assertEqual(1, self.factory.allocations)
+        self.assertLessEqual(self.factory.hits, 3999)  # hits are counted without the lock
+
+
+if __name__ == "__main__":
+    unittest.main()